@@ -1,9 +1,18 @@
-from fastapi import FastAPI
-from fastapi.responses import HTMLResponse
-from pydantic import BaseModel
+import os
+import json
+import time
+import asyncio
+import contextvars
+from fastapi import FastAPI, HTTPException, WebSocket, WebSocketDisconnect
+from fastapi.responses import HTMLResponse, JSONResponse, PlainTextResponse
+from pydantic import BaseModel, ValidationError
+from typing import List, Optional
 from src.ai_brain.EnhancedCardCounter import EnhancedCardCounter
 from src.ai_brain.enhanced_counting_decision_engine import EnhancedCountingDecisionEngine
 from src.ai_brain.basic_strategy import BasicStrategy
+from src.ai_brain.composition_decision_engine import CompositionDecisionEngine
+from src.utils.session_store import SessionStore
+from src.utils.metrics import MetricsRegistry
 
 app = FastAPI(title="Blackjack AI Assistant", description="AI-powered blackjack decision making with card counting", version="1.0.0")
 
@@ -14,6 +23,92 @@ class HandRequest(BaseModel):
     cards_dealt: int
     num_decks: int
 
+class HandState(BaseModel):
+    player_hand: list
+    dealer_upcard: int
+    can_double: bool = True
+    can_split: bool = False
+    can_surrender: bool = True
+
+class BatchHandRequest(BaseModel):
+    hands: List[HandState]
+    running_count: int
+    cards_dealt: int
+    num_decks: int
+
+class CompositionHandRequest(HandState):
+    composition: List[int]  # Unseen cards per rank: A, 2-9, ten-valued
+
+class SessionCreateRequest(BaseModel):
+    num_decks: int = 6
+
+class CardsSeenRequest(BaseModel):
+    cards: list
+
+# Strategy tables and deviation scan are stateless per hand, so they are built once
+# per process; only the count context is created per request.
+basic_strategy = BasicStrategy()
+decision_engine = EnhancedCountingDecisionEngine(basic_strategy, EnhancedCardCounter())
+ev_engine = CompositionDecisionEngine()
+
+sessions = SessionStore(max_sessions=10000, ttl_seconds=3600)
+
+# Max pending messages per WebSocket; older updates are dropped for slow consumers
+ADVICE_QUEUE_SIZE = 32
+
+# Set BLACKJACK_METRICS=0 to remove all instrumentation, including the middleware
+metrics = MetricsRegistry(enabled=os.environ.get("BLACKJACK_METRICS", "1") != "0")
+request_started = contextvars.ContextVar("request_started", default=None)
+
+class RequestMetricsMiddleware:
+    """Pure ASGI middleware recording per-endpoint request counts and latency"""
+    def __init__(self, app, registry):
+        self.app = app
+        self.registry = registry
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        start = time.perf_counter()
+        token = request_started.set(start)
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            request_started.reset(token)
+            # Label by endpoint function, not raw path, so session ids don't explode cardinality
+            endpoint = scope.get("endpoint")
+            name = endpoint.__name__ if endpoint is not None else "unmatched"
+            self.registry.observe_request(name, time.perf_counter() - start)
+
+if metrics.enabled:
+    decision_engine.metrics = metrics
+    app.add_middleware(RequestMetricsMiddleware, registry=metrics)
+
+def mark_validated():
+    """Close the validation stage: routing, body parsing and pydantic validation"""
+    if metrics.enabled:
+        started = request_started.get()
+        if started is not None:
+            metrics.observe("validation", time.perf_counter() - started)
+
+def serialize(payload):
+    if not metrics.enabled:
+        return payload
+    start = time.perf_counter()
+    response = JSONResponse(payload)
+    metrics.observe("serialization", time.perf_counter() - start)
+    return response
+
+def build_counter(running_count, cards_dealt, num_decks):
+    start = time.perf_counter()
+    counter = EnhancedCardCounter(num_decks=num_decks)
+    counter.running_count = running_count
+    counter.cards_seen = cards_dealt
+    if metrics.enabled:
+        metrics.observe("counter_setup", time.perf_counter() - start)
+    return counter
+
 @app.get("/", response_class=HTMLResponse)
 def read_root():
     return """
@@ -207,7 +302,25 @@ def read_root():
 }</pre>
                 </div>
             </div>
-            
+
+            <div class="endpoint">
+                <p><span class="method post">POST</span> <code>/eyobsai_decision/batch</code></p>
+                <p>Evaluate many hands (e.g. every seat at the table) against one count context in a single request</p>
+
+                <h4>Request Body Example:</h4>
+                <div class="example">
+                    <pre>{
+  "hands": [
+    {"player_hand": [10, 6], "dealer_upcard": 10},
+    {"player_hand": [8, 8], "dealer_upcard": 10, "can_split": true}
+  ],
+  "running_count": 2,
+  "cards_dealt": 26,
+  "num_decks": 6
+}</pre>
+                </div>
+            </div>
+
             <h2>API Documentation:</h2>
             <div class="links">
                 <div class="link-card">
@@ -234,10 +347,243 @@ def read_root():
 
 @app.post("/eyobsai_decision")
 def ai_decision(req: HandRequest):
-    counter = EnhancedCardCounter(num_decks=req.num_decks)
-    counter.running_count = req.running_count
-    counter.cards_seen = req.cards_dealt
-    strategy = BasicStrategy()
-    engine = EnhancedCountingDecisionEngine(strategy, counter)
-    result = engine.make_decision(req.player_hand, req.dealer_upcard)
-    return result
\ No newline at end of file
+    mark_validated()
+    counter = build_counter(req.running_count, req.cards_dealt, req.num_decks)
+    result = decision_engine.make_decision(req.player_hand, req.dealer_upcard, card_counter=counter)
+    return serialize(result)
+
+@app.post("/eyobsai_decision/batch")
+def ai_decision_batch(req: BatchHandRequest):
+    mark_validated()
+    counter = build_counter(req.running_count, req.cards_dealt, req.num_decks)
+    decisions = [
+        decision_engine.make_decision(
+            hand.player_hand,
+            hand.dealer_upcard,
+            can_double=hand.can_double,
+            can_split=hand.can_split,
+            can_surrender=hand.can_surrender,
+            card_counter=counter,
+        )
+        for hand in req.hands
+    ]
+    return serialize({"decisions": decisions})
+
+@app.post("/ev_decision")
+def ev_decision(req: CompositionHandRequest):
+    mark_validated()
+    try:
+        result = ev_engine.make_decision(
+            req.player_hand,
+            req.dealer_upcard,
+            req.composition,
+            can_double=req.can_double,
+            can_split=req.can_split,
+            can_surrender=req.can_surrender,
+        )
+    except ValueError as exc:
+        raise HTTPException(status_code=422, detail=str(exc))
+    return serialize(result)
+
+@app.get("/metrics", response_class=PlainTextResponse)
+def metrics_endpoint():
+    if not metrics.enabled:
+        raise HTTPException(status_code=404, detail="Metrics are disabled")
+    cache_stats = decision_engine.get_cache_stats()
+    return metrics.render(gauges={
+        "decision_cache_hits": cache_stats["hits"],
+        "decision_cache_misses": cache_stats["misses"],
+        "decision_cache_size": cache_stats["size"],
+        "decision_cache_hit_rate": cache_stats["hit_rate"],
+        "active_sessions": len(sessions)
+    })
+
+def get_session_or_404(session_id):
+    session = sessions.get(session_id)
+    if session is None:
+        raise HTTPException(status_code=404, detail="Unknown or expired session")
+    return session
+
+@app.post("/sessions")
+def create_session(req: SessionCreateRequest):
+    return sessions.create(num_decks=req.num_decks).get_state()
+
+@app.get("/sessions/{session_id}")
+def get_session(session_id: str):
+    return get_session_or_404(session_id).get_state()
+
+@app.post("/sessions/{session_id}/cards")
+def update_session_cards(session_id: str, req: CardsSeenRequest):
+    session = get_session_or_404(session_id)
+    try:
+        session.counter.update_count(req.cards)
+    except ValueError as exc:
+        raise HTTPException(status_code=422, detail=str(exc))
+    return session.get_state()
+
+@app.post("/sessions/{session_id}/shuffle")
+def shuffle_session(session_id: str):
+    session = get_session_or_404(session_id)
+    session.counter.reset()
+    return session.get_state()
+
+@app.post("/sessions/{session_id}/decision")
+def session_decision(session_id: str, req: HandState):
+    mark_validated()
+    start = time.perf_counter()
+    session = get_session_or_404(session_id)
+    if metrics.enabled:
+        metrics.observe("counter_setup", time.perf_counter() - start)
+    return serialize(decision_engine.make_decision(
+        req.player_hand,
+        req.dealer_upcard,
+        can_double=req.can_double,
+        can_split=req.can_split,
+        can_surrender=req.can_surrender,
+        card_counter=session.counter,
+    ))
+
+@app.post("/sessions/{session_id}/ev_decision")
+def session_ev_decision(session_id: str, req: HandState):
+    """Exact-EV decision against the session's remaining shoe
+
+    The player's cards and the dealer upcard must already have been posted to
+    /sessions/{id}/cards, so that they are out of the tracked composition.
+    """
+    mark_validated()
+    session = get_session_or_404(session_id)
+    try:
+        result = ev_engine.make_decision(
+            req.player_hand,
+            req.dealer_upcard,
+            session.counter.composition.snapshot(),
+            can_double=req.can_double,
+            can_split=req.can_split,
+            can_surrender=req.can_surrender,
+        )
+    except ValueError as exc:
+        raise HTTPException(status_code=422, detail=str(exc))
+    return serialize(result)
+
+@app.delete("/sessions/{session_id}")
+def delete_session(session_id: str):
+    if not sessions.delete(session_id):
+        raise HTTPException(status_code=404, detail="Unknown or expired session")
+    return {"deleted": session_id}
+
+def push_latest(outbox, message):
+    """Queue a message, dropping the oldest pending one if the client is not keeping up"""
+    if outbox.full():
+        outbox.get_nowait()
+    outbox.put_nowait(message)
+
+async def drain_outbox(websocket, outbox):
+    while True:
+        message = await outbox.get()
+        await websocket.send_json(message)
+
+async def stop_sender(sender):
+    """Cancel the outbox task and retrieve its outcome, so a failed send is not left unobserved"""
+    sender.cancel()
+    await asyncio.gather(sender, return_exceptions=True)
+
+async def receive_event(websocket):
+    """Next client event as a dict, or an error message (str) for a malformed frame"""
+    try:
+        event = json.loads(await websocket.receive_text())
+    except KeyError:  # A binary frame has no "text"
+        return "Events must be sent as JSON text frames"
+    except ValueError as exc:
+        return f"Invalid JSON: {exc}"
+    if not isinstance(event, dict):
+        return "Events must be JSON objects"
+    return event
+
+@app.websocket("/ws/advice")
+async def advice_stream(websocket: WebSocket, num_decks: int = 6, session_id: Optional[str] = None):
+    """
+    Stream card events and hand states; the server pushes count and decision updates
+
+    Client events:
+        {"type": "cards", "cards": [...]}          newly seen cards
+        {"type": "hand", "player_hand": [...], "dealer_upcard": n, ...}
+        {"type": "end_hand"}                       stop advising on the current hand
+        {"type": "shuffle"}                        new shoe
+
+    Malformed frames get an error event and the stream carries on. A stream on a
+    session keeps it alive, and closes with code 4404 if the session is gone.
+    """
+    if session_id is not None:
+        session = sessions.get(session_id)
+        if session is None:
+            await websocket.close(code=4404)
+            return
+        counter = session.counter
+    else:
+        counter = EnhancedCardCounter(num_decks=num_decks)
+
+    await websocket.accept()
+    outbox = asyncio.Queue(maxsize=ADVICE_QUEUE_SIZE)
+    sender = asyncio.create_task(drain_outbox(websocket, outbox))
+    hand = None
+    last_true_count = None
+    last_decision = None
+    try:
+        while True:
+            event = await receive_event(websocket)
+            if sender.done():  # Sending failed (the client went away); stop reading
+                break
+            if session_id is not None and sessions.get(session_id) is None:  # get() also refreshes the TTL
+                await stop_sender(sender)
+                await websocket.close(code=4404)
+                return
+            if isinstance(event, str):
+                push_latest(outbox, {"type": "error", "detail": event})
+                continue
+            kind = event.get("type")
+            if kind == "cards":
+                try:
+                    counter.update_count(event.get("cards", []))
+                except ValueError as exc:
+                    push_latest(outbox, {"type": "error", "detail": str(exc)})
+                    continue
+            elif kind == "hand":
+                try:
+                    hand = HandState(**event)
+                except ValidationError as exc:
+                    push_latest(outbox, {"type": "error", "detail": str(exc)})
+                    continue
+            elif kind == "end_hand":
+                hand = None
+                last_decision = None
+            elif kind == "shuffle":
+                counter.reset()
+            else:
+                push_latest(outbox, {"type": "error", "detail": f"Unknown event type: {kind}"})
+                continue
+
+            true_count = counter.get_true_count()
+            if true_count != last_true_count:
+                last_true_count = true_count
+                push_latest(outbox, {
+                    "type": "count",
+                    "running_count": counter.running_count,
+                    "cards_seen": counter.cards_seen,
+                    "true_count": true_count
+                })
+            if hand is not None:
+                decision = decision_engine.make_decision(
+                    hand.player_hand,
+                    hand.dealer_upcard,
+                    can_double=hand.can_double,
+                    can_split=hand.can_split,
+                    can_surrender=hand.can_surrender,
+                    card_counter=counter,
+                )
+                if decision != last_decision:
+                    last_decision = decision
+                    push_latest(outbox, {"type": "decision", **decision})
+    except WebSocketDisconnect:
+        pass
+    finally:
+        await stop_sender(sender)
@@ -0,0 +1,20 @@
+import os
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Cold-import time budgets in milliseconds, enforced by scripts/check_import_time.py.
+# Keys are module names or package globs; the most specific match wins.
+IMPORT_TIME_BUDGET_MS = {
+    "api": 1500,
+    "src.ai_brain.*": 50,
+    "src.simulation.*": 100,
+}
+
+# Generated basic strategy tables (see src/ai_brain/strategy_tables.py)
+STRATEGY_TABLE_DIR = os.path.join(PROJECT_ROOT, "data", "strategy_tables")
+
+# Simulation-derived deviation index tables (see src/simulation/deviation_indices.py)
+DEVIATION_INDEX_DIR = os.path.join(PROJECT_ROOT, "data", "deviation_indices")
+
+# Cached count-system evaluations (see src/simulation/count_evaluation.py)
+COUNT_EVALUATION_DIR = os.path.join(PROJECT_ROOT, "data", "count_evaluations")
@@ -0,0 +1,89 @@
+"""
+Measure cold-import time of the API and src packages and enforce a budget
+
+Each module is imported in a fresh interpreter so earlier imports can't hide
+its cost. Exits non-zero when any module goes over its budget.
+
+Usage:
+    python scripts/check_import_time.py [--repeat 3] [--budget-ms 200] [module ...]
+"""
+import sys
+import os
+import argparse
+import fnmatch
+import subprocess
+
+REPO_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+sys.path.insert(0, REPO_ROOT)
+
+from config.settings import IMPORT_TIME_BUDGET_MS
+
+PACKAGES = ["src/ai_brain", "src/simulation"]
+
+TIMER_SNIPPET = (
+    "import time; start = time.perf_counter(); import {module}; "
+    "print((time.perf_counter() - start) * 1000)"
+)
+
+def discover_modules():
+    modules = ["api"]
+    for package in PACKAGES:
+        for filename in sorted(os.listdir(os.path.join(REPO_ROOT, package))):
+            if filename.endswith(".py") and filename != "__init__.py":
+                modules.append(f"{package.replace('/', '.')}.{filename[:-3]}")
+    return modules
+
+def budget_for(module, default=None):
+    if default is not None:
+        return default
+    if module in IMPORT_TIME_BUDGET_MS:
+        return IMPORT_TIME_BUDGET_MS[module]
+    matches = [pattern for pattern in IMPORT_TIME_BUDGET_MS if fnmatch.fnmatch(module, pattern)]
+    if not matches:
+        return None
+    return IMPORT_TIME_BUDGET_MS[max(matches, key=len)]
+
+def measure_import_ms(module, repeat):
+    """Best of `repeat` cold imports, or None if the module fails to import"""
+    timings = []
+    for _ in range(repeat):
+        result = subprocess.run(
+            [sys.executable, "-c", TIMER_SNIPPET.format(module=module)],
+            cwd=REPO_ROOT, capture_output=True, text=True
+        )
+        if result.returncode != 0:
+            return None
+        timings.append(float(result.stdout.strip().splitlines()[-1]))
+    return min(timings)
+
+def main():
+    parser = argparse.ArgumentParser(description="Cold-import time budget check")
+    parser.add_argument("modules", nargs="*", help="Modules to check (default: api, src.ai_brain.*, src.simulation.*)")
+    parser.add_argument("--repeat", type=int, default=3, help="Fresh interpreters per module; the fastest run counts")
+    parser.add_argument("--budget-ms", type=float, default=None, help="Override the configured budget for every module")
+    args = parser.parse_args()
+
+    over_budget = []
+    print(f"{'Module':<55} {'Import ms':>10} {'Budget ms':>10}")
+    print("-" * 78)
+    for module in args.modules or discover_modules():
+        elapsed = measure_import_ms(module, args.repeat)
+        budget = budget_for(module, args.budget_ms)
+        if elapsed is None:
+            print(f"{module:<55} {'ERROR':>10} {budget if budget is not None else '-':>10}")
+            over_budget.append(module)
+            continue
+        flag = ""
+        if budget is not None and elapsed > budget:
+            flag = "  OVER BUDGET"
+            over_budget.append(module)
+        print(f"{module:<55} {elapsed:>10.1f} {budget if budget is not None else '-':>10}{flag}")
+
+    if over_budget:
+        print(f"\n{len(over_budget)} module(s) failed the import budget: {', '.join(over_budget)}")
+        return 1
+    print("\nAll modules within import budget")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,306 @@
+"""
+Local load-testing harness for the advice API
+
+Drives api.py either in-process (ASGI transport, no network) or against a running
+server (e.g. `uvicorn api:app`), with synthetic hands dealt from a real shoe.
+Traffic is sent open-loop at a fixed rate, or closed-loop as fast as the given
+number of concurrent clients allows. Reports throughput and p50/p95/p99 latency
+per endpoint and saves the results as JSON for comparison between versions.
+
+Usage:
+    python scripts/load_test.py --duration 10 --rate 500
+    python scripts/load_test.py --duration 10 --concurrency 32          # max throughput
+    python scripts/load_test.py --uvicorn --rate 200                    # spawn a local uvicorn
+    python scripts/load_test.py --url http://127.0.0.1:8000 --rate 200
+"""
+import sys
+import os
+import json
+import time
+import random
+import asyncio
+import argparse
+import platform
+import subprocess
+from datetime import datetime, timezone
+
+REPO_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+sys.path.insert(0, REPO_ROOT)
+
+import httpx
+from src.ai_brain.EnhancedCardCounter import EnhancedCardCounter
+from src.simulation.shoe import BlackjackShoe
+
+# Relative request mix: a table of seats, mostly single-hand advice
+DEFAULT_MIX = {"decision": 0.5, "batch": 0.2, "session_cards": 0.15, "session_decision": 0.15}
+BATCH_SEATS = 7
+
+class TrafficGenerator:
+    """Deals realistic hands from a shoe and keeps the matching count context"""
+    def __init__(self, num_decks=6, seed=None, penetration=75):
+        self.rng = random.Random(seed)
+        random.seed(seed)  # BlackjackShoe shuffles with the global generator
+        self.shoe = BlackjackShoe(num_decks=num_decks)
+        self.counter = EnhancedCardCounter(num_decks=num_decks)
+        self.num_decks = num_decks
+        self.penetration = penetration
+        self.session_id = None
+        self.session_shuffle_pending = False  # Reshuffled since the session was last told
+
+    def _draw(self):
+        if self.shoe.penetration() > self.penetration:
+            self.shoe.shuffle()
+            self.counter.reset()
+            self.session_shuffle_pending = True
+        card = self.shoe.draw_card()
+        self.counter.update_count([card])
+        return card
+
+    def _hand(self):
+        player_hand = [self._draw(), self._draw()]
+        return {
+            "player_hand": player_hand,
+            "dealer_upcard": self._draw(),
+            "can_split": player_hand[0] == player_hand[1]
+        }
+
+    def _count_context(self):
+        return {
+            "running_count": self.counter.running_count,
+            "cards_dealt": self.counter.cards_seen,
+            "num_decks": self.num_decks
+        }
+
+    def _session_shuffle(self):
+        """The shuffle request owed to the session, if the shoe was reshuffled since the last one"""
+        if not self.session_shuffle_pending:
+            return []
+        self.session_shuffle_pending = False
+        return [("POST", f"/sessions/{self.session_id}/shuffle", None)]
+
+    def _session_cards(self):
+        requests = []
+        cards = []
+        for _ in range(self.rng.randint(1, 4)):
+            card = self._draw()
+            if self.session_shuffle_pending:
+                if cards:  # Cards from the old shoe go in before the shuffle
+                    requests.append(("POST", f"/sessions/{self.session_id}/cards", {"cards": cards}))
+                    cards = []
+                requests.extend(self._session_shuffle())
+            cards.append(card)
+        requests.append(("POST", f"/sessions/{self.session_id}/cards", {"cards": cards}))
+        return requests
+
+    def next_requests(self, endpoint):
+        """
+        Return the (method, path, json_body) requests for one call to the named endpoint
+
+        The last one is the endpoint's own request. Session endpoints are
+        preceded by POST /sessions/{id}/shuffle when the generator reshuffled
+        its shoe, so the server-side session starts a new shoe with it.
+        """
+        if endpoint == "decision":
+            hand = self._hand()
+            del hand["can_split"]
+            return [("POST", "/eyobsai_decision", {**hand, **self._count_context()})]
+        if endpoint == "batch":
+            hands = [self._hand() for _ in range(BATCH_SEATS)]
+            return [("POST", "/eyobsai_decision/batch", {"hands": hands, **self._count_context()})]
+        if endpoint == "session_cards":
+            return self._session_cards()
+        if endpoint == "session_decision":
+            return self._session_shuffle() + [("POST", f"/sessions/{self.session_id}/decision", self._hand())]
+        raise ValueError(f"Unknown endpoint: {endpoint}")
+
+
+def percentile(sorted_values, fraction):
+    """Nearest-rank percentile of an already sorted list"""
+    if not sorted_values:
+        return None
+    rank = max(0, min(len(sorted_values) - 1, int(round(fraction * len(sorted_values))) - 1))
+    return sorted_values[rank]
+
+def summarize(samples, errors, elapsed):
+    endpoints = {}
+    for endpoint in sorted(set(samples) | set(errors)):
+        latencies = sorted(samples.get(endpoint, []))
+        endpoints[endpoint] = {
+            "requests": len(latencies),
+            "errors": errors.get(endpoint, 0),
+            "throughput_rps": len(latencies) / elapsed if elapsed else 0.0,
+            "p50_ms": percentile(latencies, 0.50),
+            "p95_ms": percentile(latencies, 0.95),
+            "p99_ms": percentile(latencies, 0.99),
+            "max_ms": latencies[-1] if latencies else None
+        }
+    total = sum(len(latencies) for latencies in samples.values())
+    return {
+        "elapsed_seconds": elapsed,
+        "total_requests": total,
+        "total_errors": sum(errors.values()),
+        "throughput_rps": total / elapsed if elapsed else 0.0,
+        "endpoints": endpoints
+    }
+
+
+async def run_load(client, generator, duration, rate=None, concurrency=16, mix=None):
+    """
+    Send traffic for `duration` seconds and collect latencies in milliseconds
+
+    With a rate, requests are scheduled open-loop and latency is measured from the
+    scheduled send time, so a stalled server shows up as latency rather than as a
+    silently reduced request rate. Session requests share one shoe, so they are
+    sent one at a time in the order they were dealt, like a single table's client.
+    """
+    mix = mix or DEFAULT_MIX
+    names, weights = list(mix), list(mix.values())
+    samples = {name: [] for name in names}
+    errors = {}
+    in_flight = asyncio.Semaphore(concurrency)
+    session_order = asyncio.Lock()  # FIFO, so session requests reach the server in dealing order
+
+    async def request_all(requests):
+        async with in_flight:
+            try:
+                for method, path, body in requests:
+                    response = await client.request(method, path, json=body)
+                    if response.status_code >= 400:
+                        return False
+                return True
+            except httpx.HTTPError:
+                return False
+
+    async def send(endpoint, scheduled):
+        requests = generator.next_requests(endpoint)
+        if endpoint.startswith("session_"):
+            async with session_order:
+                ok = await request_all(requests)
+        else:
+            ok = await request_all(requests)
+        if ok:
+            samples[endpoint].append((time.perf_counter() - scheduled) * 1000)
+        else:
+            errors[endpoint] = errors.get(endpoint, 0) + 1
+
+    start = time.perf_counter()
+    deadline = start + duration
+    if rate:
+        tasks = []
+        sent = 0
+        while True:
+            scheduled = start + sent / rate
+            if scheduled >= deadline:
+                break
+            delay = scheduled - time.perf_counter()
+            if delay > 0:
+                await asyncio.sleep(delay)
+            endpoint = generator.rng.choices(names, weights)[0]
+            tasks.append(asyncio.create_task(send(endpoint, scheduled)))
+            sent += 1
+        await asyncio.gather(*tasks)
+    else:
+        async def worker():
+            while time.perf_counter() < deadline:
+                await send(generator.rng.choices(names, weights)[0], time.perf_counter())
+        await asyncio.gather(*(worker() for _ in range(concurrency)))
+    return summarize(samples, errors, time.perf_counter() - start)
+
+
+def build_client(url):
+    if url:
+        return httpx.AsyncClient(base_url=url, timeout=30.0)
+    from api import app
+    return httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://loadtest", timeout=30.0)
+
+async def run(args):
+    generator = TrafficGenerator(num_decks=args.num_decks, seed=args.seed)
+    async with build_client(args.url) as client:
+        response = await client.post("/sessions", json={"num_decks": args.num_decks})
+        response.raise_for_status()
+        generator.session_id = response.json()["session_id"]
+        if args.warmup:
+            await run_load(client, generator, args.warmup, rate=None, concurrency=args.concurrency)
+        return await run_load(client, generator, args.duration, rate=args.rate, concurrency=args.concurrency)
+
+def start_uvicorn(port, timeout=15.0):
+    """Launch `uvicorn api:app` on localhost and wait until it answers"""
+    process = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "api:app", "--host", "127.0.0.1", "--port", str(port), "--log-level", "warning"],
+        cwd=REPO_ROOT
+    )
+    url = f"http://127.0.0.1:{port}"
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if process.poll() is not None:
+            raise RuntimeError("uvicorn exited during startup")
+        try:
+            httpx.get(url + "/", timeout=1.0)
+            return process, url
+        except httpx.HTTPError:
+            time.sleep(0.1)
+    process.terminate()
+    raise RuntimeError(f"uvicorn did not start within {timeout:.0f}s")
+
+def git_revision():
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=REPO_ROOT,
+                              capture_output=True, text=True).stdout.strip() or None
+    except OSError:
+        return None
+
+def print_report(results):
+    print(f"\n{'Endpoint':<20} {'Requests':>9} {'Errors':>7} {'RPS':>9} {'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8}")
+    print("-" * 75)
+    for endpoint, stats in results["endpoints"].items():
+        if not stats["requests"]:
+            print(f"{endpoint:<20} {0:>9} {stats['errors']:>7}")
+            continue
+        print(f"{endpoint:<20} {stats['requests']:>9} {stats['errors']:>7} {stats['throughput_rps']:>9.1f} "
+              f"{stats['p50_ms']:>8.2f} {stats['p95_ms']:>8.2f} {stats['p99_ms']:>8.2f}")
+    print("-" * 75)
+    print(f"{'TOTAL':<20} {results['total_requests']:>9} {results['total_errors']:>7} {results['throughput_rps']:>9.1f}")
+
+def main():
+    parser = argparse.ArgumentParser(description="Load test the blackjack advice API")
+    parser.add_argument("--url", default=None, help="Base URL of a running server (default: in-process)")
+    parser.add_argument("--uvicorn", action="store_true", help="Spawn a local uvicorn server and test over HTTP")
+    parser.add_argument("--port", type=int, default=8765, help="Port for --uvicorn")
+    parser.add_argument("--duration", type=float, default=10.0, help="Measured run length in seconds")
+    parser.add_argument("--warmup", type=float, default=1.0, help="Unmeasured warm-up in seconds")
+    parser.add_argument("--rate", type=float, default=None, help="Target requests/second (default: as fast as possible)")
+    parser.add_argument("--concurrency", type=int, default=16, help="Max in-flight requests")
+    parser.add_argument("--num-decks", type=int, default=6)
+    parser.add_argument("--seed", type=int, default=1234)
+    parser.add_argument("--output", default="load_test_results.json", help="Where to save the JSON results")
+    args = parser.parse_args()
+
+    server = None
+    if args.uvicorn:
+        server, args.url = start_uvicorn(args.port)
+    try:
+        results = asyncio.run(run(args))
+    finally:
+        if server is not None:
+            server.terminate()
+            server.wait()
+    results["config"] = {
+        "url": args.url or "in-process",
+        "duration": args.duration,
+        "rate": args.rate,
+        "concurrency": args.concurrency,
+        "num_decks": args.num_decks,
+        "seed": args.seed,
+        "mix": DEFAULT_MIX
+    }
+    results["git_revision"] = git_revision()
+    results["python"] = platform.python_version()
+    results["timestamp"] = datetime.now(timezone.utc).isoformat()
+
+    print_report(results)
+    with open(args.output, "w") as f:
+        json.dump(results, f, indent=2)
+    print(f"\nResults saved to {args.output}")
+
+if __name__ == "__main__":
+    main()
@@ -1,11 +1,10 @@
-import sys
-import os
-sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..')))
 import math
 from collections import deque
 
 class AdvancedBankrollManager:
     """Enhanced bankroll management with Kelly Criterion and risk analytics"""
+
+    MAX_BET_FRACTION = 0.2  # Never bet more than 20% of the bankroll
     
     def __init__(self, initial_bankroll=1000, base_unit_percentage=1.0, 
                  risk_level="moderate", min_bet=5, max_bet=500):
@@ -44,6 +43,24 @@ class AdvancedBankrollManager:
             win_probability: Base probability of winning
             blackjack_probability: Probability of getting blackjack
         """
+        kelly_fraction = self.kelly_multiplier(true_count, win_probability, blackjack_probability)
+
+        # Convert to bet size
+        base_unit = (self.current_bankroll * self.base_unit_percentage) / 100
+        bet_size = base_unit * kelly_fraction
+        
+        # Apply limits
+        bet_size = max(self.min_bet, min(bet_size, self.max_bet))
+        bet_size = min(bet_size, self.current_bankroll * self.MAX_BET_FRACTION)
+        
+        return round(bet_size, 2)
+
+    def kelly_multiplier(self, true_count, win_probability=0.47, blackjack_probability=0.048):
+        """
+        calculate_kelly_bet_size's bet in base units (base_unit_percentage of the
+        bankroll) before table limits; it depends on the count only, so risk
+        analysis can apply it to any bankroll
+        """
         profile = self.risk_profiles[self.risk_level]
         
         # Adjust win probability based on true count
@@ -68,16 +85,8 @@ class AdvancedBankrollManager:
         if true_count > 0:
             tc_multiplier = 1 + (true_count * profile["tc_sensitivity"])
             kelly_fraction *= min(tc_multiplier, profile["max_units"])
-            
-        # Convert to bet size
-        base_unit = (self.current_bankroll * self.base_unit_percentage) / 100
-        bet_size = base_unit * kelly_fraction
-        
-        # Apply limits
-        bet_size = max(self.min_bet, min(bet_size, self.max_bet))
-        bet_size = min(bet_size, self.current_bankroll * 0.2)  # Never bet more than 20%
-        
-        return round(bet_size, 2)
+
+        return kelly_fraction
     def get_bet_size_with_volatility_control(self, true_count=0, confidence=0.5, recent_variance=None):
         base_bet = self.calculate_kelly_bet_size(true_count, confidence)
         if len(self.bankroll_history) >= 10:
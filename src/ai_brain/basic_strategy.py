@@ -1,16 +1,38 @@
 # src/ai_brain/basic_strategy.py
 
+# Action codes used by the strategy tables
+ACTION_NAMES = {'H': 'hit', 'S': 'stand', 'D': 'double', 'P': 'split',
+                'Ds': 'double', 'Rh': 'surrender', 'Rs': 'surrender'}
+# What to do instead when doubling / surrender is not allowed
+FALLBACK_ACTIONS = {'D': 'hit', 'Ds': 'stand', 'Rh': 'hit', 'Rs': 'stand'}
+
+
 class BasicStrategy:
     """
     Core Blackjack Basic Strategy Engine
     Implements mathematically optimal play for standard blackjack rules
     """
     
-    def __init__(self):
-        """Initialize strategy tables"""
-        self.hard_strategy = self._create_hard_strategy_table()
-        self.soft_strategy = self._create_soft_strategy_table()
-        self.pair_strategy = self._create_pair_strategy_table()
+    def __init__(self, rules=None):
+        """
+        Initialize strategy tables
+
+        Args:
+            rules (Rules): Optional rule set from strategy_tables; its generated tables
+                are loaded from disk (computed and saved on first use). Without rules
+                the built-in tables below are used.
+        """
+        self.rules = rules
+        if rules is None:
+            self.hard_strategy = self._create_hard_strategy_table()
+            self.soft_strategy = self._create_soft_strategy_table()
+            self.pair_strategy = self._create_pair_strategy_table()
+        else:
+            from src.ai_brain.strategy_tables import load_strategy_tables
+            tables = load_strategy_tables(rules)
+            self.hard_strategy = tables["hard"]
+            self.soft_strategy = tables["soft"]
+            self.pair_strategy = tables["pairs"]
         
     def _create_hard_strategy_table(self):
         """Hard totals strategy (no Aces counted as 11)"""
@@ -64,7 +86,7 @@ class BasicStrategy:
             '10,10': ['S', 'S', 'S', 'S', 'S', 'S', 'S', 'S', 'S', 'S'],
         }
     
-    def get_action(self, player_hand, dealer_upcard, can_double=True, can_split=True):
+    def get_action(self, player_hand, dealer_upcard, can_double=True, can_split=True, can_surrender=False):
         """
         Get the optimal action for given game state
         
@@ -73,9 +95,10 @@ class BasicStrategy:
             dealer_upcard (int): Dealer's upcard value [2-11]
             can_double (bool): Whether doubling is allowed
             can_split (bool): Whether splitting is allowed
+            can_surrender (bool): Whether surrender is allowed (generated tables only)
             
         Returns:
-            str: Recommended action ('hit', 'stand', 'double', 'split')
+            str: Recommended action ('hit', 'stand', 'double', 'split', 'surrender')
         """
         # Convert dealer upcard to index (2-11 -> 0-9)
         dealer_index = min(dealer_upcard - 2, 9) if dealer_upcard <= 10 else 9
@@ -83,7 +106,7 @@ class BasicStrategy:
         # Check for pairs first
         if can_split and len(player_hand) == 2 and player_hand[0] == player_hand[1]:
             pair_key = f"{player_hand[0]},{player_hand[1]}"
-            if pair_key == "1,1":  # Aces
+            if pair_key in ("1,1", "11,11"):  # Aces
                 pair_key = "A,A"
             if pair_key in self.pair_strategy:
                 action = self.pair_strategy[pair_key][dealer_index]
@@ -104,14 +127,25 @@ class BasicStrategy:
             action = 'S' if total >= 17 else 'H'
         
         # Convert action codes to full names
-        action_map = {
-            'H': 'hit',
-            'S': 'stand',
-            'D': 'double' if can_double else 'hit',
-            'P': 'split'
-        }
-        
-        return action_map.get(action, 'stand')
+        if action in FALLBACK_ACTIONS:
+            allowed = can_surrender if action[0] == 'R' else can_double
+            if not allowed:
+                return FALLBACK_ACTIONS[action]
+        return ACTION_NAMES.get(action, 'stand')
+
+    def compile(self):
+        """
+        Get the integer-indexed form of these tables (built once, then reused)
+
+        Call again after editing the dict tables to rebuild it.
+        """
+        self._compiled = CompiledStrategy(self)
+        return self._compiled
+
+    @property
+    def compiled(self):
+        compiled = getattr(self, '_compiled', None)
+        return compiled if compiled is not None else self.compile()
     
     def _calculate_hand_value(self, hand):
         """
@@ -174,6 +208,103 @@ class BasicStrategy:
         }
 
 
+class CompiledStrategy:
+    """
+    Flat, integer-indexed snapshot of a BasicStrategy's dict tables
+
+    Hands map to small state ids (hard total, soft total or pair rank) and every
+    action is read from one preallocated byte array indexed by
+    (state, dealer_upcard, flags), where
+    flags = can_double | can_split << 1 | can_surrender << 2.
+    Results are identical to BasicStrategy.get_action; the dict tables stay the
+    source of truth.
+    """
+
+    # State ids: 0-31 hard totals, 32-63 soft totals, 64-75 two-card pairs by rank
+    SOFT_OFFSET = 32
+    PAIR_OFFSET = 64
+    MAX_TOTAL = 31  # Every busted hard total plays the same (stand)
+    NUM_STATES = 76
+    NUM_UPCARDS = 12  # Indexed by raw upcard value 0-11 (Ace as 1 or 11)
+    NUM_FLAGS = 8
+
+    ACTIONS = ('hit', 'stand', 'double', 'split', 'surrender')
+    HIT, STAND, DOUBLE, SPLIT, SURRENDER = range(5)
+
+    def __init__(self, strategy):
+        self.table = self._compile(strategy)
+
+    @classmethod
+    def index(cls, state, dealer_upcard, flags):
+        """Flat table position; out-of-range ids would silently read another state's entry, so they raise"""
+        if not 0 <= dealer_upcard < cls.NUM_UPCARDS:
+            raise ValueError(f"Dealer upcard must be 0-{cls.NUM_UPCARDS - 1}, got {dealer_upcard}")
+        if not 0 <= state < cls.NUM_STATES:
+            raise ValueError(f"Hand state must be 0-{cls.NUM_STATES - 1}, got {state}")
+        return (state * cls.NUM_UPCARDS + dealer_upcard) * cls.NUM_FLAGS + flags
+
+    @classmethod
+    def state_hands(cls):
+        """A representative hand for every state id"""
+        hands = {}
+        for total in range(cls.MAX_TOTAL + 1):
+            hands[total] = cls._hard_hand(total)
+        for total in range(11, 22):  # Soft 11 is a lone ace, e.g. one half of split aces
+            hands[cls.SOFT_OFFSET + total] = [11] + cls._hard_hand(total - 11)
+        for rank in range(1, 12):
+            hands[cls.PAIR_OFFSET + rank] = [rank, rank]
+        return hands
+
+    def _compile(self, strategy):
+        table = bytearray(self.NUM_STATES * self.NUM_UPCARDS * self.NUM_FLAGS)
+        codes = {name: code for code, name in enumerate(self.ACTIONS)}
+
+        # Derive every entry from the dict-backed get_action so the two can never disagree
+        for state, hand in self.state_hands().items():
+            for upcard in range(self.NUM_UPCARDS):
+                for flags in range(self.NUM_FLAGS):
+                    action = strategy.get_action(hand, upcard, can_double=bool(flags & 1),
+                                                 can_split=bool(flags & 2), can_surrender=bool(flags & 4))
+                    table[self.index(state, upcard, flags)] = codes[action]
+        return bytes(table)
+
+    @staticmethod
+    def _hard_hand(total):
+        """A representative non-pair hand with no 11-valued ace for a hard total"""
+        hand = []
+        while total > 10:
+            hand.append(10)
+            total -= 10
+        if total:
+            hand.append(total)
+        if len(hand) == 2 and hand[0] == hand[1]:
+            hand = [hand[0], hand[1] - 1, 1]
+        return hand
+
+    def hand_state(self, player_hand):
+        """Map a hand (card values 1-11) to its state id"""
+        if len(player_hand) == 2 and player_hand[0] == player_hand[1] and 1 <= player_hand[0] <= 11:
+            return self.PAIR_OFFSET + player_hand[0]
+        total = sum(player_hand)
+        aces = player_hand.count(11)
+        while total > 21 and aces > 0:
+            total -= 10
+            aces -= 1
+        if aces > 0:
+            return self.SOFT_OFFSET + total
+        return min(total, self.MAX_TOTAL)
+
+    def action_code(self, state, dealer_upcard, can_double=True, can_split=True, can_surrender=False):
+        """Hot-path lookup for callers that already track the hand state"""
+        return self.table[self.index(state, dealer_upcard, can_double | can_split << 1 | can_surrender << 2)]
+
+    def get_action(self, player_hand, dealer_upcard, can_double=True, can_split=True, can_surrender=False):
+        """Drop-in equivalent of BasicStrategy.get_action"""
+        state = self.hand_state(player_hand)
+        return self.ACTIONS[self.table[self.index(state, dealer_upcard,
+                                                  can_double | can_split << 1 | can_surrender << 2)]]
+
+
 # Example usage and testing
 if __name__ == "__main__":
     bs = BasicStrategy()
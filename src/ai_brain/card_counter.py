@@ -1,14 +1,21 @@
+import json
+from src.ai_brain.counting_systems import get_counting_system
+
 
 
 class CardCounter:
     """
-    Enhanced Hi-Lo card counting system with true count, betting, and strategy deviations
+    Enhanced card counting system with true count, betting, and strategy deviations
+
+    Counts with any system from counting_systems (Hi-Lo by default); the deviation
+    indices below are Hi-Lo numbers.
     """
     
-    def __init__(self, num_decks=6):
+    def __init__(self, num_decks=6, system="hi-lo"):
         self.num_decks = num_decks
         self.total_cards = num_decks * 52
-        self.running_count = 0
+        self.system = get_counting_system(system)
+        self.running_count = self.system.initial_running_count(num_decks)
         self.cards_seen = 0
         
         # Strategy deviation table for Hi-Lo (True Count thresholds)
@@ -40,15 +47,30 @@ class CardCounter:
             5: 16,     # 16 units at TC +5
         }
     
+    def load_strategy_deviations(self, path):
+        """
+        Replace strategy_deviations with a table from src/simulation/deviation_indices.py
+
+        Only "deviate at TC >= index" entries fit this table; where one hand has
+        several, the one with the highest index is kept.
+        """
+        with open(path) as f:
+            table = json.load(f)
+        deviations = {}
+        for entry in table["indices"]:
+            if entry["direction"] != "above" or entry["player_total"] == "insurance":
+                continue
+            upcard = 11 if entry["dealer_upcard"] == 1 else entry["dealer_upcard"]
+            key = (entry["player_total"], upcard, entry["is_soft"])
+            if key not in deviations or entry["index"] > deviations[key][0]:
+                deviations[key] = (entry["index"], entry["deviation_action"])
+        self.strategy_deviations = deviations
+
     def update_count(self, cards):
-        """Update running count based on seen cards"""
-        for card in cards:
-            if 2 <= card <= 6:
-                self.running_count += 1
-            elif card in [10, 11]:  # 10, J, Q, K, A
-                self.running_count -= 1
-            # 7, 8, 9 are neutral (count = 0)
-            self.cards_seen += 1
+        """Update running count based on seen cards (a list or numpy array of card values)"""
+        delta, counted = self.system.count(cards)
+        self.running_count += delta
+        self.cards_seen += counted
     
     def get_running_count(self):
         """Get the current running count"""
@@ -59,8 +81,7 @@ class CardCounter:
         if self.cards_seen == 0:
             return 0
         
-        decks_remaining = max(0.5, (self.total_cards - self.cards_seen) / 52)
-        return round(self.running_count / decks_remaining, 1)
+        return round(self.system.true_count(self.running_count, self.cards_seen, self.num_decks, min_decks=0.5), 1)
     
     def get_deck_penetration(self):
         """Get percentage of deck played"""
@@ -165,7 +186,7 @@ class CardCounter:
     
     def reset(self):
         """Reset counter for new shoe"""
-        self.running_count = 0
+        self.running_count = self.system.initial_running_count(self.num_decks)
         self.cards_seen = 0
     
     def should_wong_out(self, true_count_threshold=-2):
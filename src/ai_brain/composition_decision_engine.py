@@ -0,0 +1,202 @@
+"""Composition-dependent expected-value decision engine"""
+import threading
+from collections import OrderedDict
+from src.ai_brain.rules import Rules
+from src.ai_brain.counting_systems import card_to_rank
+from src.ai_brain.dealer_probabilities import RANKS, BUST, best_total, dealer_outcomes, remove_card
+
+def card_rank(card):
+    """Map a card value (Ace as 1 or 11, face cards as 10-13) to a rank index 1-10; ValueError for anything else"""
+    return card_to_rank(card)
+
+
+class CompositionDecisionEngine:
+    """
+    Chooses actions by expected value against the actual remaining shoe
+
+    The composition is a 10-tuple of unseen cards per rank (Ace first, then 2-9,
+    then all ten-valued cards), i.e. with the player's cards and the dealer upcard
+    already removed. The dealer's final-total distribution is computed exactly for
+    that composition (conditioned on no dealer blackjack) and held fixed while the
+    player's draws deplete the shoe along every hit/double/split path; the player's
+    extra cards only move the dealer's odds by a second-order amount. Results are
+    memoized per (composition, hand state, upcard, flags): a repeated situation is
+    a cache lookup, while a new composition recomputes the dealer distribution and
+    player recursion, which takes milliseconds.
+    """
+
+    def __init__(self, rules=Rules(), cache_size=50000):
+        self.rules = rules
+        self.cache_size = cache_size
+        self._ev_cache = OrderedDict()
+        self._cache_lock = threading.Lock()
+        self.cache_hits = 0
+        self.cache_misses = 0
+
+    def make_decision(self, player_hand, dealer_upcard, composition, can_double=True, can_split=False,
+                      can_surrender=True):
+        """
+        Best action by exact EV for the given remaining shoe
+
+        Returns:
+            dict: action, ev of that action, and the EV of every legal action (per unit bet)
+        """
+        evs = self.evaluate(player_hand, dealer_upcard, composition, can_double, can_split, can_surrender)
+        action = max(evs, key=evs.get)
+        return {
+            "action": action,
+            "ev": evs[action],
+            "evs": evs,
+            "cards_remaining": sum(composition),
+        }
+
+    def evaluate(self, player_hand, dealer_upcard, composition, can_double=True, can_split=False,
+                 can_surrender=True):
+        """EV of each legal action: {'stand': ..., 'hit': ..., ...}"""
+        composition = tuple(composition)
+        if len(composition) != len(RANKS):
+            raise ValueError(f"composition needs {len(RANKS)} rank counts, got {len(composition)}")
+        if min(composition) < 0:
+            raise ValueError(f"composition counts cannot be negative, got {list(composition)}")
+
+        if not player_hand:
+            raise ValueError("player hand needs at least one card")
+        ranks = [card_rank(card) for card in player_hand]
+        upcard = card_rank(dealer_upcard)
+        natural = {1: 10, 10: 1}.get(upcard)
+        hole_cards = sum(composition) - (composition[natural - 1] if natural else 0)
+        if hole_cards < 1 or sum(composition) < 2:
+            raise ValueError(f"composition has {sum(composition)} cards left; it needs a dealer hole card "
+                             f"(other than one making blackjack) and a card to draw")
+        hard_total = sum(ranks)
+        has_ace = 1 in ranks
+        two_cards = len(ranks) == 2
+        pair_rank = ranks[0] if two_cards and ranks[0] == ranks[1] and can_split else None
+        key = (composition, hard_total, has_ace, two_cards, pair_rank, upcard,
+               can_double and two_cards, can_surrender and two_cards)
+
+        with self._cache_lock:
+            cached = self._ev_cache.get(key)
+            if cached is not None:
+                self._ev_cache.move_to_end(key)
+                self.cache_hits += 1
+                return dict(cached)
+
+        evs = self._evaluate(hard_total, has_ace, two_cards, pair_rank, upcard, composition,
+                             can_double and two_cards, can_surrender and two_cards)
+        with self._cache_lock:
+            self.cache_misses += 1
+            self._ev_cache[key] = evs
+            if len(self._ev_cache) > self.cache_size:
+                self._ev_cache.popitem(last=False)
+        return dict(evs)
+
+    def _evaluate(self, hard_total, has_ace, two_cards, pair_rank, upcard, composition, can_double, can_surrender):
+        if two_cards and best_total(hard_total, has_ace) == 21:
+            # Natural: paid immediately (dealer blackjack already ruled out by the peek)
+            return {"stand": self.rules.blackjack_payout}
+
+        solver = _PlayerSolver(dealer_outcomes(upcard, composition, self.rules.dealer_hits_soft_17))
+        evs = {
+            "stand": solver.stand(best_total(hard_total, has_ace)),
+            "hit": solver.hit(hard_total, has_ace, composition),
+        }
+        if can_double:
+            evs["double"] = solver.double(hard_total, has_ace, composition)
+        if can_surrender and self.rules.late_surrender:
+            evs["surrender"] = -0.5
+        if pair_rank is not None:
+            evs["split"] = solver.split(pair_rank, composition, self.rules.double_after_split)
+        return evs
+
+    def invalidate_cache(self):
+        with self._cache_lock:
+            self._ev_cache.clear()
+
+    def get_cache_stats(self):
+        lookups = self.cache_hits + self.cache_misses
+        return {
+            "size": len(self._ev_cache),
+            "max_size": self.cache_size,
+            "hits": self.cache_hits,
+            "misses": self.cache_misses,
+            "hit_rate": self.cache_hits / lookups if lookups else 0.0
+        }
+
+
+class _PlayerSolver:
+    """Player EV recursion for one decision, memoized on (hand state, remaining composition)"""
+
+    def __init__(self, dealer):
+        self.dealer = dealer
+        self._stand = {}
+        self._play = {}
+
+    def stand(self, total):
+        if total > 21:
+            return -1.0
+        ev = self._stand.get(total)
+        if ev is None:
+            ev = self.dealer[BUST]
+            for final, p in zip(range(17, 22), self.dealer):
+                if total > final:
+                    ev += p
+                elif total < final:
+                    ev -= p
+            self._stand[total] = ev
+        return ev
+
+    def hit(self, hard_total, has_ace, composition):
+        remaining = sum(composition)
+        ev = 0.0
+        for rank in RANKS:
+            count = composition[rank - 1]
+            if not count:
+                continue
+            hard = hard_total + rank
+            if hard > 21:
+                ev -= count / remaining
+            else:
+                ev += count / remaining * self.play(hard, has_ace or rank == 1, remove_card(composition, rank))
+        return ev
+
+    def play(self, hard_total, has_ace, composition):
+        """Best of stand/hit once doubling and surrender are gone"""
+        key = (hard_total, has_ace, composition)
+        ev = self._play.get(key)
+        if ev is None:
+            total = best_total(hard_total, has_ace)
+            ev = self.stand(total)
+            if total < 21:
+                ev = max(ev, self.hit(hard_total, has_ace, composition))
+            self._play[key] = ev
+        return ev
+
+    def double(self, hard_total, has_ace, composition):
+        remaining = sum(composition)
+        ev = 0.0
+        for rank in RANKS:
+            count = composition[rank - 1]
+            if count:
+                ev += count / remaining * self.stand(best_total(hard_total + rank, has_ace or rank == 1))
+        return 2.0 * ev
+
+    def split(self, rank, composition, double_after_split):
+        """Two independent hands from the pair card (no resplits; split aces get one card)"""
+        remaining = sum(composition)
+        ev = 0.0
+        for drawn in RANKS:
+            count = composition[drawn - 1]
+            if not count:
+                continue
+            p = count / remaining
+            hard, ace = rank + drawn, rank == 1 or drawn == 1
+            after = remove_card(composition, drawn)
+            if rank == 1:
+                ev += p * self.stand(best_total(hard, ace))
+            else:
+                hand_ev = self.play(hard, ace, after)
+                if double_after_split:
+                    hand_ev = max(hand_ev, self.double(hard, ace, after))
+                ev += p * hand_ev
+        return 2.0 * ev
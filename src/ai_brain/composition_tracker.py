@@ -0,0 +1,95 @@
+"""Remaining shoe composition tracked per rank"""
+from src.ai_brain.counting_systems import CARD_RANKS, VECTORIZE_MIN_CARDS, card_to_rank
+
+# Share of each rank (Ace, 2-9, ten-valued) in a full deck
+DECK_SHARE = (4 / 52,) * 9 + (16 / 52,)
+
+
+class CompositionTracker:
+    """
+    Unseen cards per rank for one shoe
+
+    `remaining` is a fixed 10-slot list (Ace first, then 2-9, then all ten-valued
+    cards), the composition layout of dealer_probabilities and
+    CompositionDecisionEngine, updated in O(1) per card. snapshot() returns it as
+    a tuple that is rebuilt only after the shoe changes, so EV and cache layers
+    can hash the same object on every lookup.
+    """
+
+    def __init__(self, num_decks=6):
+        self.num_decks = num_decks
+        self.reset()
+
+    def reset(self):
+        self.remaining = [4 * self.num_decks] * 9 + [16 * self.num_decks]
+        self.cards_remaining = 52 * self.num_decks
+        self._snapshot = None
+
+    def remove(self, cards):
+        """
+        Take seen cards (list or numpy array of card values) out of the shoe
+
+        Raises ValueError, leaving the composition unchanged, for an unknown card
+        value or more cards of a rank than the shoe holds.
+        """
+        counts = self._rank_counts(cards)
+        remaining = self.remaining
+        for index, count in enumerate(counts):
+            if count > remaining[index]:
+                rank = "A" if index == 0 else str(index + 1)
+                raise ValueError(f"Seen more {rank}s than a {self.num_decks}-deck shoe holds")
+        for index, count in enumerate(counts):
+            remaining[index] -= count
+        self.cards_remaining -= sum(counts)
+        self._snapshot = None
+
+    def _rank_counts(self, cards):
+        if hasattr(cards, "dtype") or len(cards) >= VECTORIZE_MIN_CARDS:
+            import numpy as np
+            cards = np.asarray(cards)
+            if cards.size == 0:
+                return [0] * 10
+            if cards.dtype.kind not in "iu" or cards.min() < 1 or cards.max() >= len(CARD_RANKS):
+                raise ValueError(f"Card values must be integers 1-{len(CARD_RANKS) - 1}")
+            ranks = np.array([0] + list(CARD_RANKS[1:]))[cards]
+            return np.bincount(ranks, minlength=11)[1:].tolist()
+        counts = [0] * 10
+        for card in cards:
+            counts[card_to_rank(card) - 1] += 1
+        return counts
+
+    def snapshot(self):
+        """Hashable composition: (aces, twos, ..., nines, tens)"""
+        snapshot = self._snapshot
+        if snapshot is None:
+            snapshot = self._snapshot = tuple(self.remaining)
+        return snapshot
+
+    @property
+    def cards_seen(self):
+        return 52 * self.num_decks - self.cards_remaining
+
+    @property
+    def decks_remaining(self):
+        """Exact decks left in the shoe"""
+        return self.cards_remaining / 52
+
+    @property
+    def decks_seen(self):
+        return self.cards_seen / 52
+
+    @property
+    def aces_remaining(self):
+        return self.remaining[0]
+
+    @property
+    def tens_remaining(self):
+        return self.remaining[9]
+
+    def surplus(self, rank):
+        """Cards of a rank (1 = Ace, 10 = ten-valued) left beyond a neutral shoe of this size"""
+        return self.remaining[rank - 1] - self.cards_remaining * DECK_SHARE[rank - 1]
+
+    def ace_surplus(self):
+        """Ace side count: extra (positive) or missing aces in the unseen cards"""
+        return self.surplus(1)
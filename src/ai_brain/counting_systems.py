@@ -0,0 +1,121 @@
+"""
+Tag tables for card counting systems
+
+Cards are normalised to ranks with the Ace as 1 and every ten-valued card as 10,
+so both encodings used in this package (Ace = 11 from the shoes and strategy
+tables, Ace = 1 from vision feeds) count the same way; 12 and 13 are read as
+face cards. Counts are updated from a list of cards or, for bulk feeds, from a
+numpy array of any length in one vectorised call.
+"""
+from dataclasses import dataclass, field
+from functools import cached_property
+
+# Card value -> rank (index 0 is not a card)
+CARD_RANKS = (None, 1, 2, 3, 4, 5, 6, 7, 8, 9, 10, 1, 10, 10)
+# Lists shorter than this are tagged in pure Python, which beats the numpy call overhead
+VECTORIZE_MIN_CARDS = 64
+
+
+def card_to_rank(card):
+    """Rank 1-10 for a card value 1-13 (Ace as 1 or 11, faces as 10 or 12/13)"""
+    rank = CARD_RANKS[card] if isinstance(card, int) and 0 < card < len(CARD_RANKS) else None
+    if rank is None:
+        raise ValueError(f"Not a card value: {card!r}")
+    return rank
+
+
+@dataclass(frozen=True)
+class CountingSystem:
+    """
+    A point count given by its tag per rank
+
+    Unbalanced systems (tags over a full deck do not sum to zero) start from an
+    initial running count and drift by `deck_imbalance` per deck dealt; the true
+    count removes that drift so they convert like the balanced systems.
+    """
+    name: str
+    tags: tuple  # Ace, 2-9, ten-valued
+    ace_neutral: bool = False  # Ace tagged 0; pairs with an ace side count
+    deck_imbalance: float = field(init=False)  # tag total over one full deck
+    _card_tags: dict = field(init=False, repr=False, compare=False)
+
+    def __post_init__(self):
+        # Four of each rank plus twelve more ten-valued cards
+        object.__setattr__(self, "deck_imbalance", sum(self.tags) * 4 + self.tags[9] * 12)
+        object.__setattr__(self, "_card_tags", {card: self.tags[rank - 1] for card, rank in enumerate(CARD_RANKS)
+                                                if rank is not None})
+
+    @property
+    def balanced(self):
+        return self.deck_imbalance == 0
+
+    @property
+    def level(self):
+        return max(abs(tag) for tag in self.tags)
+
+    def initial_running_count(self, num_decks):
+        """Conventional starting count: 0 for balanced systems, e.g. 4 - 4 x decks for KO"""
+        return 0 if self.balanced else -self.deck_imbalance * (num_decks - 1)
+
+    def tag(self, card):
+        return self.tags[card_to_rank(card) - 1]
+
+    def count(self, cards):
+        """
+        Sum of tags over `cards` (list, tuple or numpy array of card values)
+
+        Returns:
+            (count_delta, cards_counted)
+        """
+        if hasattr(cards, "dtype") or len(cards) >= VECTORIZE_MIN_CARDS:
+            return self._count_array(cards)
+        try:
+            return sum(map(self._card_tags.__getitem__, cards)), len(cards)
+        except (KeyError, TypeError):
+            for card in cards:
+                card_to_rank(card)  # raises on the first bad value
+            raise
+
+    def _count_array(self, cards):
+        import numpy as np
+        cards = np.asarray(cards)
+        if cards.size == 0:
+            return 0, 0
+        if cards.dtype.kind not in "iu":
+            raise ValueError(f"Card arrays must hold integers, got {cards.dtype}")
+        if cards.min() < 1 or cards.max() >= len(CARD_RANKS):
+            raise ValueError(f"Card values must be 1-{len(CARD_RANKS) - 1}")
+        return self._tag_array[cards].sum().item(), int(cards.size)
+
+    @cached_property
+    def _tag_array(self):
+        # Tag per card value for fancy indexing; built on first use so importing this module skips numpy
+        import numpy as np
+        return np.array([0] + [self._card_tags[card] for card in range(1, len(CARD_RANKS))])
+
+    def true_count(self, running_count, cards_seen, num_decks, min_decks=0.5):
+        """Running count per remaining deck, corrected for the drift of unbalanced systems"""
+        decks_seen = cards_seen / 52
+        decks_remaining = max(min_decks, num_decks - decks_seen)
+        drift = self.initial_running_count(num_decks) + self.deck_imbalance * decks_seen
+        return (running_count - drift) / decks_remaining
+
+COUNTING_SYSTEMS = {
+    system.name: system for system in (
+        CountingSystem("hi-lo",       (-1, 1, 1, 1, 1, 1, 0, 0, 0, -1)),
+        CountingSystem("ko",          (-1, 1, 1, 1, 1, 1, 1, 0, 0, -1)),
+        CountingSystem("hi-opt-ii",   (0, 1, 1, 2, 2, 1, 1, 0, 0, -2), ace_neutral=True),
+        CountingSystem("omega-ii",    (0, 1, 1, 2, 2, 2, 1, 0, -1, -2), ace_neutral=True),
+        CountingSystem("zen",         (-1, 1, 1, 2, 2, 2, 1, 0, 0, -2)),
+        CountingSystem("wong-halves", (-1, 0.5, 1, 1, 1.5, 1, 0.5, 0, -0.5, -1)),
+    )
+}
+
+def get_counting_system(system):
+    """Look up a system by name (a CountingSystem passes through unchanged)"""
+    if isinstance(system, CountingSystem):
+        return system
+    try:
+        return COUNTING_SYSTEMS[system.lower()]
+    except (KeyError, AttributeError):
+        raise ValueError(f"Unknown counting system {system!r}; choose from {', '.join(COUNTING_SYSTEMS)}")
@@ -0,0 +1,144 @@
+"""
+Dealer final-total probabilities
+
+Exact distribution of the dealer's final hand (17-21, blackjack, bust) for an
+upcard, either drawing from a finite shoe composition (cards removed as they are
+drawn) or from an infinite deck. All results are memoized: infinite-deck results
+permanently (there are only a few dozen states), composition results in bounded
+LRU caches so long-running processes don't grow without limit.
+"""
+from functools import lru_cache
+
+# Rank indices: 1 = Ace, 2-9, 10 = any ten-valued card
+RANKS = tuple(range(1, 11))
+# Positions in an outcome vector
+OUTCOMES = ("17", "18", "19", "20", "21", "blackjack", "bust")
+BLACKJACK = 5
+BUST = 6
+# Per-rank draw probabilities of an infinite deck
+INFINITE_DECK = tuple(4 / 13 if rank == 10 else 1 / 13 for rank in RANKS)
+
+
+def shoe_composition(num_decks):
+    """Cards per rank (index rank - 1) in a full shoe"""
+    return tuple(16 * num_decks if rank == 10 else 4 * num_decks for rank in RANKS)
+
+def remove_card(composition, rank):
+    return composition[:rank - 1] + (composition[rank - 1] - 1,) + composition[rank:]
+
+def best_total(hard_total, has_ace):
+    """Highest non-busting total, counting one ace as 11 when possible"""
+    if has_ace and hard_total + 10 <= 21:
+        return hard_total + 10
+    return hard_total
+
+def _stands_on(hard_total, has_ace, hits_soft_17):
+    """Final outcome index if the dealer stops here, else None"""
+    total = best_total(hard_total, has_ace)
+    if total > 21:
+        return BUST
+    if total >= 17 and not (hits_soft_17 and total == 17 and has_ace and hard_total == 7):
+        return total - 17
+    return None
+
+def _accumulate(outcome, p, sub):
+    for i in range(len(OUTCOMES)):
+        outcome[i] += p * sub[i]
+
+
+# Bounded: long-running callers evaluate many distinct compositions
+@lru_cache(maxsize=1 << 17)
+def _dealer_from(hard_total, has_ace, composition, hits_soft_17):
+    """Final distribution for a dealer hand of two or more cards, drawing from `composition`"""
+    outcome = [0.0] * len(OUTCOMES)
+    final = _stands_on(hard_total, has_ace, hits_soft_17)
+    if final is not None:
+        outcome[final] = 1.0
+        return tuple(outcome)
+    remaining = sum(composition)
+    for rank in RANKS:
+        count = composition[rank - 1]
+        if count:
+            _accumulate(outcome, count / remaining,
+                        _dealer_from(hard_total + rank, has_ace or rank == 1, remove_card(composition, rank),
+                                     hits_soft_17))
+    return tuple(outcome)
+
+@lru_cache(maxsize=None)
+def _dealer_infinite(hard_total, has_ace, hits_soft_17):
+    outcome = [0.0] * len(OUTCOMES)
+    final = _stands_on(hard_total, has_ace, hits_soft_17)
+    if final is not None:
+        outcome[final] = 1.0
+        return tuple(outcome)
+    for rank, p in zip(RANKS, INFINITE_DECK):
+        _accumulate(outcome, p, _dealer_infinite(hard_total + rank, has_ace or rank == 1, hits_soft_17))
+    return tuple(outcome)
+
+
+def dealer_distribution(upcard, composition=None, hits_soft_17=False, no_blackjack=False):
+    """
+    Probabilities of the dealer finishing on 17, 18, 19, 20, 21, blackjack or bust
+
+    Args:
+        upcard (int): Dealer upcard rank, 1 (Ace) to 10
+        composition (tuple): Unseen cards per rank with the upcard already removed,
+            or None for an infinite deck
+        hits_soft_17 (bool): H17 rules
+        no_blackjack (bool): Condition on the dealer not having blackjack, as after
+            a peek under US rules (the blackjack entry is then 0)
+
+    Returns:
+        tuple: 7 probabilities in OUTCOMES order
+    """
+    if composition is not None:
+        composition = tuple(composition)
+    return _dealer_distribution(1 if upcard == 11 else upcard, composition, hits_soft_17, no_blackjack)
+
+@lru_cache(maxsize=1 << 14)
+def _dealer_distribution(upcard, composition, hits_soft_17, no_blackjack):
+    if composition is None:
+        weights = dict(zip(RANKS, INFINITE_DECK))
+    else:
+        weights = {rank: count for rank, count in zip(RANKS, composition) if count}
+    natural = {1: 10, 10: 1}.get(upcard)
+    if no_blackjack:
+        weights.pop(natural, None)
+    total_weight = sum(weights.values())
+
+    outcome = [0.0] * len(OUTCOMES)
+    for hole, weight in weights.items():
+        p = weight / total_weight
+        if hole == natural:
+            outcome[BLACKJACK] += p
+        elif composition is None:
+            _accumulate(outcome, p, _dealer_infinite(upcard + hole, upcard == 1 or hole == 1, hits_soft_17))
+        else:
+            _accumulate(outcome, p, _dealer_from(upcard + hole, upcard == 1 or hole == 1,
+                                                 remove_card(composition, hole), hits_soft_17))
+    return tuple(outcome)
+
+def dealer_outcomes(upcard, composition, hits_soft_17=False):
+    """Final distribution given the dealer has already peeked and has no blackjack"""
+    return dealer_distribution(upcard, composition, hits_soft_17, no_blackjack=True)
+
+def dealer_distribution_table(composition=None, rules=None, hits_soft_17=None, no_blackjack=False):
+    """
+    Distributions for all ten upcards at once
+
+    composition here is the shoe *before* the upcard is dealt; each row removes its
+    own upcard. Returns a (10, 7) numpy array, rows ordered by upcard 2-10 then Ace
+    (the BasicStrategy column order), columns in OUTCOMES order.
+    """
+    import numpy as np
+    if hits_soft_17 is None:
+        hits_soft_17 = rules.dealer_hits_soft_17 if rules is not None else False
+    rows = []
+    for upcard in (2, 3, 4, 5, 6, 7, 8, 9, 10, 1):
+        remaining = None if composition is None else remove_card(tuple(composition), upcard)
+        rows.append(dealer_distribution(upcard, remaining, hits_soft_17, no_blackjack))
+    return np.array(rows)
+
+def clear_caches():
+    _dealer_from.cache_clear()
+    _dealer_distribution.cache_clear()
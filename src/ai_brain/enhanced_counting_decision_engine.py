@@ -1,13 +1,34 @@
 """Enhanced decision engine with true count optimizations"""
+import json
+import math
+import threading
+import time
+from collections import OrderedDict
 
 class EnhancedCountingDecisionEngine:
-    def __init__(self, basic_strategy, card_counter):
+    # Dealer upcard value for an Ace in the deviation table keys
+    DEALER_ACE = 1
+
+    def __init__(self, basic_strategy, card_counter, cache_size=4096):
         self.basic_strategy = basic_strategy
         self.card_counter = card_counter
 
+        # Decision cache keyed by canonical hand state (0 disables caching)
+        self.cache_size = cache_size
+        self._decision_cache = OrderedDict()
+        self._cache_lock = threading.Lock()
+        self.cache_hits = 0
+        self.cache_misses = 0
+        self._cached_integer_thresholds = None
+
+        # Optional stage-latency sink with an observe(stage, seconds) method
+        self.metrics = None
+
         # True count deviations (expanded set with more common deviations)
         self.deviations = {
             # Format: (player_total, dealer_upcard): {true_count_threshold: action}
+            # Loaded tables key by (player_total, dealer_upcard, hand_type), hand_type "hard", "soft" or
+            # "pair"; those keys are tried first (see _deviation_keys)
             
             # Hard totals
             (16, 10): {0: "surrender", 4: "stand"},  # 16 vs 10 - surrender at TC 0+, stand at TC 4+
@@ -46,27 +67,75 @@ class EnhancedCountingDecisionEngine:
         self.max_deviation_tc = 6  # Don't deviate beyond this true count
         self.min_confidence_threshold = 0.6
 
-    def make_decision(self, player_hand, dealer_upcard, can_double=True, can_split=False, can_surrender=True):
-        """Enhanced decision making with true count deviations"""
-        true_count = self.card_counter.get_true_count()
-        player_total = self._calculate_hand_total(player_hand)
-        
+    def make_decision(self, player_hand, dealer_upcard, can_double=True, can_split=False, can_surrender=True,
+                      card_counter=None):
+        """Enhanced decision making with true count deviations
+
+        card_counter overrides the engine's own counter for this call, so one engine
+        can serve many independent count contexts (e.g. API requests).
+        """
+        counter = card_counter if card_counter is not None else self.card_counter
+        true_count = counter.get_true_count()
         # Clamp true count for safety
         clamped_tc = max(-self.max_deviation_tc, min(self.max_deviation_tc, true_count))
 
+        if self.cache_size:
+            key = self._cache_key(player_hand, dealer_upcard, clamped_tc, can_double, can_split, can_surrender)
+            with self._cache_lock:
+                cached = self._decision_cache.get(key)
+                if cached is not None:
+                    self._decision_cache.move_to_end(key)
+                    self.cache_hits += 1
+            if cached is None:
+                cached = self._evaluate_decision(player_hand, dealer_upcard, clamped_tc,
+                                                 can_double, can_split, can_surrender)
+                with self._cache_lock:
+                    self.cache_misses += 1
+                    self._decision_cache[key] = cached
+                    if len(self._decision_cache) > self.cache_size:
+                        self._decision_cache.popitem(last=False)
+        else:
+            cached = self._evaluate_decision(player_hand, dealer_upcard, clamped_tc,
+                                             can_double, can_split, can_surrender)
+
+        final_action, confidence, used_deviation, risk_level = cached
+        return {
+            "action": final_action,
+            "true_count": true_count,
+            "clamped_tc": clamped_tc,
+            "confidence": confidence,
+            "deviation": used_deviation,
+            "advantage": counter.get_betting_advantage(),
+            "risk_level": risk_level
+        }
+
+    def _evaluate_decision(self, player_hand, dealer_upcard, clamped_tc, can_double, can_split, can_surrender):
+        """Count-dependent part of make_decision; returns (action, confidence, deviation, risk_level)"""
+        metrics = self.metrics
+        if metrics is not None:
+            stage_start = time.perf_counter()
+
+        player_total = self._calculate_hand_total(player_hand)
+
         # Get basic strategy action first
-        basic_action = self.basic_strategy.get_action(player_hand, dealer_upcard)
+        basic_action = self.basic_strategy.get_action(player_hand, dealer_upcard, can_double, can_split, can_surrender)
+        if metrics is not None:
+            stage_end = time.perf_counter()
+            metrics.observe("basic_strategy", stage_end - stage_start)
+            stage_start = stage_end
         
         # Check for true count deviations
-        deviation_key = (player_total, dealer_upcard)
         used_deviation = False
         final_action = basic_action
+        deviations = None
+        for deviation_key in self._deviation_keys(player_hand, player_total, dealer_upcard, can_split):
+            deviations = self.deviations.get(deviation_key)
+            if deviations is not None:
+                break
 
-        if deviation_key in self.deviations:
-            deviations = self.deviations[deviation_key]
-            
-            # Sort by true count threshold (ascending)
-            for tc_threshold, action in sorted(deviations.items()):
+        if deviations is not None:
+            # Highest threshold reached wins, e.g. 16 vs 10: surrender from TC 0, stand from TC 4
+            for tc_threshold, action in sorted(deviations.items(), reverse=True):
                 if clamped_tc >= tc_threshold:
                     # Validate action is available
                     if self._is_action_valid(action, can_double, can_split, can_surrender):
@@ -78,18 +147,145 @@ class EnhancedCountingDecisionEngine:
                             used_deviation = True
                             final_action = action
                         break
+        if metrics is not None:
+            stage_end = time.perf_counter()
+            metrics.observe("deviation_scan", stage_end - stage_start)
+            stage_start = stage_end
 
         # Calculate confidence and risk metrics
         confidence = self.calculate_confidence(clamped_tc, player_total, dealer_upcard, used_deviation)
-        
+        risk_level = self._assess_risk_level(clamped_tc, player_total, dealer_upcard)
+        if metrics is not None:
+            metrics.observe("scoring", time.perf_counter() - stage_start)
+        return final_action, confidence, used_deviation, risk_level
+
+    def _deviation_keys(self, player_hand, player_total, dealer_upcard, can_split):
+        """Deviation table keys for a hand, most specific first: pair (if splittable), hard/soft, total only"""
+        aces = player_hand.count(11)
+        total = sum(player_hand)
+        while total > 21 and aces > 0:
+            total -= 10
+            aces -= 1
+        keys = []
+        if can_split and len(player_hand) == 2 and player_hand[0] == player_hand[1]:
+            keys.append((player_total, dealer_upcard, "pair"))
+        keys.append((player_total, dealer_upcard, "soft" if aces > 0 else "hard"))
+        keys.append((player_total, dealer_upcard))
+        return keys
+
+    def _cache_key(self, player_hand, dealer_upcard, clamped_tc, can_double, can_split, can_surrender):
+        """
+        Canonical hand state: (total, is_soft, pair_rank, upcard, tc_bucket, flags)
+
+        Every threshold in the deviation table and the confidence/risk scoring is an
+        integer, so a true count only matters through its floor and whether it sits
+        exactly on an integer. Non-integer thresholds fall back to the exact count.
+        """
+        total = sum(player_hand)
+        aces = player_hand.count(11)
+        while total > 21 and aces > 0:
+            total -= 10
+            aces -= 1
+        pair_rank = player_hand[0] if len(player_hand) == 2 and player_hand[0] == player_hand[1] else None
+
+        if self._integer_thresholds():
+            floor_tc = math.floor(clamped_tc)
+            tc_bucket = (floor_tc, clamped_tc == floor_tc)
+        else:
+            tc_bucket = clamped_tc
+        return (total, aces > 0, pair_rank, dealer_upcard, tc_bucket, can_double, can_split, can_surrender)
+
+    def _integer_thresholds(self):
+        integer_thresholds = self._cached_integer_thresholds
+        if integer_thresholds is None:
+            integer_thresholds = all(float(threshold).is_integer()
+                                     for thresholds in self.deviations.values() for threshold in thresholds)
+            self._cached_integer_thresholds = integer_thresholds
+        return integer_thresholds
+
+    def load_deviations(self, path):
+        """
+        Replace the deviation table with one derived by src/simulation/deviation_indices.py
+
+        Entries are keyed by (player_total, dealer_upcard, hand_type). "above"
+        indices for the same key merge into one threshold table. "below" indices
+        become a floor entry for the deviation plus the basic action from
+        index + 1 upward, since the highest threshold reached wins, so they must
+        be the only entry for their key. Conflicting entries raise ValueError.
+        """
+        with open(path) as f:
+            table = json.load(f)
+        deviations = {}
+        below_keys = set()
+        for entry in table["indices"]:
+            if entry["index"] is None:
+                continue
+            key = self._entry_key(entry)
+            if key in below_keys or (entry["direction"] != "above" and key in deviations):
+                raise ValueError(f"Conflicting deviation entries for {key}: a 'below' index must be the only "
+                                 f"entry for its hand")
+            if entry["direction"] == "above":
+                new = {entry["index"]: entry["deviation_action"]}
+            else:
+                below_keys.add(key)
+                new = {-self.max_deviation_tc: entry["deviation_action"], entry["index"] + 1: entry["basic_action"]}
+            thresholds = deviations.setdefault(key, {})
+            for threshold, action in new.items():
+                if thresholds.get(threshold, action) != action:
+                    raise ValueError(f"Conflicting deviation entries for {key} at TC {threshold}: "
+                                     f"{thresholds[threshold]} and {action}")
+                thresholds[threshold] = action
+        self.deviations = deviations
+        self.invalidate_cache()
+
+    @staticmethod
+    def _entry_key(entry):
+        """Deviation table key for an index table entry (insurance keeps its (name, upcard) key)"""
+        if entry["player_total"] == "insurance":
+            return ("insurance", entry["dealer_upcard"])
+        hand = entry["hand"]
+        if len(hand) == 2 and hand[0] == hand[1]:
+            hand_type = "pair"
+        else:
+            hand_type = "soft" if entry["is_soft"] else "hard"
+        return (entry["player_total"], entry["dealer_upcard"], hand_type)
+
+    def invalidate_cache(self):
+        """Drop cached decisions; call after changing self.deviations or scoring settings"""
+        with self._cache_lock:
+            self._decision_cache.clear()
+            self._cached_integer_thresholds = None
+
+    def __copy__(self):
+        # Copies share the tables but not the decision cache, its lock or its hit counts
+        clone = self.__class__.__new__(self.__class__)
+        clone.__dict__.update(self.__dict__)
+        clone._decision_cache = OrderedDict()
+        clone._cache_lock = threading.Lock()
+        clone.cache_hits = 0
+        clone.cache_misses = 0
+        return clone
+
+    def __getstate__(self):
+        # Locks can't be pickled, and the metrics sink belongs to whoever attached it
+        state = self.__dict__.copy()
+        del state["_cache_lock"]
+        state["metrics"] = None
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self._cache_lock = threading.Lock()
+
+    def get_cache_stats(self):
+        """Hit-rate statistics for the decision cache"""
+        lookups = self.cache_hits + self.cache_misses
         return {
-            "action": final_action,
-            "true_count": true_count,
-            "clamped_tc": clamped_tc,
-            "confidence": confidence,
-            "deviation": used_deviation,
-            "advantage": self.card_counter.get_betting_advantage(),
-            "risk_level": self._assess_risk_level(clamped_tc, player_total, dealer_upcard)
+            "size": len(self._decision_cache),
+            "max_size": self.cache_size,
+            "hits": self.cache_hits,
+            "misses": self.cache_misses,
+            "hit_rate": self.cache_hits / lookups if lookups else 0.0
         }
 
     def _calculate_hand_total(self, hand):
@@ -187,8 +383,8 @@ class EnhancedCountingDecisionEngine:
     def get_deviation_explanation(self, player_total, dealer_upcard, true_count):
         """Get explanation for why a deviation was made"""
         deviation_key = (player_total, dealer_upcard)
-        
-        if deviation_key not in self.deviations:
+
+        if not any(key[:2] == deviation_key for key in self.deviations):
             return "No deviation available for this situation"
             
         explanations = {
@@ -4,6 +4,8 @@ from src.ai_brain.advanced_bankroll_manager import AdvancedBankrollManager
 class OptimizedBankrollManager(AdvancedBankrollManager):
     """Enhanced version of your existing bankroll manager"""
 
+    TRUE_COUNT_MAX_BET_FRACTION = 0.15  # Slightly reduced max bet for calculate_true_count_kelly_bet
+
     def __init__(self, *args, **kwargs):
         super().__init__(*args, **kwargs)
         self.true_count_history = deque(maxlen=50)
@@ -11,6 +13,17 @@ class OptimizedBankrollManager(AdvancedBankrollManager):
 
     def calculate_true_count_kelly_bet(self, true_count, cards_remaining_ratio=0.5):
         """Enhanced Kelly calculation using true count"""
+        base_unit = (self.current_bankroll * self.base_unit_percentage) / 100
+        bet_size = base_unit * self.true_count_kelly_multiplier(true_count, cards_remaining_ratio)
+
+        # Apply all limits
+        bet_size = max(self.min_bet, min(bet_size, self.max_bet))
+        bet_size = min(bet_size, self.current_bankroll * self.TRUE_COUNT_MAX_BET_FRACTION)
+
+        return round(bet_size, 2)
+
+    def true_count_kelly_multiplier(self, true_count, cards_remaining_ratio=0.5):
+        """calculate_true_count_kelly_bet's bet in base units, before table limits"""
         profile = self.risk_profiles[self.risk_level]
 
         # Base advantage calculation (more precise than your current version)
@@ -44,16 +57,6 @@ class OptimizedBankrollManager(AdvancedBankrollManager):
             tc_multiplier = 1 + (true_count * profile["tc_sensitivity"])
             kelly_fraction *= min(tc_multiplier, profile["max_units"])
 
-        # Enhanced bet sizing with deck penetration consideration
-        base_unit = (self.current_bankroll * self.base_unit_percentage) / 100
-        bet_size = base_unit * kelly_fraction
-
         # Penetration bonus (bet more when fewer cards remain)
         penetration_bonus = 1.0 + (max(0, cards_remaining_ratio - 0.5) * 0.2)
-        bet_size *= penetration_bonus
-
-        # Apply all limits
-        bet_size = max(self.min_bet, min(bet_size, self.max_bet))
-        bet_size = min(bet_size, self.current_bankroll * 0.15)  # Slightly reduced max bet
-
-        return round(bet_size, 2)
\ No newline at end of file
+        return kelly_fraction * penetration_bonus
\ No newline at end of file
@@ -0,0 +1,25 @@
+from dataclasses import dataclass
+
+@dataclass(frozen=True)
+class Rules:
+    """Table rules that affect strategy and dealer play
+
+    blackjack_payout only changes the value of naturals, never a playing decision,
+    but it is part of the rule set so tables and results are keyed consistently.
+    """
+    num_decks: int = 6
+    dealer_hits_soft_17: bool = False
+    double_after_split: bool = True
+    late_surrender: bool = True
+    blackjack_payout: float = 1.5
+
+    def key(self):
+        """Short stable name, e.g. '6d_s17_das_ls_3to2'"""
+        payout = {1.5: "3to2", 1.2: "6to5", 1.0: "1to1"}.get(self.blackjack_payout, f"{self.blackjack_payout:g}")
+        return "_".join([
+            f"{self.num_decks}d",
+            "h17" if self.dealer_hits_soft_17 else "s17",
+            "das" if self.double_after_split else "nodas",
+            "ls" if self.late_surrender else "nols",
+            payout,
+        ])
@@ -0,0 +1,237 @@
+# src/ai_brain/strategy_tables.py
+"""
+Rules-parameterized basic strategy generator
+
+Computes total-dependent basic strategy for a rule set from exact probabilities.
+Every two-card starting hand is valued against the shoe with its two cards and
+the upcard removed: the dealer's final-total distribution is computed exactly
+for that composition (conditioned on the dealer not having blackjack), and the
+hand by memoized recursion over stand/hit/double/split/surrender, drawing from
+the same composition without further depletion. A chart cell averages the
+action EVs of the starting hands making up its total, weighted by how often
+each is dealt, which is how published total-dependent charts are built; the
+removal matters for 1- and 2-deck games.
+
+Generated tables are stored as JSON so BasicStrategy(rules=...) loads them in
+milliseconds instead of recomputing.
+"""
+import os
+import sys
+import json
+from dataclasses import asdict
+
+if not __package__:
+    sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..')))
+
+from config.settings import STRATEGY_TABLE_DIR
+from src.ai_brain.rules import Rules
+from src.ai_brain.dealer_probabilities import RANKS, BUST, shoe_composition, remove_card, best_total, dealer_outcomes
+
+# Table columns follow BasicStrategy: dealer 2-10, then Ace
+UPCARD_COLUMNS = (2, 3, 4, 5, 6, 7, 8, 9, 10, 1)
+TABLE_VERSION = 2  # Bumped when generation changes, so stale persisted tables are regenerated
+
+
+class _HandEvaluator:
+    """Memoized player expected values against one dealer upcard, drawing from `composition`"""
+
+    def __init__(self, rules, upcard, composition):
+        self.rules = rules
+        remaining = sum(composition)
+        self.draw_probs = tuple((rank, count / remaining) for rank, count in zip(RANKS, composition) if count)
+        self.dealer = dealer_outcomes(upcard, composition, rules.dealer_hits_soft_17)
+        self._stand = {}
+        self._play = {}
+
+    def stand(self, total):
+        if total > 21:
+            return -1.0
+        ev = self._stand.get(total)
+        if ev is None:
+            ev = self.dealer[BUST]
+            for final, p in zip(range(17, 22), self.dealer):
+                if total > final:
+                    ev += p
+                elif total < final:
+                    ev -= p
+            self._stand[total] = ev
+        return ev
+
+    def _after_card(self, hard_total, has_ace, rank):
+        return hard_total + rank, has_ace or rank == 1
+
+    def hit(self, hard_total, has_ace):
+        """EV of taking a card and then playing on optimally (stand or hit only)"""
+        ev = 0.0
+        for rank, p in self.draw_probs:
+            hard, ace = self._after_card(hard_total, has_ace, rank)
+            ev += p * (-1.0 if hard > 21 else self.play(hard, ace))
+        return ev
+
+    def play(self, hard_total, has_ace):
+        """Best EV once doubling/surrender are no longer available"""
+        key = (hard_total, has_ace)
+        ev = self._play.get(key)
+        if ev is None:
+            ev = max(self.stand(best_total(hard_total, has_ace)), self.hit(hard_total, has_ace))
+            self._play[key] = ev
+        return ev
+
+    def double(self, hard_total, has_ace):
+        ev = 0.0
+        for rank, p in self.draw_probs:
+            hard, ace = self._after_card(hard_total, has_ace, rank)
+            ev += p * self.stand(best_total(hard, ace))
+        return 2.0 * ev
+
+    def options(self, hard_total, has_ace, can_double=True, can_surrender=True):
+        """EV of every legal action for a two-card hand"""
+        evs = {
+            'S': self.stand(best_total(hard_total, has_ace)),
+            'H': self.hit(hard_total, has_ace),
+        }
+        if can_double:
+            evs['D'] = self.double(hard_total, has_ace)
+        if can_surrender and self.rules.late_surrender:
+            evs['R'] = -0.5
+        return evs
+
+    def split(self, rank):
+        """EV of splitting a pair (no resplits; split aces receive one card each)"""
+        ev = 0.0
+        for drawn, p in self.draw_probs:
+            hard, ace = self._after_card(rank, rank == 1, drawn)
+            if rank == 1:
+                ev += p * self.stand(best_total(hard, ace))
+            else:
+                ev += p * max(self.options(hard, ace, can_double=self.rules.double_after_split,
+                                           can_surrender=False).values())
+        return 2.0 * ev
+
+
+def _action_code(evs):
+    """Table code for the best action, with a fallback for double/surrender
+
+    'D' / 'Ds' = double, otherwise hit / stand; 'Rh' / 'Rs' = surrender, otherwise hit / stand.
+    """
+    best = max(evs, key=evs.get)
+    if best in ('D', 'R'):
+        fallback = 'S' if evs['S'] >= evs['H'] else 'H'
+        if best == 'D':
+            return 'D' if fallback == 'H' else 'Ds'
+        return 'R' + fallback.lower()
+    return best
+
+def _starting_hands(composition):
+    """{(low rank, high rank): relative frequency} of the two-card hands dealt from composition"""
+    hands = {}
+    for first in RANKS:
+        for second in RANKS[first - 1:]:
+            count = composition[first - 1]
+            weight = count * (count - 1) if first == second else 2 * count * composition[second - 1]
+            if weight > 0:
+                hands[(first, second)] = weight
+    return hands
+
+def _average_options(rules, upcard, composition, hands, split_rank=None):
+    """Frequency-weighted EV of every action over starting hands of the same total"""
+    totals = {}
+    weight_sum = sum(hands.values())
+    for (first, second), weight in hands.items():
+        evaluator = _HandEvaluator(rules, upcard, remove_card(remove_card(composition, first), second))
+        evs = evaluator.options(first + second, first == 1 or second == 1)
+        if split_rank is not None:
+            evs['P'] = evaluator.split(split_rank)
+        for action, ev in evs.items():
+            totals[action] = totals.get(action, 0.0) + ev * weight / weight_sum
+    return totals
+
+def generate_strategy_tables(rules=Rules()):
+    """Compute hard, soft and pair tables in the BasicStrategy layout"""
+    hard = {total: [] for total in range(5, 22)}
+    soft = {total: [] for total in range(13, 21)}
+    pairs = {('A' if rank == 1 else str(rank)) + ',' + ('A' if rank == 1 else str(rank)): [] for rank in RANKS}
+
+    for upcard in UPCARD_COLUMNS:
+        composition = remove_card(shoe_composition(rules.num_decks), upcard)
+        hands = _starting_hands(composition)
+        for total in hard:
+            cards = {hand: weight for hand, weight in hands.items() if 1 not in hand and sum(hand) == total}
+            if cards:
+                evs = _average_options(rules, upcard, composition, cards)
+            else:  # Hard 21 takes three cards; value it against the post-upcard shoe
+                evs = _HandEvaluator(rules, upcard, composition).options(total, False)
+            hard[total].append(_action_code(evs))
+        for total in soft:
+            ace_hand = (1, total - 11)
+            soft[total].append(_action_code(_average_options(rules, upcard, composition,
+                                                             {ace_hand: hands[ace_hand]})))
+        for rank in RANKS:
+            key = ('A' if rank == 1 else str(rank)) + ',' + ('A' if rank == 1 else str(rank))
+            evs = _average_options(rules, upcard, composition, {(rank, rank): hands[(rank, rank)]}, split_rank=rank)
+            pairs[key].append(_action_code(evs))
+
+    return {"hard": hard, "soft": soft, "pairs": pairs}
+
+
+def table_path(rules, directory=None):
+    return os.path.join(directory or STRATEGY_TABLE_DIR, f"basic_strategy_{rules.key()}.json")
+
+def save_strategy_tables(rules, tables, directory=None):
+    path = table_path(rules, directory)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, "w") as f:
+        json.dump({"version": TABLE_VERSION, "rules": asdict(rules), **tables}, f, indent=1)
+    return path
+
+def load_strategy_tables(rules=Rules(), directory=None, generate=True):
+    """
+    Load persisted tables for a rule set, generating and saving them on first use
+
+    Returns:
+        dict: {"hard": {total: [codes]}, "soft": {...}, "pairs": {"A,A": [...], ...}}
+    """
+    path = table_path(rules, directory)
+    data = None
+    if os.path.exists(path):
+        with open(path) as f:
+            data = json.load(f)
+        if data.get("version") != TABLE_VERSION:  # Written by an older generator
+            data = None
+    if data is not None:
+        return {
+            "hard": {int(total): row for total, row in data["hard"].items()},
+            "soft": {int(total): row for total, row in data["soft"].items()},
+            "pairs": data["pairs"],
+        }
+    if not generate:
+        raise FileNotFoundError(path)
+    tables = generate_strategy_tables(rules)
+    save_strategy_tables(rules, tables, directory)
+    return tables
+
+
+def _print_table(title, table):
+    print(title)
+    print(f"{'':>6} " + " ".join(f"{('A' if c == 1 else str(c)):>3}" for c in UPCARD_COLUMNS))
+    for key, row in table.items():
+        print(f"{key!s:>6} " + " ".join(f"{code:>3}" for code in row))
+    print()
+
+if __name__ == "__main__":
+    import argparse
+    parser = argparse.ArgumentParser(description="Generate basic strategy for a rule set")
+    parser.add_argument("--decks", type=int, default=6)
+    parser.add_argument("--h17", action="store_true", help="Dealer hits soft 17")
+    parser.add_argument("--no-das", action="store_true", help="No double after split")
+    parser.add_argument("--no-surrender", action="store_true", help="No late surrender")
+    parser.add_argument("--payout", type=float, default=1.5, help="Blackjack payout (1.5 = 3:2, 1.2 = 6:5)")
+    args = parser.parse_args()
+
+    rules = Rules(num_decks=args.decks, dealer_hits_soft_17=args.h17, double_after_split=not args.no_das,
+                  late_surrender=not args.no_surrender, blackjack_payout=args.payout)
+    tables = generate_strategy_tables(rules)
+    print(f"Saved to {save_strategy_tables(rules, tables)}\n")
+    _print_table("Hard totals", tables["hard"])
+    _print_table("Soft totals", tables["soft"])
+    _print_table("Pairs", tables["pairs"])
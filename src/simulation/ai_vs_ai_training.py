@@ -1,26 +1,37 @@
 # Enhanced Bankroll Management with Advanced Analytics
 import sys
 import os
-sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..')))
+if not __package__:
+    # Run as a script: make the repo root importable for the src.* imports below
+    sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..')))
 
+import argparse
 import random
+import time
 import math
 from collections import deque
 from src.ai_brain.card_counter import CardCounter
 from src.ai_brain.basic_strategy import BasicStrategy
-from src.simulation.shoe import BlackjackShoe
+from src.simulation.shoe import ArrayBlackjackShoe, load_shoe_block
 from src.ai_brain.decision_engine import CountingDecisionEngine  # Import the missing class
 from src.ai_brain.EnhancedCardCounter import EnhancedCardCounter
 from src.ai_brain.advanced_bankroll_manager import AdvancedBankrollManager
 from src.ai_brain.enhanced_counting_decision_engine import EnhancedCountingDecisionEngine
 from src.ai_brain.optimized_bankroll_manager import OptimizedBankrollManager  
+from src.utils.events import NULL_SINK, EVENT_SINK_MODES, make_event_sink
+from src.utils.checkpoint import SnapshotWriter, load_snapshot
+from src.utils.data_loader import HandStoreWriter
+from src.utils.precision import PrecisionTarget, ResultStats, confidence_interval
 
 # Enhanced AI Bot with new bankroll manager
 class OptimizedAIBot:
     def __init__(self, strategy, name="AI", initial_bankroll=1000, 
-                 risk_level="moderate", unit_percentage=1.0):
+                 risk_level="moderate", unit_percentage=1.0, events=None, records=None, seat=0):
         self.name = name
         self.strategy = strategy
+        self.events = events or NULL_SINK
+        self.records = records  # Optional src.utils.data_loader.HandStoreWriter
+        self.seat = seat
         self.bankroll_manager = AdvancedBankrollManager(
             initial_bankroll=initial_bankroll,
             base_unit_percentage=unit_percentage,
@@ -36,8 +47,10 @@ class OptimizedAIBot:
         self.deviation_count = 0
         self.hands_played = 0
         self.risk_reductions = 0  # Track how many times risk was reduced
+        self.results = ResultStats()  # Bankroll change and bet per hand, for error bars
+        self.last_hand = None  # (player cards, hole card, bet, bankroll change, bankroll before)
         
-    def play_hand(self, dealer_upcard, shoe, card_counter=None, active_ais=None):
+    def play_hand(self, dealer_upcard, shoe, card_counter=None, active_ais=None, round_num=0):
         if self.bankroll_manager.is_broke():
             if self.name == "EnhancedOptimalAI":
                 result = self.play_hand(dealer_upcard, shoe, card_counter, active_ais)
@@ -85,16 +98,23 @@ class OptimizedAIBot:
         hand_type = "blackjack" if is_blackjack else "normal"
         
         # Update bankroll with enhanced tracking
+        bankroll_before = self.bankroll_manager.current_bankroll
         self.bankroll_manager.update_bankroll(result, bet_size, hand_type)
+        change = self.bankroll_manager.current_bankroll - bankroll_before
+        self.results.add(change, bet_size)
+        self.last_hand = (player_hand, dealer_hand[1], bet_size, change, bankroll_before)
 
-        # Enhanced logging
-        stats = self.bankroll_manager.get_advanced_stats()
-        risk_indicator = "⚠️" if self.bankroll_manager.should_reduce_risk() else ""
-        
-        print(f"[{self.name}] {risk_indicator} Hand: {player_hand} vs {dealer_upcard} | "
-              f"Bet: ${bet_size:.2f} | Result: {result} | "
-              f"Bankroll: ${stats['current_bankroll']:.2f} | "
-              f"DD: {stats['current_drawdown']:.1f}% | TC: {true_count:.1f}")
+        if self.records is not None:
+            self.records.append(round_num, self.seat, player_hand, dealer_upcard, true_count,
+                                decision_info.get("action"), bet_size, change)
+
+        # Per-hand event; the stats behind it are only computed when a sink listens
+        if self.events.enabled:
+            stats = self.bankroll_manager.get_advanced_stats()
+            self.events.emit("hand", bot=self.name, player_hand=player_hand, dealer_upcard=dealer_upcard,
+                             bet=float(bet_size), result=result, bankroll=float(stats['current_bankroll']),
+                             drawdown=float(stats['current_drawdown']), true_count=float(true_count),
+                             risk_reduced=self.bankroll_manager.should_reduce_risk())
 
         return result
     
@@ -134,113 +154,173 @@ class OptimizedAIBot:
             "busts": self.busts,
             "deviation_count": self.deviation_count,
             "risk_reductions": self.risk_reductions,
-            **bankroll_stats
+            **bankroll_stats,
+            **result_stats_fields(self.results)
         }
+
+def result_stats_fields(results):
+    """Per-hand EV and return on the amount bet, with standard errors, for a stats dict"""
+    return {
+        "ev_per_hand": results.ev,
+        "ev_standard_error": results.ev_standard_error,
+        "bet_roi": results.roi,
+        "bet_roi_standard_error": results.roi_standard_error,
+        "hand_results": results.to_dict(),
+    }
+
+def precision_reached(target, all_stats):
+    """True once every bot still playing has reached the target (bots that went broke add no more hands)"""
+    return all(target.reached_by(ResultStats.from_dict(stats["hand_results"]))
+               for stats in all_stats if stats["current_bankroll"] > 0)
+
 class EnhancedOptimalAI(OptimizedAIBot):
-    def __init__(self, strategy, name="EnhancedOptimalAI", initial_bankroll=1000, risk_level="moderate", unit_percentage=1.0):
-        super().__init__(strategy, name, initial_bankroll, risk_level, unit_percentage)
+    def __init__(self, strategy, name="EnhancedOptimalAI", initial_bankroll=1000, risk_level="moderate", unit_percentage=1.0, events=None,
+                 records=None, seat=0):
+        super().__init__(strategy, name, initial_bankroll, risk_level, unit_percentage, events, records, seat)
         self.bankroll_manager = OptimizedBankrollManager(
             initial_bankroll=initial_bankroll,
             base_unit_percentage=unit_percentage,
             risk_level=risk_level
         )
 
-def run_optimized_simulation(rounds=60000, log_interval=1000):
-    """Run simulation with optimized bankroll management"""
-    print("\n🚀 OPTIMIZED AI SIMULATION WITH ADVANCED BANKROLL MANAGEMENT 🚀\n")
+class CommonCards:
+    """Deals a fixed list of cards, so every bot can be handed the same ones"""
 
-    basic_strategy = BasicStrategy()
+    def __init__(self, cards):
+        self.cards = cards
+        self.position = 0
 
-    # Initialize enhanced components
-    enhanced_counter = EnhancedCardCounter(num_decks=6)
-    basic_strategy = BasicStrategy()
-    enhanced_decision_engine = EnhancedCountingDecisionEngine(basic_strategy, enhanced_counter)
+    def draw_card(self):
+        card = self.cards[self.position]
+        self.position += 1
+        return card
 
-    
-    # Create optimized AI bots
-    conservative_ai = OptimizedAIBot(
-        basic_strategy, 
-        name="ConservativeAI", 
-        initial_bankroll=1000,
-        risk_level="ultra_conservative",
-        unit_percentage=0.75
-    )
-
-    counter = CardCounter(num_decks=6)
-    smart_strategy = CountingDecisionEngine(basic_strategy, counter)
-    
-    optimal_ai = OptimizedAIBot(
-        smart_strategy, 
-        name="OptimalAI",
-        initial_bankroll=1000,
-        risk_level="moderate", 
-        unit_percentage=1.0
-    )
-    
-    aggressive_ai = OptimizedAIBot(
-        smart_strategy,
-        name="ControlledAggressiveAI",
-        initial_bankroll=1000,
-        risk_level="aggressive",
-        unit_percentage=1.25
-
-    )
-    enhanced_ai = EnhancedOptimalAI(
-    enhanced_decision_engine,
-    name="EnhancedOptimalAI",
-    initial_bankroll=1000,
-    risk_level="moderate",
-    unit_percentage=1.0
-)
-
-    shoe = BlackjackShoe(num_decks=6)
-    all_ais = [conservative_ai, optimal_ai, aggressive_ai, enhanced_ai]
-
-    for round_num in range(1, rounds + 1):
+class OptimizedSimulation:
+    """
+    One run of the four bots: the bots, the shared counter and the shoe
+
+    The shoe is the only source of randomness, so a fixed `seed` (an int or a
+    numpy SeedSequence) replays the same rounds. `shoes` (a block from
+    src.simulation.shoe) deals those pregenerated shoes in order instead.
+    With `records` (a src.utils.data_loader.HandStoreWriter) every hand is
+    stored with the bot's position in all_ais as its seat and the bankroll
+    change as its result.
+
+    Normally each bot draws its own cards from the shared shoe after the bots
+    before it. common_cards=True deals a round's cards once and gives every bot
+    the same player cards and hole card (common random numbers), so
+    differences between bots come from their play and betting, not their luck.
+    """
+
+    def __init__(self, events=None, seed=None, shoes=None, records=None, common_cards=False):
+        self.events = events or NULL_SINK
+        self.common_cards = common_cards
+        basic_strategy = BasicStrategy()
+
+        # Initialize enhanced components
+        enhanced_counter = EnhancedCardCounter(num_decks=6)
+        enhanced_decision_engine = EnhancedCountingDecisionEngine(basic_strategy, enhanced_counter)
+
+        # Create optimized AI bots
+        conservative_ai = OptimizedAIBot(
+            basic_strategy,
+            name="ConservativeAI",
+            initial_bankroll=1000,
+            risk_level="ultra_conservative",
+            unit_percentage=0.75,
+            events=self.events
+        )
+
+        self.counter = CardCounter(num_decks=6)
+        smart_strategy = CountingDecisionEngine(basic_strategy, self.counter)
+
+        optimal_ai = OptimizedAIBot(
+            smart_strategy,
+            name="OptimalAI",
+            initial_bankroll=1000,
+            risk_level="moderate",
+            unit_percentage=1.0,
+            events=self.events
+        )
+
+        aggressive_ai = OptimizedAIBot(
+            smart_strategy,
+            name="ControlledAggressiveAI",
+            initial_bankroll=1000,
+            risk_level="aggressive",
+            unit_percentage=1.25,
+            events=self.events
+        )
+        enhanced_ai = EnhancedOptimalAI(
+            enhanced_decision_engine,
+            name="EnhancedOptimalAI",
+            initial_bankroll=1000,
+            risk_level="moderate",
+            unit_percentage=1.0,
+            events=self.events
+        )
+
+        self.shoe = ArrayBlackjackShoe(num_decks=6, seed=seed, shoes=shoes)
+        self.all_ais = [conservative_ai, optimal_ai, aggressive_ai, enhanced_ai]
+        for seat, ai in enumerate(self.all_ais):
+            ai.records = records
+            ai.seat = seat
+        self.round_num = 0
+        self.dealer_upcard = None
+
+    def play_round(self, rounds=None):
+        """Deal one upcard and play every bot that isn't broke against it"""
+        self.round_num += 1
+        shoe, counter = self.shoe, self.counter
         if shoe.penetration() > 75:
             shoe.shuffle()
             counter.reset()
 
-        dealer_upcard = shoe.draw_card()
+        dealer_upcard = self.dealer_upcard = shoe.draw_card()
         counter.update_count([dealer_upcard])
 
-        if round_num % 50 == 0:  # Reduced logging frequency
-            print(f"\n=== Round {round_num}/{rounds} ===")
+        if self.events.enabled and self.round_num % 50 == 0:  # Reduced logging frequency
+            self.events.emit("round_start", round=self.round_num, rounds=rounds)
 
         # Play hands
+        if self.common_cards:
+            round_cards = [shoe.draw_card(), shoe.draw_card(), shoe.draw_card()]
         active_ais = []
-        for ai in all_ais:
+        for ai in self.all_ais:
             if not ai.bankroll_manager.is_broke():
-                result = ai.play_hand(dealer_upcard, shoe, counter if "Conservative" not in ai.name else None, active_ais)
+                hand_shoe = CommonCards(round_cards) if self.common_cards else shoe
+                result = ai.play_hand(dealer_upcard, hand_shoe, counter if "Conservative" not in ai.name else None,
+                                      active_ais, self.round_num)
                 if result != "broke":
                     active_ais.append(ai)
 
-        # Progress logging
-        if round_num % log_interval == 0:
-            print(f"\n{'='*60}")
-            print(f"ADVANCED ANALYTICS - ROUND {round_num}")
-            print(f"{'='*60}")
-            
-            for ai in all_ais:
-                stats = ai.get_comprehensive_stats()
-                print(f"\n[{stats['name']}] - Performance Dashboard")
-                print(f"  💰 Bankroll: ${stats['current_bankroll']:.2f} (ROI: {stats['roi_percentage']:.1f}%)")
-                print(f"  📊 Record: {stats['wins']}W-{stats['losses']}L-{stats['pushes']}P ({stats['win_rate']:.1f}%)")
-                print(f"  🎯 Risk Metrics: Max DD {stats['max_drawdown']:.1f}% | Volatility {stats['volatility']:.1f}%")
-                print(f"  📈 Sharpe Ratio: {stats['sharpe_ratio']:.2f}")
-                print(f"  💸 Current Unit: ${stats['current_unit_size']:.2f} | Avg Recent Bet: ${stats['avg_recent_bet']:.2f}")
-                if stats['risk_reductions'] > 0:
-                    print(f"  ⚠️  Risk Reductions Triggered: {stats['risk_reductions']}")
+    def get_comprehensive_stats(self):
+        return [ai.get_comprehensive_stats() for ai in self.all_ais]
 
-    # Final advanced analysis
+
+def print_dashboard(all_stats, round_num):
+    print(f"\n{'='*60}")
+    print(f"ADVANCED ANALYTICS - ROUND {round_num}")
+    print(f"{'='*60}")
+
+    for stats in all_stats:
+        print(f"\n[{stats['name']}] - Performance Dashboard")
+        print(f"  💰 Bankroll: ${stats['current_bankroll']:.2f} (ROI: {stats['roi_percentage']:.1f}%)")
+        print(f"  📊 Record: {stats['wins']}W-{stats['losses']}L-{stats['pushes']}P ({stats['win_rate']:.1f}%)")
+        print(f"  🎯 Risk Metrics: Max DD {stats['max_drawdown']:.1f}% | Volatility {stats['volatility']:.1f}%")
+        print(f"  📈 Sharpe Ratio: {stats['sharpe_ratio']:.2f}")
+        print(f"  💸 Current Unit: ${stats['current_unit_size']:.2f} | Avg Recent Bet: ${stats['avg_recent_bet']:.2f}")
+        if stats['risk_reductions'] > 0:
+            print(f"  ⚠️  Risk Reductions Triggered: {stats['risk_reductions']}")
+
+def print_final_report(final_stats):
     print(f"\n{'='*70}")
     print("🏆 FINAL ADVANCED PERFORMANCE ANALYSIS 🏆")
     print(f"{'='*70}")
-    
+
     # Rank by risk-adjusted returns (Sharpe ratio)
-    final_stats = [ai.get_comprehensive_stats() for ai in all_ais]
     ranked_ais = sorted(final_stats, key=lambda x: x['sharpe_ratio'], reverse=True)
-    
+
     for i, stats in enumerate(ranked_ais, 1):
         print(f"\n🥇 RANK #{i}: [{stats['name']}]")
         print(f"  Final Bankroll: ${stats['current_bankroll']:.2f}")
@@ -250,11 +330,255 @@ def run_optimized_simulation(rounds=60000, log_interval=1000):
         print(f"  Win Rate: {stats['win_rate']:.2f}%")
         print(f"  Volatility: {stats['volatility']:.2f}%")
         print(f"  Total Hands: {stats['hands_played']}")
+        ev_low, ev_high = confidence_interval(stats['ev_per_hand'], stats['ev_standard_error'])
+        print(f"  EV per Hand: ${stats['ev_per_hand']:.3f} (95% CI ${ev_low:.3f} to ${ev_high:.3f})")
+        roi_low, roi_high = confidence_interval(stats['bet_roi'], stats['bet_roi_standard_error'])
+        print(f"  Return per $ Bet: {stats['bet_roi'] * 100:.2f}% (95% CI {roi_low * 100:.2f}% to {roi_high * 100:.2f}%)")
         if stats['deviation_count'] > 0:
             print(f"  Counting Deviations: {stats['deviation_count']}")
         if stats['risk_reductions'] > 0:
             print(f"  Emergency Risk Reductions: {stats['risk_reductions']}")
 
+def run_optimized_simulation(rounds=60000, log_interval=1000, events=None, seed=None, shoes=None,
+                             checkpoint_path=None, checkpoint_every=10000, resume=False, records=None, target=None):
+    """
+    Run simulation with optimized bankroll management
+
+    Per-hand and per-round lines go to `events` (see src.utils.events); the
+    default sink drops them, pass ConsoleSink() for the full console log. See
+    OptimizedSimulation for `seed` and `shoes`.
+
+    With checkpoint_path the whole simulation is snapshotted every
+    checkpoint_every rounds (written in the background, see
+    src.utils.checkpoint); resume=True continues from that snapshot, if there
+    is one, with results identical to an uninterrupted run.
+
+    `records` stores every hand in a columnar hand store (see
+    src.utils.data_loader); it is flushed at each checkpoint, and a resumed
+    run rolls it back to the snapshot before carrying on.
+
+    With a target (src.utils.precision.PrecisionTarget on each bot's per-hand
+    bankroll change and bet) `rounds` is only the limit: the run stops once
+    every bot still in play has reached it.
+    """
+    print("\n🚀 OPTIMIZED AI SIMULATION WITH ADVANCED BANKROLL MANAGEMENT 🚀\n")
+    if resume and checkpoint_path and os.path.exists(checkpoint_path):
+        simulation = load_snapshot(checkpoint_path, events, records)["simulation"]
+        print(f"Resuming from round {simulation.round_num}")
+    else:
+        simulation = OptimizedSimulation(events=events, seed=seed, shoes=shoes, records=records)
+    writer = SnapshotWriter(checkpoint_path) if checkpoint_path else None
+
+    try:
+        for round_num in range(simulation.round_num + 1, rounds + 1):
+            simulation.play_round(rounds)
+
+            # Progress logging
+            if round_num % log_interval == 0:
+                print_dashboard(simulation.get_comprehensive_stats(), round_num)
+            if writer is not None and round_num % checkpoint_every == 0:
+                if records is not None:
+                    records.flush()
+                writer.submit({"simulation": simulation})
+            if target is not None and all(target.reached_by(ai.results) for ai in simulation.all_ais
+                                          if not ai.bankroll_manager.is_broke()):
+                print(f"\nPrecision target ({target.describe()}) reached after {round_num} rounds")
+                break
+    finally:
+        if writer is not None:
+            writer.close()
+        if records is not None:
+            records.close()
+
+    # Final advanced analysis
+    final_stats = simulation.get_comprehensive_stats()
+    print_final_report(final_stats)
+    return final_stats
+
+
+# Per-bot fields that add up across independent shards
+SUMMED_STATS = ("hands_played", "wins", "losses", "pushes", "blackjacks", "busts", "deviation_count",
+                "risk_reductions", "initial_bankroll", "current_bankroll", "profit_loss", "total_wagered")
+
+def shard_seed(seed, shard):
+    """Independent, reproducible seed stream for one shard"""
+    import numpy as np
+    return np.random.SeedSequence(seed, spawn_key=(shard,))
+
+def simulate_shard(shard, rounds, seed):
+    """Worker: one independent session of `rounds` rounds; returns (shard, per-bot stats)"""
+    simulation = OptimizedSimulation(seed=shard_seed(seed, shard))
+    for _ in range(rounds):
+        simulation.play_round(rounds)
+    return shard, simulation.get_comprehensive_stats()
+
+def merge_bot_stats(shard_stats):
+    """
+    Combine one bot's get_comprehensive_stats() from several shards
+
+    Shards are separate sessions, so counts, bankrolls and amounts are summed
+    (ROI is against the combined starting bankroll), extremes keep the best or
+    worst session, per-session ratios (Sharpe, volatility) are averaged and the
+    "current" fields come from the last shard.
+    """
+    merged = dict(shard_stats[-1])
+    for key in SUMMED_STATS:
+        merged[key] = sum(stats[key] for stats in shard_stats)
+    merged["max_bankroll"] = max(stats["max_bankroll"] for stats in shard_stats)
+    merged["min_bankroll"] = min(stats["min_bankroll"] for stats in shard_stats)
+    merged["max_drawdown"] = max(stats["max_drawdown"] for stats in shard_stats)
+    for key in ("sharpe_ratio", "volatility"):
+        merged[key] = sum(stats[key] for stats in shard_stats) / len(shard_stats)
+    results = ResultStats()
+    for stats in shard_stats:
+        results.merge(ResultStats.from_dict(stats["hand_results"]))
+    merged.update(result_stats_fields(results))
+    merged["win_rate"] = (merged["wins"] / max(merged["hands_played"], 1)) * 100
+    merged["roi_percentage"] = (merged["profit_loss"] / merged["initial_bankroll"]) * 100
+    merged["shards"] = len(shard_stats)
+    return merged
+
+def run_parallel_simulation(rounds=60000, rounds_per_shard=1000, workers=None, seed=1, progress=None,
+                            checkpoint_path=None, target=None):
+    """
+    Shard a run_optimized_simulation workload across a process pool
+
+    The rounds are cut into shards of rounds_per_shard (the last one may be
+    shorter); each shard plays fresh bots on its own shoe seeded from
+    (seed, shard index). Shards are merged in index order, so a seed gives the
+    same result for any number of workers.
+
+    Args:
+        workers: Worker processes (default: all cores); 1 runs in-process
+        progress: Optional callable(completed_shards, total_shards)
+        checkpoint_path: Completed shards are saved here and skipped on the next run
+        target: Optional PrecisionTarget; `rounds` becomes the limit and the run
+            ends with the shortest run of shards 0..k whose merged stats reach
+            it, so the stopping point also doesn't depend on the worker count
+
+    Returns:
+        list: merged get_comprehensive_stats() per bot, in bot order
+    """
+    shard_rounds = [min(rounds_per_shard, rounds - start) for start in range(0, rounds, rounds_per_shard)]
+    config = {"rounds": rounds, "rounds_per_shard": rounds_per_shard, "seed": seed}
+    results = {}
+    if checkpoint_path and os.path.exists(checkpoint_path):
+        saved = load_snapshot(checkpoint_path)
+        if saved["config"] != config:
+            raise ValueError(f"Checkpoint {checkpoint_path} belongs to a different run: {saved['config']}")
+        results = saved["results"]
+    writer = SnapshotWriter(checkpoint_path) if checkpoint_path else None
+    used = len(shard_rounds)  # Shards 0..used-1 make up the result
+    prefix = 0
+    prefix_stats = None
+
+    def target_reached():
+        # Extend the completed prefix in shard order, stopping at the first one that reaches the target
+        nonlocal prefix, prefix_stats
+        while prefix < len(shard_rounds) and prefix in results:
+            shard_stats = results[prefix]
+            prefix_stats = shard_stats if prefix_stats is None else [
+                merge_bot_stats([merged, stats]) for merged, stats in zip(prefix_stats, shard_stats)]
+            prefix += 1
+            if precision_reached(target, prefix_stats):
+                return True
+        return False
+
+    def record(shard, stats):
+        results[shard] = stats
+        if writer is not None:
+            writer.submit({"config": config, "results": results})
+        if progress:
+            progress(len(results), len(shard_rounds))
+
+    try:
+        if target is not None and target_reached():
+            used = prefix
+        pending = [shard for shard in range(used) if shard not in results]
+        if workers == 1:
+            for shard in pending:
+                record(*simulate_shard(shard, shard_rounds[shard], seed))
+                if target is not None and target_reached():
+                    used = prefix
+                    break
+        elif pending:
+            from concurrent.futures import ProcessPoolExecutor, as_completed
+            with ProcessPoolExecutor(max_workers=workers) as pool:
+                futures = [pool.submit(simulate_shard, shard, shard_rounds[shard], seed) for shard in pending]
+                for future in as_completed(futures):
+                    if future.cancelled():
+                        continue
+                    record(*future.result())
+                    if target is not None and used == len(shard_rounds) and target_reached():
+                        used = prefix
+                        for waiting in futures:
+                            waiting.cancel()
+                    if all(shard in results for shard in range(used)):
+                        break
+    finally:
+        if writer is not None:
+            writer.close()
+
+    by_bot = zip(*(results[shard] for shard in range(used)))
+    return [merge_bot_stats(list(shard_stats)) for shard_stats in by_bot]
+
 
 if __name__ == "__main__":
-    run_optimized_simulation(rounds=60000, log_interval=1000)
\ No newline at end of file
+    parser = argparse.ArgumentParser(description="Compare AI bankroll strategies head to head")
+    parser.add_argument("--rounds", type=int, default=60000)
+    parser.add_argument("--log-interval", type=int, help="Rounds between progress logs (default 1000)")
+    parser.add_argument("--seed", type=int, help="Shoe seed for a reproducible run")
+    parser.add_argument("--shoe-block", help="Replay pregenerated shoes from this .npy block")
+    parser.add_argument("--workers", type=int,
+                        help="Run in parallel shards on this many processes (0 = all cores)")
+    parser.add_argument("--shard-rounds", type=int, default=1000, help="Rounds per parallel shard")
+    parser.add_argument("--checkpoint", help="Snapshot file for crash recovery")
+    parser.add_argument("--checkpoint-every", type=int, help="Rounds between snapshots (default 10000)")
+    parser.add_argument("--resume", action="store_true", help="Continue from the --checkpoint snapshot")
+    parser.add_argument("--events", choices=EVENT_SINK_MODES, default="none",
+                        help="Per-hand event output (console reproduces the full hand log)")
+    parser.add_argument("--event-log", help="Output path for --events binary")
+    parser.add_argument("--sample-every", type=int, default=100, help="Event interval for --events sampled")
+    parser.add_argument("--records", help="Store every hand in this hand store directory (see src/utils/data_loader.py)")
+    parser.add_argument("--target-roi-se", type=float,
+                        help="Stop once every bot's return per $ bet has this standard error (--rounds becomes the limit)")
+    parser.add_argument("--target-ev-se", type=float,
+                        help="Stop once every bot's EV per hand ($) has this standard error")
+    args = parser.parse_args()
+    if args.workers is not None:
+        # Shards play fresh bots on seeded shoes and only return their stats
+        unsupported = [flag for flag, used in (("--shoe-block", args.shoe_block), ("--events", args.events != "none"),
+                                               ("--records", args.records), ("--log-interval", args.log_interval),
+                                               ("--checkpoint-every", args.checkpoint_every)) if used]
+        if unsupported:
+            parser.error(f"{', '.join(unsupported)} cannot be combined with --workers")
+    target = None
+    if args.target_roi_se or args.target_ev_se:
+        target = PrecisionTarget(ev_se=args.target_ev_se, roi_se=args.target_roi_se)
+
+    if args.checkpoint and not args.resume and os.path.exists(args.checkpoint):
+        os.remove(args.checkpoint)
+
+    if args.workers is not None:
+        start = time.perf_counter()
+        final_stats = run_parallel_simulation(
+            rounds=args.rounds, rounds_per_shard=args.shard_rounds, workers=args.workers or None,
+            seed=args.seed if args.seed is not None else 1, checkpoint_path=args.checkpoint, target=target,
+            progress=lambda done, total: print(f"\r{done}/{total} shards", end="", flush=True))
+        print(f"\n{final_stats[0]['shards']} shards in {time.perf_counter() - start:.1f}s")
+        print_final_report(final_stats)
+        sys.exit()
+
+    shoes = load_shoe_block(args.shoe_block) if args.shoe_block else None
+    events = make_event_sink(args.events, path=args.event_log, sample_every=args.sample_every)
+    records = HandStoreWriter(args.records, append=args.resume) if args.records else None
+    try:
+        run_optimized_simulation(rounds=args.rounds, log_interval=args.log_interval or 1000, events=events,
+                                 seed=args.seed, shoes=shoes, checkpoint_path=args.checkpoint,
+                                 checkpoint_every=args.checkpoint_every or 10000, resume=args.resume, records=records,
+                                 target=target)
+    finally:
+        events.close()
+    if args.events == "aggregate":
+        for name, summary in events.summary().items():
+            print(f"{name}: {summary['count']} events")
@@ -0,0 +1,350 @@
+# src/simulation/count_evaluation.py
+"""
+Betting correlation, playing efficiency and insurance correlation of count systems
+
+Betting and insurance correlation are computed analytically: the correlation,
+over the 13 card denominations, between a system's tags and the effects of
+removal (EoR) of each rank on the player's expectation (betting) or on the
+insurance bet (insurance). EoRs are exact: the round EV of composition-dependent
+play is computed for the full shoe and for the shoe minus one card of each rank,
+one composition per worker process, and cached per rule set.
+
+Playing efficiency has no closed form, so it is estimated by simulation. Each
+deviation situation gets its own EoRs, which give a linear model of the gain of
+the deviation for any depleted shoe. Shoes depleted to random depths are drawn
+(multivariate hypergeometric, vectorised, in chunks across worker processes), and
+the gain collected by the best true-count index is compared with the gain
+collected by perfect play of the same model:
+    PE = sum(gain from count-based play) / sum(gain from perfect play)
+weighted by how often each situation is dealt. Only the deviation situations
+of deviation_indices are included, so PE reads higher than figures averaged over
+every playing decision, but systems rank the same way.
+
+Results are cached on disk by (system, rules, samples, penetration, seed).
+The simulation is always cut into PE_CHUNKS seeded chunks, however many worker
+processes run them, so a cached result is the same on every machine.
+
+Usage:
+    python src/simulation/count_evaluation.py
+    python src/simulation/count_evaluation.py --systems hi-lo zen omega-ii --decks 2 --h17
+"""
+import os
+import sys
+import json
+import math
+from dataclasses import asdict
+
+if not __package__:
+    sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..')))
+
+from config.settings import COUNT_EVALUATION_DIR
+from src.ai_brain.rules import Rules
+from src.ai_brain.counting_systems import get_counting_system
+from src.ai_brain.dealer_probabilities import RANKS, shoe_composition, remove_card
+from src.ai_brain.composition_decision_engine import CompositionDecisionEngine
+from src.simulation.deviation_indices import DEFAULT_SITUATIONS, resolve_situations
+
+# Card denominations of one deck as ranks: A, 2-9, T, J, Q, K
+DENOMINATIONS = RANKS + (10, 10, 10)
+# Insurance EoR per rank up to scale: removing a ten hurts the bet, anything else helps
+INSURANCE_EOR = tuple(-9 if rank == 10 else 4 for rank in RANKS)
+# True counts are binned to a quarter for choosing each situation's index
+TC_BINS_PER_COUNT = 4
+TC_LIMIT = 20
+# Fixed, so per-chunk seeds and sample counts do not depend on the machine's core count
+PE_CHUNKS = 32
+
+_engines = {}
+
+
+def _engine(rules):
+    engine = _engines.get(rules)
+    if engine is None:
+        engine = _engines[rules] = CompositionDecisionEngine(rules, cache_size=0)
+    return engine
+
+def _ace(rank):
+    """Rank (Ace = 1) to the card value the engines take (Ace = 11)"""
+    return 11 if rank == 1 else rank
+
+def round_ev(composition, rules=Rules()):
+    """Expected value of one round from `composition` with composition-dependent play"""
+    engine = _engine(rules)
+    total = sum(composition)
+    ev = 0.0
+    for upcard in RANKS:
+        if not composition[upcard - 1]:
+            continue
+        p_upcard = composition[upcard - 1] / total
+        after_upcard = remove_card(composition, upcard)
+        hole_blackjack = 10 if upcard == 1 else 1 if upcard == 10 else None
+        for first in RANKS:
+            for second in RANKS[first - 1:]:
+                p_first = after_upcard[first - 1] / (total - 1)
+                after_first = remove_card(after_upcard, first)
+                p_second = after_first[second - 1] / (total - 2)
+                p = p_upcard * p_first * p_second * (1 if first == second else 2)
+                if not p:
+                    continue
+                unseen = remove_card(after_first, second)
+                p_dealer_blackjack = unseen[hole_blackjack - 1] / (total - 3) if hole_blackjack else 0.0
+                if {first, second} == {1, 10}:
+                    ev += p * (1 - p_dealer_blackjack) * rules.blackjack_payout
+                    continue
+                evs = engine.evaluate([_ace(first), _ace(second)], _ace(upcard), unseen, can_double=True,
+                                      can_split=first == second, can_surrender=True)
+                ev += p * (-p_dealer_blackjack + (1 - p_dealer_blackjack) * max(evs.values()))
+    return ev
+
+def _round_ev_job(args):
+    return round_ev(*args)
+
+def effects_of_removal(rules=Rules(), workers=None):
+    """
+    Change in round EV from removing one card of each rank from a full shoe
+
+    Returns:
+        dict: {"base_ev": float, "eor": [Ace, 2, ..., 9, ten]}
+    """
+    full = shoe_composition(rules.num_decks)
+    jobs = [(full, rules)] + [(remove_card(full, rank), rules) for rank in RANKS]
+    if workers == 1:
+        evs = [_round_ev_job(job) for job in jobs]
+    else:
+        from concurrent.futures import ProcessPoolExecutor
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            evs = list(pool.map(_round_ev_job, jobs))
+    return {"base_ev": evs[0], "eor": [ev - evs[0] for ev in evs[1:]]}
+
+
+def _correlation(xs, ys):
+    n = len(xs)
+    mean_x, mean_y = sum(xs) / n, sum(ys) / n
+    covariance = sum((x - mean_x) * (y - mean_y) for x, y in zip(xs, ys))
+    spread = math.sqrt(sum((x - mean_x) ** 2 for x in xs) * sum((y - mean_y) ** 2 for y in ys))
+    return covariance / spread if spread else 0.0
+
+def _by_denomination(per_rank):
+    return [per_rank[rank - 1] for rank in DENOMINATIONS]
+
+def betting_correlation(system, eor):
+    """Correlation of the tags with the EoRs on the player's expectation"""
+    return _correlation(_by_denomination(get_counting_system(system).tags), _by_denomination(eor))
+
+def insurance_correlation(system):
+    """Correlation of the tags with the EoRs on the insurance bet"""
+    return _correlation(_by_denomination(get_counting_system(system).tags), _by_denomination(INSURANCE_EOR))
+
+
+def _situation_frequency(hand, upcard, split):
+    """How often a decision arises: its two-card total (or exact pair) times the upcard, infinite deck"""
+    p_rank = [4 / 13 if rank == 10 else 1 / 13 for rank in RANKS]
+    ranks = [1 if card == 11 else card for card in hand]
+    p_upcard = p_rank[(1 if upcard == 11 else upcard) - 1]
+    if split:
+        return p_rank[ranks[0] - 1] ** 2 * p_upcard
+    soft = 1 in ranks
+    total = sum(ranks)
+    p_hand = sum(p_rank[first - 1] * p_rank[second - 1] for first in RANKS for second in RANKS
+                 if first + second == total and (1 in (first, second)) == soft and first != second)
+    return p_hand * p_upcard
+
+def decision_models(rules=Rules(), situations=DEFAULT_SITUATIONS):
+    """
+    Linear gain model per playing decision (insurance excluded)
+
+    Returns:
+        list of dict: hand, upcard, composition (unseen), gain (deviation minus basic
+        EV at that composition), eor (change in gain per card of each rank removed)
+        and frequency.
+    """
+    engine = _engine(rules)
+    models = []
+    for situation in resolve_situations(situations, None if rules == Rules() else rules):
+        hand, upcard = situation["hand"], situation["upcard"]
+        basic, deviation = situation["basic"], situation["deviation"]
+        if not hand:
+            continue
+        unseen = shoe_composition(rules.num_decks)
+        for card in hand + [upcard]:
+            unseen = remove_card(unseen, 1 if card == 11 else card)
+        split = "split" in (basic, deviation)
+
+        def gain(composition):
+            evs = engine.evaluate(hand, upcard, composition, can_double=True, can_split=split, can_surrender=True)
+            return evs[deviation] - evs[basic]
+
+        try:
+            base = gain(unseen)
+        except KeyError:
+            continue  # action not allowed by these rules
+        models.append({
+            "hand": hand,
+            "upcard": upcard,
+            "composition": unseen,
+            "gain": base,
+            "eor": [gain(remove_card(unseen, rank)) - base for rank in RANKS],
+            "frequency": _situation_frequency(hand, upcard, split),
+        })
+    return models
+
+
+def _efficiency_chunk(args):
+    """Per-model binned gains for `samples` random depletions of one seed stream"""
+    import numpy as np
+    models, tags, initial_count, imbalance, num_decks, penetration, samples, seed = args
+    rng = np.random.default_rng(seed)
+    tags = np.array(tags, dtype=float)
+    bins = 2 * TC_LIMIT * TC_BINS_PER_COUNT + 1
+    results = []
+    for model in models:
+        composition = np.array(model["composition"])
+        unseen = int(composition.sum())
+        seen_before = num_decks * 52 - unseen
+        cut = max(1, int(num_decks * 52 * penetration) - seen_before)
+        depths = np.sort(rng.integers(0, cut, size=samples))
+        removed = np.empty((samples, len(RANKS)))
+        for depth in np.unique(depths):
+            rows = np.flatnonzero(depths == depth)
+            removed[rows] = rng.multivariate_hypergeometric(composition, int(depth), size=len(rows))
+        expected = depths[:, None] * composition[None, :] / unseen
+        scale = unseen / (unseen - depths)
+        gain = model["gain"] + (removed - expected) @ np.array(model["eor"]) * scale
+
+        seen_tags = sum(tags[(1 if card == 11 else card) - 1] for card in model["hand"] + [model["upcard"]])
+        cards_seen = seen_before + depths
+        running_count = initial_count + seen_tags + removed @ tags
+        drift = initial_count + imbalance * cards_seen / 52
+        true_count = (running_count - drift) / np.maximum(0.5, num_decks - cards_seen / 52)
+        tc_bin = np.clip(np.floor(true_count * TC_BINS_PER_COUNT) + TC_LIMIT * TC_BINS_PER_COUNT, 0, bins - 1)
+        results.append({
+            "binned_gain": np.bincount(tc_bin.astype(int), weights=gain, minlength=bins).tolist(),
+            "perfect_gain": float(np.maximum(gain, 0).sum()),
+            "samples": samples,
+        })
+    return results
+
+def _best_index_gain(binned_gain):
+    """Total gain of the best single true-count threshold (deviate above or below it)"""
+    best = 0.0
+    running = 0.0
+    for value in reversed(binned_gain):
+        running += value
+        best = max(best, running)
+    running = 0.0
+    for value in binned_gain:
+        running += value
+        best = max(best, running)
+    return best
+
+def playing_efficiency(system, models, num_decks, penetration=0.75, samples=200000, chunks=None,
+                       workers=None, seed=1):
+    """
+    Share of perfect-play deviation gains captured by true-count indices
+
+    Returns:
+        (overall, per_situation): per_situation lists each model's efficiency
+    """
+    system = get_counting_system(system)
+    chunks = chunks or PE_CHUNKS
+    per_chunk = math.ceil(samples / chunks)
+    jobs = [(models, system.tags, system.initial_running_count(num_decks), system.deck_imbalance, num_decks,
+             penetration, per_chunk, (seed, chunk)) for chunk in range(chunks)]
+    if workers == 1:
+        chunk_results = [_efficiency_chunk(job) for job in jobs]
+    else:
+        from concurrent.futures import ProcessPoolExecutor
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            chunk_results = list(pool.map(_efficiency_chunk, jobs))
+
+    captured_total = perfect_total = 0.0
+    per_situation = []
+    for index, model in enumerate(models):
+        binned = [sum(values) for values in zip(*(result[index]["binned_gain"] for result in chunk_results))]
+        perfect = sum(result[index]["perfect_gain"] for result in chunk_results)
+        count = sum(result[index]["samples"] for result in chunk_results)
+        captured = _best_index_gain(binned)
+        per_situation.append(captured / perfect if perfect else 1.0)
+        captured_total += model["frequency"] * captured / count
+        perfect_total += model["frequency"] * perfect / count
+    return (captured_total / perfect_total if perfect_total else 1.0), per_situation
+
+
+def _cache_path(name, directory=None):
+    return os.path.join(directory or COUNT_EVALUATION_DIR, name + ".json")
+
+def _cached(path, compute):
+    if path and os.path.exists(path):
+        with open(path) as f:
+            return json.load(f)
+    result = compute()
+    if path:
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, "w") as f:
+            json.dump(result, f, indent=1)
+    return result
+
+def evaluate_counting_system(system="hi-lo", rules=Rules(), samples=200000, penetration=0.75, workers=None,
+                             seed=1, directory=None, use_cache=True):
+    """
+    BC, PE and IC for one counting system under one rule set
+
+    EoRs and decision models depend only on the rules and are cached separately,
+    so evaluating further systems for the same rules only runs the PE simulation.
+    """
+    system = get_counting_system(system)
+
+    def compute_models():
+        return {"eor": effects_of_removal(rules, workers), "models": decision_models(rules)}
+
+    base = _cached(_cache_path(f"eor_{rules.key()}", directory) if use_cache else None, compute_models)
+
+    def compute():
+        efficiency, per_situation = playing_efficiency(system, base["models"], rules.num_decks, penetration,
+                                                       samples, workers=workers, seed=seed)
+        return {
+            "system": system.name,
+            "rules": asdict(rules),
+            "betting_correlation": betting_correlation(system, base["eor"]["eor"]),
+            "playing_efficiency": efficiency,
+            "insurance_correlation": insurance_correlation(system),
+            "situations": [
+                {"hand": model["hand"], "upcard": model["upcard"], "playing_efficiency": value}
+                for model, value in zip(base["models"], per_situation)
+            ],
+            "samples": samples,
+            "penetration": penetration,
+            "seed": seed,
+        }
+
+    name = f"{system.name}_{rules.key()}_{samples}_pen{penetration:g}_{seed}"
+    path = _cache_path(name, directory) if use_cache else None
+    return _cached(path, compute)
+
+
+if __name__ == "__main__":
+    import argparse
+    import time
+    from src.ai_brain.counting_systems import COUNTING_SYSTEMS
+    parser = argparse.ArgumentParser(description="Compare card counting systems")
+    parser.add_argument("--systems", nargs="+", default=list(COUNTING_SYSTEMS))
+    parser.add_argument("--decks", type=int, default=6)
+    parser.add_argument("--h17", action="store_true", help="Dealer hits soft 17")
+    parser.add_argument("--no-das", action="store_true", help="No double after split")
+    parser.add_argument("--no-surrender", action="store_true", help="No late surrender")
+    parser.add_argument("--samples", type=int, default=200000, help="Depleted shoes per situation for PE")
+    parser.add_argument("--penetration", type=float, default=0.75, help="Share of the shoe dealt before the shuffle")
+    parser.add_argument("--workers", type=int, default=None)
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--no-cache", action="store_true", help="Recompute even if results are cached")
+    args = parser.parse_args()
+
+    rules = Rules(num_decks=args.decks, dealer_hits_soft_17=args.h17, double_after_split=not args.no_das,
+                  late_surrender=not args.no_surrender)
+    print(f"{'System':<14} {'BC':>6} {'PE':>6} {'IC':>6}   ({rules.key()})")
+    for name in args.systems:
+        start = time.perf_counter()
+        result = evaluate_counting_system(name, rules, samples=args.samples, penetration=args.penetration,
+                                          workers=args.workers, seed=args.seed, use_cache=not args.no_cache)
+        print(f"{result['system']:<14} {result['betting_correlation']:>6.3f} {result['playing_efficiency']:>6.3f} "
+              f"{result['insurance_correlation']:>6.3f}   {time.perf_counter() - start:.1f}s")
@@ -0,0 +1,416 @@
+# src/simulation/deviation_indices.py
+"""
+Simulation-derived Hi-Lo index numbers for playing deviations
+
+For every situation (player hand vs dealer upcard) both candidate actions are
+played from the same point of the same shoe, so the per-sample difference in
+result has far less variance than two independent runs. Shoes are dealt to a
+random depth, the Hi-Lo true count is taken from every card seen so far (the
+player's cards and the upcard included), and the gain of the deviation over the
+basic strategy play is accumulated per integer true-count bucket. The index is
+the bucket boundary that maximises the total gain of deviating on one side of it.
+
+Work is split into chunks of shoes with their own seeds and farmed out to a
+process pool; finished chunks are merged into a checkpoint file so that long
+runs can be stopped and resumed. The resulting JSON table is loaded with
+EnhancedCountingDecisionEngine.load_deviations or CardCounter.load_strategy_deviations.
+
+Usage:
+    python src/simulation/deviation_indices.py --shoes 20000
+    python src/simulation/deviation_indices.py --shoes 200000 --decks 2 --h17 --resume
+"""
+import os
+import sys
+import json
+import math
+import random
+from dataclasses import asdict
+
+if not __package__:
+    sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..')))
+
+from config.settings import DEVIATION_INDEX_DIR
+from src.ai_brain.rules import Rules
+from src.ai_brain.basic_strategy import BasicStrategy
+
+# Card values as dealt by the simulation shoes (Ace = 11)
+SHOE_CARDS = [2, 3, 4, 5, 6, 7, 8, 9, 10, 10, 10, 10, 11] * 4
+HI_LO = {2: 1, 3: 1, 4: 1, 5: 1, 6: 1, 7: 0, 8: 0, 9: 0, 10: -1, 11: -1}
+MIN_BUCKET, MAX_BUCKET = -10, 10
+
+# Format: (player cards, dealer upcard, (action a, action b)); whichever of the two
+# basic strategy picks is the baseline, the other one is the deviation.
+DEFAULT_SITUATIONS = [
+    ((10, 6), 10, ("hit", "stand")),
+    ((10, 6), 10, ("hit", "surrender")),
+    ((10, 5), 10, ("hit", "stand")),
+    ((10, 5), 10, ("hit", "surrender")),
+    ((10, 6), 9, ("hit", "stand")),
+    ((10, 5), 9, ("hit", "stand")),
+    ((10, 3), 2, ("stand", "hit")),
+    ((10, 3), 3, ("stand", "hit")),
+    ((10, 2), 2, ("hit", "stand")),
+    ((10, 2), 3, ("hit", "stand")),
+    ((10, 2), 4, ("stand", "hit")),
+    ((10, 2), 5, ("stand", "hit")),
+    ((10, 2), 6, ("stand", "hit")),
+    ((11, 7), 9, ("hit", "stand")),
+    ((11, 7), 10, ("hit", "stand")),
+    ((11, 7), 11, ("hit", "stand")),
+    ((6, 5), 11, ("hit", "double")),
+    ((6, 4), 10, ("hit", "double")),
+    ((6, 4), 11, ("hit", "double")),
+    ((5, 4), 2, ("hit", "double")),
+    ((5, 4), 7, ("hit", "double")),
+    ((10, 10), 5, ("stand", "split")),
+    ((10, 10), 6, ("stand", "split")),
+    ((), 11, ("decline", "take")),  # insurance
+]
+
+_strategies = {}
+
+
+def hand_total(cards):
+    """Best total and whether it is soft, for cards with Ace = 11"""
+    total = sum(cards)
+    aces = cards.count(11)
+    while total > 21 and aces:
+        total -= 10
+        aces -= 1
+    return total, aces > 0
+
+def basic_strategy_for(rules):
+    """Built-in tables for rules=None, otherwise the generated tables for the rule set"""
+    key = None if rules is None else rules.key()
+    strategy = _strategies.get(key)
+    if strategy is None:
+        strategy = _strategies[key] = BasicStrategy(rules)
+    return strategy
+
+def resolve_situations(situations, rules=None):
+    """Attach the basic strategy action and the deviation to each situation"""
+    strategy = basic_strategy_for(rules)
+    resolved = []
+    for hand, upcard, actions in situations:
+        hand = list(hand)
+        if hand:
+            basic = strategy.get_action(hand, upcard, can_double=True, can_split=hand[0] == hand[1])
+        else:
+            basic = "decline"
+        if basic not in actions:
+            raise ValueError(f"basic strategy plays {basic} for {hand} vs {upcard}, not one of {actions}")
+        deviation = actions[1] if basic == actions[0] else actions[0]
+        resolved.append({"hand": hand, "upcard": upcard, "basic": basic, "deviation": deviation})
+    return resolved
+
+
+def _dealer_total(upcard, hole, draw, hits_soft_17):
+    cards = [upcard, hole]
+    while True:
+        total, soft = hand_total(cards)
+        if total > 17 or (total == 17 and not (soft and hits_soft_17)):
+            return total
+        cards.append(draw())
+
+def _play_out(cards, upcard, draw, strategy):
+    """Hit/stand by basic strategy once the decision has been made"""
+    while hand_total(cards)[0] < 21 and strategy.get_action(cards, upcard, can_double=False,
+                                                            can_split=False) == "hit":
+        cards.append(draw())
+    return hand_total(cards)[0]
+
+def _settle(player_total, dealer_total):
+    if dealer_total > 21 or player_total > dealer_total:
+        return 1.0
+    return 0.0 if player_total == dealer_total else -1.0
+
+def action_result(action, hand, upcard, hole, cards, rules, strategy):
+    """Net units won by playing `action` first; `cards` are the undealt cards in order"""
+    if action == "surrender":
+        return -0.5
+    if action == "take":
+        return 1.0 if hole == 10 else -0.5
+    if action == "decline":
+        return 0.0
+
+    draw = iter(cards).__next__
+    hands = []  # (final total, bet)
+    if action == "stand":
+        hands.append((hand_total(hand)[0], 1.0))
+    elif action == "hit":
+        hands.append((_play_out(hand + [draw()], upcard, draw, strategy), 1.0))
+    elif action == "double":
+        hands.append((hand_total(hand + [draw()])[0], 2.0))
+    elif action == "split":
+        # No resplits; split aces receive one card each
+        for card in hand:
+            split_hand = [card, draw()]
+            if card == 11:
+                hands.append((hand_total(split_hand)[0], 1.0))
+            elif rules.double_after_split and strategy.get_action(split_hand, upcard, can_double=True,
+                                                                  can_split=False) == "double":
+                hands.append((hand_total(split_hand + [draw()])[0], 2.0))
+            else:
+                hands.append((_play_out(split_hand, upcard, draw, strategy), 1.0))
+    else:
+        raise ValueError(f"Unknown action: {action}")
+
+    if all(total > 21 for total, _ in hands):
+        return -sum(bet for _, bet in hands)
+    dealer_total = _dealer_total(upcard, hole, draw, rules.dealer_hits_soft_17)
+    return sum(-bet if total > 21 else bet * _settle(total, dealer_total) for total, bet in hands)
+
+
+def _take(cards, card, rng):
+    """
+    Remove a uniformly chosen copy of `card`
+
+    Taking the first copy would strip that value from the top of the shoe and bias
+    the very cards the hand is about to draw; a random copy keeps the remaining
+    order uniformly shuffled.
+    """
+    if card not in cards:
+        return False
+    size = len(cards)
+    while True:
+        position = int(rng.random() * size)
+        if cards[position] == card:
+            del cards[position]
+            return True
+
+def simulate_chunk(chunk_id, config):
+    """
+    Play `shoes_per_chunk` shoes and return per-situation bucket sums
+
+    Returns:
+        (chunk_id, stats): stats[i][bucket] = [samples, sum of gains, sum of squared gains]
+    """
+    rules = Rules(**config["rules"]) if config["rules"] else None
+    strategy = basic_strategy_for(rules)
+    rules = rules or Rules()
+    situations = config["situations"]
+    rng = random.Random(config["seed"] * 1000003 + chunk_id)
+    shoe = SHOE_CARDS * rules.num_decks
+    cut = int(len(shoe) * config["penetration"])
+    step = config["sample_every"]
+    stats = [{} for _ in situations]
+
+    first_shoe = chunk_id * config["shoes_per_chunk"]
+    for _ in range(min(config["shoes_per_chunk"], config["shoes"] - first_shoe)):
+        rng.shuffle(shoe)
+        running_count = 0
+        counted = 0
+        for depth in range(rng.randrange(step), cut, step):
+            while counted < depth:
+                running_count += HI_LO[shoe[counted]]
+                counted += 1
+            for situation, buckets in zip(situations, stats):
+                hand, upcard = situation["hand"], situation["upcard"]
+                remaining = shoe[depth:]
+                if not all(_take(remaining, card, rng) for card in hand + [upcard]):
+                    continue  # those cards are already gone from this shoe
+                hole = remaining[0]
+                if hand and hand_total([upcard, hole])[0] == 21:
+                    continue  # dealer blackjack: both plays lose the same amount
+                count = running_count + HI_LO[upcard] + sum(HI_LO[card] for card in hand)
+                decks_remaining = (len(shoe) - depth - len(hand) - 1) / 52
+                bucket = max(MIN_BUCKET, min(MAX_BUCKET, math.floor(count / decks_remaining)))
+                gain = (action_result(situation["deviation"], hand, upcard, hole, remaining[1:], rules, strategy)
+                        - action_result(situation["basic"], hand, upcard, hole, remaining[1:], rules, strategy))
+                totals = buckets.get(bucket)
+                if totals is None:
+                    totals = buckets[bucket] = [0, 0.0, 0.0]
+                totals[0] += 1
+                totals[1] += gain
+                totals[2] += gain * gain
+    return chunk_id, stats
+
+
+def derive_index(buckets, min_samples=500):
+    """
+    Index and direction from per-bucket [samples, sum, sum of squares]
+
+    "above" means deviate at true counts of index and higher, "below" at index and
+    lower. Returns (None, None) when no threshold beats always playing basic strategy.
+    """
+    usable = sorted(bucket for bucket, totals in buckets.items() if totals[0] >= min_samples)
+    best_gain, index, direction = 0.0, None, None
+    running = 0.0
+    for bucket in reversed(usable):
+        running += buckets[bucket][1]
+        if running > best_gain:
+            best_gain, index, direction = running, bucket, "above"
+    running = 0.0
+    for bucket in usable:
+        running += buckets[bucket][1]
+        if running > best_gain:
+            best_gain, index, direction = running, bucket, "below"
+    return index, direction
+
+def build_index_table(config, stats, min_samples=500):
+    """The loadable table: one entry per situation with its index and bucket summary"""
+    entries = []
+    for situation, buckets in zip(config["situations"], stats):
+        hand, upcard = situation["hand"], situation["upcard"]
+        index, direction = derive_index(buckets, min_samples)
+        total, soft = hand_total(hand)
+        summary = {}
+        for bucket, (samples, total_gain, total_square) in sorted(buckets.items()):
+            mean = total_gain / samples
+            variance = max(0.0, total_square / samples - mean * mean)
+            summary[str(bucket)] = {"samples": samples, "mean_gain": mean,
+                                    "std_error": math.sqrt(variance / samples)}
+        entries.append({
+            "hand": hand,
+            "player_total": total if hand else "insurance",
+            "is_soft": soft,
+            "dealer_upcard": 1 if upcard == 11 else upcard,  # engine convention: Ace = 1
+            "basic_action": situation["basic"],
+            "deviation_action": situation["deviation"],
+            "index": index,
+            "direction": direction,
+            "samples": sum(totals[0] for totals in buckets.values()),
+            "buckets": summary,
+        })
+    return {
+        "count_system": "hi-lo",
+        "rules": config["rules"],
+        "shoes": config["shoes"],
+        "seed": config["seed"],
+        "penetration": config["penetration"],
+        "indices": entries,
+    }
+
+
+def _merge(stats, chunk_stats):
+    for buckets, chunk_buckets in zip(stats, chunk_stats):
+        for bucket, (samples, total_gain, total_square) in chunk_buckets.items():
+            totals = buckets.setdefault(bucket, [0, 0.0, 0.0])
+            totals[0] += samples
+            totals[1] += total_gain
+            totals[2] += total_square
+
+def _load_checkpoint(path, config):
+    if not path or not os.path.exists(path):
+        return set(), [{} for _ in config["situations"]]
+    with open(path) as f:
+        checkpoint = json.load(f)
+    if checkpoint["config"] != config:
+        raise ValueError(f"Checkpoint {path} was written for a different configuration")
+    stats = [{int(bucket): totals for bucket, totals in buckets.items()} for buckets in checkpoint["stats"]]
+    return set(checkpoint["completed_chunks"]), stats
+
+def _save_checkpoint(path, config, completed, stats):
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    temp_path = path + ".tmp"
+    with open(temp_path, "w") as f:
+        json.dump({"config": config, "completed_chunks": sorted(completed), "stats": stats}, f)
+    os.replace(temp_path, path)  # atomic: an interrupted write leaves the previous checkpoint intact
+
+def generate_deviation_indices(rules=None, situations=DEFAULT_SITUATIONS, shoes=20000, shoes_per_chunk=250,
+                               penetration=0.75, sample_every=5, seed=1, workers=None,
+                               checkpoint_path=None, min_samples=500, progress=None):
+    """
+    Simulate every situation and derive its index
+
+    Args:
+        rules (Rules): Game rules; None plays the default rules against the built-in
+            BasicStrategy tables (the ones the API engines use)
+        shoes: Total shoes to deal, split into chunks of shoes_per_chunk
+        workers: Worker processes (default: all cores); 1 runs in-process
+        checkpoint_path: Completed chunks are saved here and skipped on the next run
+        progress: Optional callable(completed_chunks, total_chunks)
+
+    Returns:
+        dict: the index table (see build_index_table)
+    """
+    config = {
+        "rules": asdict(rules) if rules is not None else None,
+        "situations": resolve_situations(situations, rules),
+        "shoes": shoes,
+        "shoes_per_chunk": shoes_per_chunk,
+        "penetration": penetration,
+        "sample_every": sample_every,
+        "seed": seed,
+    }
+    num_chunks = math.ceil(shoes / shoes_per_chunk)
+    completed, stats = _load_checkpoint(checkpoint_path, config)
+    pending = [chunk_id for chunk_id in range(num_chunks) if chunk_id not in completed]
+
+    def record(chunk_id, chunk_stats):
+        _merge(stats, chunk_stats)
+        completed.add(chunk_id)
+        if checkpoint_path:
+            _save_checkpoint(checkpoint_path, config, completed, stats)
+        if progress:
+            progress(len(completed), num_chunks)
+
+    if workers == 1:
+        for chunk_id in pending:
+            record(*simulate_chunk(chunk_id, config))
+    elif pending:
+        from concurrent.futures import ProcessPoolExecutor, as_completed
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            futures = [pool.submit(simulate_chunk, chunk_id, config) for chunk_id in pending]
+            for future in as_completed(futures):
+                record(*future.result())
+    return build_index_table(config, stats, min_samples)
+
+def index_table_path(rules=None, directory=None):
+    name = "hilo_indices_builtin.json" if rules is None else f"hilo_indices_{rules.key()}.json"
+    return os.path.join(directory or DEVIATION_INDEX_DIR, name)
+
+def save_index_table(table, path):
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    with open(path, "w") as f:
+        json.dump(table, f, indent=1)
+    return path
+
+
+def _format_index(entry):
+    if entry["index"] is None:
+        return "never"
+    return f"{entry['index']:+d} and {'up' if entry['direction'] == 'above' else 'down'}"
+
+if __name__ == "__main__":
+    import argparse
+    import time
+    parser = argparse.ArgumentParser(description="Derive Hi-Lo deviation indices by simulation")
+    parser.add_argument("--shoes", type=int, default=20000)
+    parser.add_argument("--chunk", type=int, default=250, help="Shoes per work unit / checkpoint step")
+    parser.add_argument("--workers", type=int, default=None, help="Worker processes (default: all cores)")
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--penetration", type=float, default=0.75)
+    parser.add_argument("--min-samples", type=int, default=500, help="Ignore true-count buckets with fewer samples")
+    parser.add_argument("--rules", action="store_true",
+                        help="Use generated basic strategy for the rule flags below instead of the built-in tables")
+    parser.add_argument("--decks", type=int, default=6)
+    parser.add_argument("--h17", action="store_true", help="Dealer hits soft 17")
+    parser.add_argument("--no-das", action="store_true", help="No double after split")
+    parser.add_argument("--resume", action="store_true", help="Continue from the checkpoint of an earlier run")
+    parser.add_argument("--output", default=None, help="Where to save the table")
+    args = parser.parse_args()
+
+    rules = None
+    if args.rules or args.decks != 6 or args.h17 or args.no_das:
+        rules = Rules(num_decks=args.decks, dealer_hits_soft_17=args.h17, double_after_split=not args.no_das)
+    output = args.output or index_table_path(rules)
+    checkpoint = output + ".checkpoint"
+    if not args.resume and os.path.exists(checkpoint):
+        os.remove(checkpoint)
+
+    start = time.perf_counter()
+    table = generate_deviation_indices(
+        rules, shoes=args.shoes, shoes_per_chunk=args.chunk, penetration=args.penetration, seed=args.seed,
+        workers=args.workers, checkpoint_path=checkpoint, min_samples=args.min_samples,
+        progress=lambda done, total: print(f"\r{done}/{total} chunks", end="", flush=True))
+    print(f"\nSimulated {args.shoes} shoes in {time.perf_counter() - start:.1f}s\n")
+    print(f"{'Hand':<10} {'Up':>3} {'Basic':<9} {'Deviation':<10} {'Index':<12} {'Samples':>9}")
+    for entry in table["indices"]:
+        hand = ",".join("A" if card == 11 else str(card) for card in entry["hand"]) or "insurance"
+        upcard = "A" if entry["dealer_upcard"] == 1 else str(entry["dealer_upcard"])
+        print(f"{hand:<10} {upcard:>3} {entry['basic_action']:<9} {entry['deviation_action']:<10} "
+              f"{_format_index(entry):<12} {entry['samples']:>9}")
+    print(f"\nSaved to {save_index_table(table, output)}")
+    if os.path.exists(checkpoint):  # No checkpoint is written when no chunk ran (e.g. --shoes 0)
+        os.remove(checkpoint)
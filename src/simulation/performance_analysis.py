@@ -1,8 +1,13 @@
 # Advanced Performance Analysis and Future Enhancements
-import matplotlib.pyplot as plt
-import numpy as np
+import os
+import sys
 from dataclasses import dataclass
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Optional
+
+if not __package__:
+    sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..')))
+
+from src.utils.precision import z_value
 
 @dataclass
 class AIPerformanceMetrics:
@@ -16,6 +21,27 @@ class AIPerformanceMetrics:
     win_rate: float
     risk_reductions: int
     hands_played: int
+    roi_standard_error: Optional[float] = None  # In ROI percentage points; None when unknown
+
+    @classmethod
+    def from_bot_stats(cls, stats: Dict[str, Any]) -> "AIPerformanceMetrics":
+        """Metrics for one bot from ai_vs_ai_training's get_comprehensive_stats()"""
+        # Bankroll ROI is the summed per-hand change over the starting bankroll
+        hands = stats["hands_played"]
+        roi_standard_error = None
+        if hands > 1:
+            roi_standard_error = hands * stats["ev_standard_error"] / stats["initial_bankroll"] * 100
+        return cls(name=stats["name"], final_bankroll=stats["current_bankroll"], roi=stats["roi_percentage"],
+                   sharpe_ratio=stats["sharpe_ratio"], max_drawdown=stats["max_drawdown"],
+                   volatility=stats["volatility"], win_rate=stats["win_rate"],
+                   risk_reductions=stats["risk_reductions"], hands_played=hands,
+                   roi_standard_error=roi_standard_error)
+
+    def roi_interval(self, level: float = 0.95) -> Optional[tuple]:
+        if self.roi_standard_error is None:
+            return None
+        margin = z_value(level) * self.roi_standard_error
+        return (self.roi - margin, self.roi + margin)
     
     def efficiency_score(self) -> float:
         """Calculate overall efficiency score"""
@@ -53,6 +79,7 @@ class PerformanceAnalyzer:
             "most_efficient": max(self.results, key=lambda x: x.efficiency_score()),
             "risk_vs_return": self._analyze_risk_return_tradeoff(),
             "betting_efficiency": self._analyze_betting_patterns(),
+            "significance": self._analyze_significance(),
             "recommendations": self._generate_recommendations()
         }
         
@@ -106,6 +133,31 @@ class PerformanceAnalyzer:
         
         return patterns
     
+    def _analyze_significance(self, level: float = 0.95) -> List[Dict[str, Any]]:
+        """
+        Whether the best ROI is distinguishable from each other result
+
+        The ROI difference is compared with its standard error, treating the
+        results as independent (bots sharing a shoe are positively correlated,
+        so this errs towards "not significant"); without error bars a
+        comparison is reported as unknown.
+        """
+        best = max(self.results, key=lambda x: x.roi)
+        z = z_value(level)
+        comparisons = []
+        for result in self.results:
+            if result is best:
+                continue
+            difference = best.roi - result.roi
+            if best.roi_standard_error is None or result.roi_standard_error is None:
+                verdict = "unknown"
+            else:
+                standard_error = (best.roi_standard_error ** 2 + result.roi_standard_error ** 2) ** 0.5
+                verdict = "significant" if difference > z * standard_error else "not significant"
+            comparisons.append({"leader": best.name, "name": result.name, "difference": difference,
+                                "verdict": verdict})
+        return comparisons
+
     def _calculate_correlation(self) -> float:
         """Calculate correlation between risk and return"""
         if len(self.results) < 2:
@@ -182,6 +234,21 @@ class PerformanceAnalyzer:
             print(f"   {name}: {pattern_info['pattern']}")
             print(f"   └─ Result: {pattern_info['effectiveness']}")
         
+        # Statistical confidence of the ROI ranking
+        print(f"\n🔬 STATISTICAL CONFIDENCE (95%):")
+        for result in self.results:
+            interval = result.roi_interval()
+            if interval is None:
+                print(f"   {result.name}: ROI {result.roi:.1f}% after {result.hands_played} hands, no error bar")
+            else:
+                print(f"   {result.name}: ROI {result.roi:.1f}% (CI {interval[0]:.1f}% to {interval[1]:.1f}%)"
+                      f" after {result.hands_played} hands")
+        for comparison in analysis['significance']:
+            print(f"   {comparison['leader']} vs {comparison['name']}: +{comparison['difference']:.1f} points, "
+                  f"{comparison['verdict']}")
+        if any(c['verdict'] != "significant" for c in analysis['significance']):
+            print("   ⚠️  Rankings that are not significant may be noise: run to a precision target instead")
+
         # Recommendations
         print(f"\n🎯 STRATEGIC RECOMMENDATIONS:")
         for i, rec in enumerate(analysis['recommendations'], 1):
@@ -219,9 +286,24 @@ class PerformanceAnalyzer:
             return "C"
 
 
+def analyze_simulation(final_stats):
+    """Report on a run_optimized_simulation / run_parallel_simulation result, with error bars"""
+    analyzer = PerformanceAnalyzer()
+    for stats in final_stats:
+        analyzer.add_result(AIPerformanceMetrics.from_bot_stats(stats))
+    analyzer.print_comprehensive_report()
+    return analyzer
+
+
 # Analysis of your results
 def analyze_your_results():
-    """Analyze the specific results from your simulation"""
+    """
+    Analyze the specific results from your simulation
+
+    These are fixed numbers from one 5000-hand session without standard
+    errors, so the report cannot tell whether their ranking is real; use
+    analyze_simulation on a precision-targeted run for conclusions.
+    """
     analyzer = PerformanceAnalyzer()
     
     # Add your AI results
@@ -281,4 +363,19 @@ def analyze_your_results():
 
 
 if __name__ == "__main__":
-    analyze_your_results()
\ No newline at end of file
+    import argparse
+    parser = argparse.ArgumentParser(description="Performance analysis of the AI bots")
+    parser.add_argument("--target-roi-se", type=float,
+                        help="Run the bots until each one's return per $ bet has this standard error, then analyze")
+    parser.add_argument("--max-rounds", type=int, default=1000000, help="Round limit for --target-roi-se")
+    parser.add_argument("--seed", type=int, default=1)
+    args = parser.parse_args()
+
+    if args.target_roi_se:
+        from src.simulation.ai_vs_ai_training import run_optimized_simulation
+        from src.utils.precision import PrecisionTarget
+        final_stats = run_optimized_simulation(rounds=args.max_rounds, log_interval=args.max_rounds + 1,
+                                               seed=args.seed, target=PrecisionTarget(roi_se=args.target_roi_se))
+        analyze_simulation(final_stats)
+    else:
+        analyze_your_results()
\ No newline at end of file
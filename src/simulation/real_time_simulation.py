@@ -1,23 +1,31 @@
 # src/simulation/realtime_simulation.py
 import sys
 import os
-sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..')))
+if not __package__:
+    # Run as a script: make the repo root importable for the src.* imports below
+    sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..')))
 
-import random
-from src.simulation.shoe import Shoe
+import argparse
+from src.simulation.shoe import ArrayShoe
 from src.ai_brain.basic_strategy import BasicStrategy
 from src.ai_brain.card_counter import CardCounter, CountingDecisionEngine
+from src.utils.events import NULL_SINK, EVENT_SINK_MODES, make_event_sink
+from src.utils.checkpoint import SnapshotWriter, load_snapshot
 
 class BlackjackSimulator:
-    def __init__(self, num_decks=6, starting_bankroll=1000):
+    def __init__(self, num_decks=6, starting_bankroll=1000, events=None, seed=None):
+        self.events = events or NULL_SINK
+        # Cards are drawn independently (infinite deck); the seed makes a run repeatable
+        self.shoe = ArrayShoe(infinite=True, seed=seed)
         self.basic_strategy = BasicStrategy()
         self.card_counter = CardCounter(num_decks=num_decks)
         self.engine = CountingDecisionEngine(self.basic_strategy, self.card_counter)
         self.bankroll = starting_bankroll
         self.stats = {"wins": 0, "losses": 0, "pushes": 0}
+        self.rounds_played = 0
 
     def deal_card(self):
-        return random.choice([2, 3, 4, 5, 6, 7, 8, 9, 10, 10, 10, 10, 11])  # includes J, Q, K as 10
+        return self.shoe.deal_card()  # J, Q, K count as 10
 
     def play_round(self):
         # Reset count if penetration is high
@@ -69,30 +77,66 @@ class BlackjackSimulator:
             self.bankroll -= bet
             result = "LOSS"
 
-        print(f"===== NEW ROUND =====")
-        print(f"Player hand: {player_hand}")
-        print(f"Dealer shows: {dealer_upcard}")
-        print(f"AI Decision: {action.upper()} | Reason: {decision['reasoning']} | Bet: ${bet}")
-        print(f"Dealer final hand: {dealer_hand} => total: {dealer_total}")
-        print(f"Count Status: {decision['count_status']['deck_status']} | {decision['count_status']['advantage_text']}")
-        print(f"Outcome: {result}")
-        print(f"Bankroll: ${self.bankroll:.2f}")
-        print()
+        if self.events.enabled:
+            self.events.emit("round", player_hand=player_hand, dealer_upcard=dealer_upcard, action=action,
+                             reason=decision['reasoning'], bet=bet, dealer_hand=dealer_hand,
+                             dealer_total=dealer_total, deck_status=decision['count_status']['deck_status'],
+                             advantage_text=decision['count_status']['advantage_text'],
+                             result=result, bankroll=float(self.bankroll))
 
-    def simulate(self, rounds=100):
-        for _ in range(rounds):
-            self.play_round()
+    def simulate(self, rounds=100, checkpoint_path=None, checkpoint_every=1000):
+        """
+        Play until `rounds` rounds have been played in total
+
+        With checkpoint_path the simulator is snapshotted every checkpoint_every
+        rounds without blocking play; BlackjackSimulator.resume picks it up.
+        """
+        writer = SnapshotWriter(checkpoint_path) if checkpoint_path else None
+        try:
+            while self.rounds_played < rounds:
+                self.play_round()
+                self.rounds_played += 1
+                if writer is not None and self.rounds_played % checkpoint_every == 0:
+                    writer.submit({"simulator": self})
+        finally:
+            if writer is not None:
+                writer.close()
 
         print("=" * 40)
         print("📊 SIMULATION RESULTS")
-        print(f"Rounds Played: {rounds}")
+        print(f"Rounds Played: {self.rounds_played}")
         print(f"Wins: {self.stats['wins']}")
         print(f"Losses: {self.stats['losses']}")
         print(f"Pushes: {self.stats['pushes']}")
         print(f"Final Bankroll: ${self.bankroll:.2f}")
         print("=" * 40)
 
+    @classmethod
+    def resume(cls, checkpoint_path, events=None):
+        """Simulator saved by simulate(checkpoint_path=...), with `events` as its sink"""
+        return load_snapshot(checkpoint_path, events)["simulator"]
+
 
 if __name__ == "__main__":
-    sim = BlackjackSimulator()
-    sim.simulate(rounds=100)
+    parser = argparse.ArgumentParser(description="Play rounds with the counting decision engine")
+    parser.add_argument("--rounds", type=int, default=100)
+    parser.add_argument("--seed", type=int, help="Card seed for a reproducible run")
+    parser.add_argument("--events", choices=EVENT_SINK_MODES, default="console",
+                        help="Per-round event output (console prints every round)")
+    parser.add_argument("--event-log", help="Output path for --events binary")
+    parser.add_argument("--sample-every", type=int, default=100, help="Event interval for --events sampled")
+    parser.add_argument("--checkpoint", help="Snapshot file for crash recovery")
+    parser.add_argument("--checkpoint-every", type=int, default=1000, help="Rounds between snapshots")
+    parser.add_argument("--resume", action="store_true", help="Continue from the --checkpoint snapshot")
+    args = parser.parse_args()
+
+    events = make_event_sink(args.events, path=args.event_log, sample_every=args.sample_every)
+    try:
+        if args.resume and args.checkpoint and os.path.exists(args.checkpoint):
+            sim = BlackjackSimulator.resume(args.checkpoint, events)
+        else:
+            sim = BlackjackSimulator(events=events, seed=args.seed)
+        sim.simulate(rounds=args.rounds, checkpoint_path=args.checkpoint, checkpoint_every=args.checkpoint_every)
+    finally:
+        events.close()
+
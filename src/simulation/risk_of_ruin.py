@@ -0,0 +1,226 @@
+# src/simulation/risk_of_ruin.py
+"""
+Risk of ruin for the bankroll managers' risk profiles
+
+The game comes from the vectorized engine: sample_hands plays many tables
+flat-betting one unit with a counting strategy and keeps each hand's true
+count (at bet time) and result per unit bet. Bet sizing comes from the
+managers themselves: AdvancedBankrollManager.calculate_kelly_bet_size
+("kelly") or OptimizedBankrollManager.calculate_true_count_kelly_bet
+("true_count_kelly"), evaluated for every path at once by bet_sizes. A hand's
+result is its bet times a sampled unit result, so doubles, splits, naturals
+and insurance keep their real frequencies and their link to the count.
+
+For each profile the report gives:
+
+    ror_monte_carlo  share of bankroll paths ruined within the trip (ruin is
+                     dropping below ruin_threshold, as in is_broke())
+    ror_trip         diffusion approximation of the same probability
+    ror_lifetime     diffusion approximation with no end to the trip
+    n0               hands for the expected win to equal one standard
+                     deviation (infinite when the EV is not positive)
+    trip_loss        percentiles of the loss over the trip
+
+The analytic figures treat the bets at the starting bankroll as flat bets.
+The managers shrink their bets as the bankroll falls, so the Monte Carlo
+figure is the one to trust when they disagree.
+
+Usage:
+    python src/simulation/risk_of_ruin.py --bankroll 1000 --trip-hands 2000
+    python src/simulation/risk_of_ruin.py --bankroll 100000 --unit 2 --paths 20000
+"""
+import math
+import os
+import sys
+from statistics import NormalDist
+
+if not __package__:
+    sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..')))
+
+from src.ai_brain.optimized_bankroll_manager import OptimizedBankrollManager
+from src.simulation.vectorized_engine import VectorizedBlackjackEngine, build_policy, compile_policy
+
+# Method name -> (bet in base units for a true count, largest bet as a share of the bankroll)
+BET_SIZING = {
+    "kelly": ("kelly_multiplier", "MAX_BET_FRACTION"),
+    "true_count_kelly": ("true_count_kelly_multiplier", "TRUE_COUNT_MAX_BET_FRACTION"),
+}
+TRIP_LOSS_PERCENTILES = (50, 75, 90, 95, 99)
+
+
+def sample_hands(hands=500000, policy="counting", rules=None, num_tables=5000, seed=1):
+    """
+    (true count, result per unit bet) for about `hands` rounds of the vectorized engine
+
+    Every table bets one unit a round, so the results are per unit and can be
+    scaled by any bet sizing afterwards.
+    """
+    import numpy as np
+    flat = compile_policy(build_policy(policy, rules), rules, bet_ramp={})
+    engine = VectorizedBlackjackEngine(rules, flat, num_tables=num_tables, seed=seed)
+    rounds = -(-hands // num_tables)
+    true_counts = np.empty((rounds, num_tables), dtype=np.float32)
+    results = np.empty((rounds, num_tables))
+    for round_index in range(rounds):
+        true_counts[round_index] = engine.true_counts()
+        results[round_index] = engine.play_round()
+    return {"true_count": true_counts.ravel(), "result": results.ravel()}
+
+
+def bet_multipliers(manager, true_counts, method="kelly", **options):
+    """The manager's bet in base units for every true count (evaluated once per distinct count)"""
+    import numpy as np
+    multiplier = getattr(manager, BET_SIZING[method][0])
+    distinct, index = np.unique(true_counts, return_inverse=True)
+    values = np.array([multiplier(float(true_count), **options) for true_count in distinct])
+    return values[index]
+
+def bet_sizes(manager, bankroll, multipliers, method="kelly"):
+    """
+    The manager's bets for arrays of bankrolls and bet multipliers
+
+    The same steps as calculate_kelly_bet_size / calculate_true_count_kelly_bet:
+    base unit times multiplier, table limits, the bankroll cap, whole cents.
+    """
+    import numpy as np
+    max_fraction = getattr(manager, BET_SIZING[method][1])
+    bet = (bankroll * manager.base_unit_percentage) / 100 * multipliers
+    bet = np.maximum(manager.min_bet, np.minimum(bet, manager.max_bet))
+    bet = np.minimum(bet, bankroll * max_fraction)
+    return np.round(bet, 2)
+
+
+def diffusion_ror(mean, std, bankroll, hands=None):
+    """
+    Ruin probability of a Brownian bankroll with per-hand drift `mean` and
+    deviation `std` starting `bankroll` above ruin: within `hands` hands, or
+    ever when hands is None
+    """
+    if bankroll <= 0:
+        return 1.0
+    if std <= 0:
+        return 0.0 if mean >= 0 else (1.0 if hands is None or mean * hands <= -bankroll else 0.0)
+    if hands is None:
+        return 1.0 if mean <= 0 else math.exp(-2 * mean * bankroll / std ** 2)
+    normal = NormalDist()
+    spread = std * hands ** 0.5
+    first = normal.cdf((-bankroll - mean * hands) / spread)
+    exponent = -2 * mean * bankroll / std ** 2
+    if exponent > 700:  # Losing game with a deep bankroll: the reflection term's weight overflows but its cdf is 0
+        return min(1.0, first)
+    return min(1.0, first + math.exp(exponent) * normal.cdf((-bankroll + mean * hands) / spread))
+
+
+def simulate_ruin(manager, sample, method="kelly", hands=1000, paths=10000, ruin_threshold=10, seed=0,
+                  multipliers=None, **options):
+    """
+    Play `paths` bankrolls for `hands` hands at once
+
+    Each hand of each path is drawn from `sample` (sample_hands output) and
+    bet with the manager's sizing at that path's bankroll. Paths stop once
+    ruined. Returns the final bankrolls, the hand each path was ruined on
+    (0 = never) and its lowest bankroll.
+    """
+    import numpy as np
+    rng = np.random.default_rng(seed)
+    if multipliers is None:
+        multipliers = bet_multipliers(manager, sample["true_count"], method, **options)
+    results = sample["result"]
+    bankroll = np.full(paths, float(manager.initial_bankroll))
+    lowest = bankroll.copy()
+    ruined_on = np.zeros(paths, dtype=np.int64)
+    alive = np.arange(paths)
+    for hand in range(1, hands + 1):
+        picks = rng.integers(len(results), size=len(alive))
+        live = bankroll[alive]
+        live += bet_sizes(manager, live, multipliers[picks], method) * results[picks]
+        bankroll[alive] = live
+        lowest[alive] = np.minimum(lowest[alive], live)
+        ruined = live < ruin_threshold
+        if ruined.any():
+            ruined_on[alive[ruined]] = hand
+            alive = alive[~ruined]
+            if not len(alive):
+                break
+    return {"final_bankroll": bankroll, "ruined_on": ruined_on, "lowest_bankroll": lowest}
+
+
+def risk_of_ruin(manager, sample, method="kelly", hands=1000, paths=10000, ruin_threshold=10, seed=0, **options):
+    """Monte Carlo and analytic risk of ruin, N0 and trip-loss distribution for one manager's bet sizing"""
+    import numpy as np
+    multipliers = bet_multipliers(manager, sample["true_count"], method, **options)
+    initial = float(manager.initial_bankroll)
+    hand_results = bet_sizes(manager, np.full(len(multipliers), initial), multipliers, method) * sample["result"]
+    mean, std = float(hand_results.mean()), float(hand_results.std())
+    paths_run = simulate_ruin(manager, sample, method, hands, paths, ruin_threshold, seed, multipliers)
+    ruined = paths_run["ruined_on"] > 0
+    ror = float(ruined.mean())
+    loss = initial - paths_run["final_bankroll"]
+    return {
+        "risk_level": manager.risk_level,
+        "method": method,
+        "bankroll": initial,
+        "hands": hands,
+        "paths": paths,
+        "ev_per_hand": mean,
+        "std_per_hand": std,
+        "n0": std ** 2 / mean ** 2 if mean > 0 else float("inf"),
+        "ror_monte_carlo": ror,
+        "ror_standard_error": (ror * (1 - ror) / paths) ** 0.5,
+        "ror_trip": diffusion_ror(mean, std, initial - ruin_threshold, hands),
+        "ror_lifetime": diffusion_ror(mean, std, initial - ruin_threshold),
+        "median_hands_to_ruin": float(np.median(paths_run["ruined_on"][ruined])) if ruined.any() else None,
+        "probability_of_loss": float((loss > 0).mean()),
+        "mean_trip_result": float(-loss.mean()),
+        "trip_loss": {percentile: float(np.percentile(loss, percentile)) for percentile in TRIP_LOSS_PERCENTILES},
+    }
+
+
+def profile_report(bankroll=1000, unit_percentage=1.0, hands=1000, paths=10000, methods=tuple(BET_SIZING),
+                   sample=None, ruin_threshold=10, seed=0, **options):
+    """risk_of_ruin for every risk profile of the bankroll managers and every bet sizing method"""
+    if sample is None:
+        sample = sample_hands()
+    profiles = OptimizedBankrollManager().risk_profiles
+    report = []
+    for risk_level in profiles:
+        manager = OptimizedBankrollManager(initial_bankroll=bankroll, base_unit_percentage=unit_percentage,
+                                           risk_level=risk_level)
+        for method in methods:
+            report.append(risk_of_ruin(manager, sample, method, hands, paths, ruin_threshold, seed, **options))
+    return report
+
+
+def print_report(report):
+    print(f"{'Profile':<20} {'Sizing':<17} {'EV/hand':>8} {'SD/hand':>8} {'N0':>9} {'ROR trip':>9} "
+          f"{'ROR sim':>14} {'ROR ever':>9} {'Loss p50':>9} {'p95':>8} {'p99':>8}")
+    for row in report:
+        n0 = f"{row['n0']:,.0f}" if math.isfinite(row["n0"]) else "inf"
+        simulated = f"{row['ror_monte_carlo'] * 100:.2f}+-{row['ror_standard_error'] * 100:.2f}%"
+        print(f"{row['risk_level']:<20} {row['method']:<17} {row['ev_per_hand']:>+8.3f} {row['std_per_hand']:>8.2f} "
+              f"{n0:>9} {row['ror_trip'] * 100:>8.2f}% {simulated:>14} {row['ror_lifetime'] * 100:>8.2f}% "
+              f"{row['trip_loss'][50]:>9.2f} {row['trip_loss'][95]:>8.2f} {row['trip_loss'][99]:>8.2f}")
+
+
+if __name__ == "__main__":
+    import argparse
+    import time
+    parser = argparse.ArgumentParser(description="Risk of ruin for the bankroll manager risk profiles")
+    parser.add_argument("--bankroll", type=float, default=1000)
+    parser.add_argument("--unit", type=float, default=1.0, help="base_unit_percentage of the managers")
+    parser.add_argument("--trip-hands", type=int, default=1000)
+    parser.add_argument("--paths", type=int, default=10000)
+    parser.add_argument("--ruin-threshold", type=float, default=10, help="Ruined below this bankroll")
+    parser.add_argument("--sample-hands", type=int, default=500000, help="Engine hands to draw results from")
+    parser.add_argument("--policy", choices=("basic", "counting", "enhanced"), default="counting")
+    parser.add_argument("--seed", type=int, default=1)
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    sample = sample_hands(args.sample_hands, args.policy, seed=args.seed)
+    sampled = time.perf_counter()
+    report = profile_report(args.bankroll, args.unit, args.trip_hands, args.paths, sample=sample,
+                            ruin_threshold=args.ruin_threshold, seed=args.seed)
+    print_report(report)
+    print(f"\n{len(sample['result']):,} engine hands in {sampled - start:.1f}s, "
+          f"{len(report)} x {args.paths:,} paths x {args.trip_hands:,} hands in {time.perf_counter() - sampled:.1f}s")
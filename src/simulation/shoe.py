@@ -1,13 +1,11 @@
-import sys
-import os
-sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..')))
-
 import random
+from src.utils.events import NULL_SINK
 
 class Shoe:
-    def __init__(self, num_decks=6, penetration_threshold=0.75):
+    def __init__(self, num_decks=6, penetration_threshold=0.75, events=None):
         self.num_decks = num_decks
         self.penetration_threshold = penetration_threshold
+        self.events = events or NULL_SINK
         self._generate_shoe()
     
     def _generate_shoe(self):
@@ -21,7 +19,8 @@ class Shoe:
 
     def deal_card(self):
         if self.penetration() >= self.penetration_threshold:
-            print("\n🔁 Reshuffling shoe due to penetration threshold.\n")
+            if self.events.enabled:
+                self.events.emit("reshuffle", cards_dealt=self.cards_dealt)
             self._generate_shoe()
         
         card = self.cards.pop()
@@ -63,3 +62,192 @@ class BlackjackShoe:
     def shuffle(self):
         self.cards = self._create_shoe()
         random.shuffle(self.cards)
+
+
+# One deck of card values (face cards are 10, Ace = 11)
+DECK_VALUES = [2, 3, 4, 5, 6, 7, 8, 9, 10, 10, 10, 10, 11] * 4
+
+
+class ArrayShoe:
+    """
+    Preshuffled integer-array shoe with a read cursor
+
+    A drop-in for Shoe (deal_card, fractional penetration) and, via
+    ArrayBlackjackShoe, for BlackjackShoe. Each instance owns a seeded numpy
+    generator, so the same seed deals the same cards. Dealing moves a cursor
+    instead of popping, deal(n) hands out a batch as an array, and the cut card
+    sits at an explicit position (default: penetration_threshold of the shoe).
+
+    With infinite=True cards are drawn independently from a single deck's
+    distribution, served from a buffer pregenerated in bulk; the shoe never
+    reshuffles and penetration stays 0.
+
+    Passing `shoes` (a 2-D block from generate_shoe_block or load_shoe_block)
+    replays those shoes in order instead of shuffling, so strategy variants can
+    be run against exactly the same cards.
+    """
+
+    def __init__(self, num_decks=6, penetration_threshold=0.75, seed=None, cut_card=None,
+                 infinite=False, buffer_size=4096, events=None, shoes=None):
+        import numpy as np
+        if shoes is not None:
+            if infinite:
+                raise ValueError("An infinite-deck shoe cannot replay a shoe block")
+            num_decks = shoes.shape[1] // 52
+        self.num_decks = num_decks
+        self._shoes = shoes
+        self.shoe_index = -1
+        self.penetration_threshold = penetration_threshold
+        self.infinite = infinite
+        self.buffer_size = buffer_size
+        self.events = events or NULL_SINK
+        self.rng = np.random.default_rng(seed)
+        self._base = np.array(DECK_VALUES * (1 if infinite else num_decks), dtype=np.int8)
+        self.total_cards = len(self._base)
+        if cut_card is None:
+            cut_card = int(self.total_cards * penetration_threshold)
+        if not 0 < cut_card <= self.total_cards:
+            raise ValueError(f"Cut card must be within the {self.total_cards}-card shoe")
+        self.cut_card = cut_card
+        self.shuffle()
+
+    def shuffle(self):
+        """Start a fresh shoe (or a fresh infinite-deck buffer)"""
+        if self._shoes is not None:
+            import numpy as np
+            self.shoe_index += 1
+            if self.shoe_index == len(self._shoes):
+                raise ValueError(f"Shoe block exhausted after {len(self._shoes)} shoes")
+            self.cards = np.array(self._shoes[self.shoe_index], dtype=np.int8)
+        elif self.infinite:
+            self.cards = self.rng.choice(self._base, size=self.buffer_size)
+        else:
+            self.cards = self.rng.permutation(self._base)
+        # Plain-int mirror so single deals avoid numpy scalar overhead
+        self._card_list = self.cards.tolist()
+        self.cursor = 0
+        self.cards_dealt = 0
+
+    def _reshuffle(self):
+        if self.events.enabled:
+            self.events.emit("reshuffle", cards_dealt=self.cards_dealt)
+        self.shuffle()
+
+    def _refill(self):
+        dealt = self.cards_dealt
+        self.shuffle()
+        self.cards_dealt = dealt
+
+    def deal_card(self):
+        """Deal one card, reshuffling first once the cut card has come out"""
+        if self.infinite:
+            if self.cursor == self.buffer_size:
+                self._refill()
+        elif self.cursor >= self.cut_card or self.cursor == self.total_cards:
+            self._reshuffle()
+        card = self._card_list[self.cursor]
+        self.cursor += 1
+        self.cards_dealt += 1
+        return card
+
+    def deal(self, n):
+        """
+        Deal n cards as an int8 array
+
+        Reshuffles first when the cut card has been reached or fewer than n
+        cards are left; a batch may run past the cut card, which then takes
+        effect on the next deal.
+        """
+        import numpy as np
+        if self.infinite:
+            if n > self.buffer_size - self.cursor:
+                taken = self.cards[self.cursor:]
+                more = self.rng.choice(self._base, size=n - len(taken))
+                self._refill()
+                self.cards_dealt += n
+                return np.concatenate([taken, more])
+        else:
+            if n > self.total_cards:
+                raise ValueError(f"Cannot deal {n} cards from a {self.total_cards}-card shoe")
+            if self.cursor >= self.cut_card or self.cursor + n > self.total_cards:
+                self._reshuffle()
+        batch = self.cards[self.cursor:self.cursor + n].copy()
+        self.cursor += n
+        self.cards_dealt += n
+        return batch
+
+    def needs_shuffle(self):
+        """True once the cut card has come out"""
+        return not self.infinite and self.cursor >= self.cut_card
+
+    def penetration(self):
+        if self.infinite:
+            return 0.0
+        return self.cursor / self.total_cards
+
+    def cards_remaining(self):
+        if self.infinite:
+            return float("inf")
+        return self.total_cards - self.cursor
+
+    def cards_seen(self):
+        return self.cursor if not self.infinite else self.cards_dealt
+
+
+class ArrayBlackjackShoe(ArrayShoe):
+    """
+    ArrayShoe with the BlackjackShoe interface
+
+    draw_card() deals through the whole shoe and reshuffles only when it runs
+    out, penetration() is a percentage, and shuffle() is left to the caller, as
+    with BlackjackShoe. Pass cut_card to have draw_card reshuffle earlier.
+    """
+
+    def __init__(self, num_decks=6, seed=None, cut_card=None, infinite=False, buffer_size=4096, events=None,
+                 shoes=None):
+        super().__init__(num_decks=num_decks, penetration_threshold=1.0, seed=seed, cut_card=cut_card,
+                         infinite=infinite, buffer_size=buffer_size, events=events, shoes=shoes)
+
+    def draw_card(self):
+        return self.deal_card()
+
+    def penetration(self):
+        return super().penetration() * 100
+
+
+def generate_shoe_block(n_shoes, num_decks=6, seed=None, stream=0):
+    """
+    N independently shuffled shoes as one (n_shoes, 52 * num_decks) int8 array
+
+    All rows are permuted in a single vectorized call. Each (seed, stream) pair
+    is its own SeedSequence child, so blocks generated for different streams
+    (e.g. one per worker) are statistically independent and every block can be
+    regenerated on its own.
+    """
+    import numpy as np
+    rng = np.random.default_rng(np.random.SeedSequence(seed, spawn_key=(stream,)))
+    base = np.array(DECK_VALUES * num_decks, dtype=np.int8)
+    return rng.permuted(np.broadcast_to(base, (n_shoes, len(base))), axis=1)
+
+def write_shoe_block(path, n_shoes, num_decks=6, seed=None, rows_per_stream=10000):
+    """
+    Generate shoes straight into a .npy file, one stream of rows at a time
+
+    Memory use is bounded by rows_per_stream regardless of n_shoes. The file
+    can be replayed with load_shoe_block.
+    """
+    import numpy as np
+    block = np.lib.format.open_memmap(path, mode="w+", dtype=np.int8, shape=(n_shoes, 52 * num_decks))
+    for stream, start in enumerate(range(0, n_shoes, rows_per_stream)):
+        rows = min(rows_per_stream, n_shoes - start)
+        block[start:start + rows] = generate_shoe_block(rows, num_decks, seed, stream)
+    block.flush()
+    return path
+
+def load_shoe_block(path):
+    """Memory-map a shoe block written by write_shoe_block (read-only)"""
+    import numpy as np
+    block = np.load(path, mmap_mode="r")
+    if block.ndim != 2 or block.shape[1] % 52:
+        raise ValueError(f"{path} is not a shoe block")
+    return block
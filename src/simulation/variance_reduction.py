@@ -0,0 +1,293 @@
+# src/simulation/variance_reduction.py
+"""
+Variance reduction for the bot comparison
+
+Blackjack's variance hides the differences between the bots, so plain Monte
+Carlo needs very long runs to rank them. Each mode below gets the same error
+bar from fewer rounds and reports that saving as an effective speedup: the
+number of plain Monte Carlo rounds one of its rounds is worth (the ratio of
+the plain and reduced variances, estimated from the same run).
+
+    plain       the ordinary simulation; EV per hand for each bot
+    crn         common random numbers: every bot plays the same cards each
+                round (OptimizedSimulation(common_cards=True)); estimates each
+                bot's EV per hand minus the reference bot's, compared with the
+                same difference from independent runs
+    antithetic  shoes come in pairs, the second one the Hi-Lo mirror of the
+                first (antithetic_shoe_block), so a high count in one is a low
+                count in the other; EV per hand from shoe pairs, compared with
+                the same shoes taken as independent
+    control     control variates from the count: the Hi-Lo tags of each
+                hand's cards minus what the true count of the cards left
+                predicts for them. That difference has mean zero exactly, so
+                regressing it out of the result removes the luck of the deal
+                without biasing the EV
+
+Variances treat rounds (shoes for antithetic) as independent, as the
+bankroll-driven bet sizes only make them approximately so.
+
+Usage:
+    python src/simulation/variance_reduction.py --rounds 20000 --mode all
+"""
+import os
+import sys
+
+if not __package__:
+    sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..')))
+
+from src.ai_brain.counting_systems import get_counting_system
+from src.simulation.ai_vs_ai_training import OptimizedSimulation
+from src.simulation.shoe import generate_shoe_block
+from src.utils.precision import z_value
+
+MODES = ("plain", "crn", "antithetic", "control")
+HI_LO = get_counting_system("hi-lo")
+TAGS = {card: HI_LO.tag(card) for card in range(2, 12)}
+CARDS_PER_HAND = 3  # Two player cards and the dealer's hole card; the upcard is shared
+
+
+def antithetic_shoe_block(block):
+    """
+    Interleave each shoe with its Hi-Lo mirror: rows A0, A0', A1, A1', ...
+
+    The mirror keeps 7-9 where they are, puts A's high cards (tens and aces)
+    in order on A's low-card (2-6) positions and A's low cards on its high
+    positions. A full shoe has as many low as high cards, so the mirror is a
+    full shoe again, uniformly shuffled when A is, and its running count is
+    the negative of A's at every card.
+    """
+    import numpy as np
+    block = np.asarray(block)
+    low = (block >= 2) & (block <= 6)
+    high = block >= 10
+    if (low.sum(axis=1) != high.sum(axis=1)).any():
+        raise ValueError("Antithetic shoes need complete shoes with as many low as high cards")
+    mirror = block.copy()
+    mirror[low] = block[high]  # Row-major order keeps every row's cards in that row
+    mirror[high] = block[low]
+    pairs = np.empty((2 * len(block),) + block.shape[1:], dtype=block.dtype)
+    pairs[0::2] = block
+    pairs[1::2] = mirror
+    return pairs
+
+def _shoes_needed(rounds, bots=4, num_decks=6, penetration=75):
+    # A shoe is replaced once more than `penetration` percent is dealt; a round deals at most every bot's cards
+    cards_per_shoe = num_decks * 52 * penetration // 100 + 1
+    return rounds * (1 + CARDS_PER_HAND * bots) // cards_per_shoe + 2
+
+
+def play_rounds(rounds, mode="plain", seed=1, progress=None):
+    """
+    Play the bot comparison and keep what each mode's estimates need
+
+    Returns a dict of per-round arrays (bots along the second axis):
+    names, results (bankroll change, 0 where a bot sat out), played,
+    shoes (shoe number of every round) and, in control mode, controls
+    (rounds, bots, 2): player-card and hole-card tag surprises, scaled by the
+    bot's bankroll before the hand so they follow its bet size.
+    """
+    import numpy as np
+    if mode not in MODES:
+        raise ValueError(f"Unknown variance reduction mode: {mode}")
+    shoes = None
+    if mode == "antithetic":
+        shoes = antithetic_shoe_block(generate_shoe_block(_shoes_needed(rounds) // 2 + 1, seed=seed))
+    simulation = OptimizedSimulation(seed=seed, shoes=shoes, common_cards=mode == "crn")
+    bots = simulation.all_ais
+    results = np.zeros((rounds, len(bots)))
+    played = np.zeros((rounds, len(bots)), dtype=bool)
+    shoe_ids = np.zeros(rounds, dtype=np.int64)
+    controls = np.zeros((rounds, len(bots), 2)) if mode == "control" else None
+    shoe = simulation.shoe
+    shoe_number = 0
+    dealt_tags = 0  # Hi-Lo running count of the cards dealt from the current shoe
+
+    for index in range(rounds):
+        for bot in bots:
+            bot.last_hand = None
+        dealt_before = shoe.cards_dealt
+        simulation.play_round(rounds)
+        hands = [bot.last_hand for bot in bots]
+        if shoe.cards_dealt < dealt_before:  # The round started on a fresh shoe
+            shoe_number += 1
+            dealt_tags = 0
+            dealt_before = 0
+        shoe_ids[index] = shoe.shoe_index if shoes is not None else shoe_number
+
+        # The upcard is dealt first, then each bot's three cards in seat order
+        remaining = shoe.cards_remaining() + shoe.cards_dealt - dealt_before - 1
+        dealt_tags += TAGS[simulation.dealer_upcard]
+        for seat, hand in enumerate(hands):
+            if hand is None:
+                continue
+            player_cards, hole_card, _, change, bankroll_before = hand
+            results[index, seat] = change
+            played[index, seat] = True
+            player_tags = TAGS[player_cards[0]] + TAGS[player_cards[1]]
+            if controls is not None:
+                # The cards left have mean tag -dealt_tags / remaining (the true count per card)
+                expected = -dealt_tags / remaining
+                controls[index, seat, 0] = bankroll_before * (player_tags - 2 * expected)
+                controls[index, seat, 1] = bankroll_before * (TAGS[hole_card] - expected)
+            dealt_tags += player_tags + TAGS[hole_card]
+            remaining -= CARDS_PER_HAND
+        if progress is not None:
+            progress(index + 1, rounds)
+
+    return {"names": [bot.name for bot in bots], "results": results, "played": played, "shoes": shoe_ids,
+            "controls": controls, "mode": mode}
+
+
+def _mean_and_variance(values):
+    if len(values) < 2:
+        return (float(values.mean()) if len(values) else 0.0), float("inf")
+    return float(values.mean()), float(values.var(ddof=1))
+
+def _plain(results, played):
+    rows = []
+    for seat in range(results.shape[1]):
+        values = results[played[:, seat], seat]
+        mean, variance = _mean_and_variance(values)
+        standard_error = (variance / max(len(values), 1)) ** 0.5
+        rows.append({"estimate": mean, "standard_error": standard_error, "plain_standard_error": standard_error,
+                     "speedup": 1.0, "samples": len(values)})
+    return rows
+
+def _crn(results, played, reference):
+    rows = []
+    for seat in range(results.shape[1]):
+        if seat == reference:
+            rows.append(None)
+            continue
+        both = played[:, seat] & played[:, reference]
+        own, ref = results[both, seat], results[both, reference]
+        n = max(len(own), 1)
+        mean, paired_variance = _mean_and_variance(own - ref)
+        independent_variance = _mean_and_variance(own)[1] + _mean_and_variance(ref)[1]
+        rows.append({"estimate": mean, "standard_error": (paired_variance / n) ** 0.5,
+                     "plain_standard_error": (independent_variance / n) ** 0.5,
+                     "speedup": independent_variance / paired_variance if paired_variance else float("inf"),
+                     "samples": len(own)})
+    return rows
+
+def _ratio_variance(net, hands):
+    """Variance per unit of the ratio estimator sum(net) / sum(hands), scaled back to per-hand units"""
+    ratio = net.sum() / hands.sum()
+    return ratio, _mean_and_variance(net - ratio * hands)[1] / hands.mean() ** 2
+
+def _antithetic(results, played, shoe_ids):
+    import numpy as np
+    rows = []
+    pair_ids = shoe_ids // 2
+    # Only shoe pairs that were played through on both sides
+    complete = np.isin(pair_ids, pair_ids[np.nonzero(shoe_ids % 2)[0]]) & (pair_ids < pair_ids.max())
+    for seat in range(results.shape[1]):
+        mask = complete & played[:, seat]
+        shoe_net = np.bincount(shoe_ids[mask], weights=results[mask, seat])
+        shoe_hands = np.bincount(shoe_ids[mask])
+        used = shoe_hands > 0
+        shoe_net, shoe_hands = shoe_net[used], shoe_hands[used].astype(float)
+        shoe_pairs = np.nonzero(used)[0] // 2
+        pair_net = np.bincount(shoe_pairs, weights=shoe_net)
+        pair_hands = np.bincount(shoe_pairs, weights=shoe_hands)
+        keep = pair_hands > 0
+        pair_net, pair_hands = pair_net[keep], pair_hands[keep]
+        if len(pair_net) < 2:
+            rows.append({"estimate": 0.0, "standard_error": float("inf"), "plain_standard_error": float("inf"),
+                         "speedup": float("nan"), "samples": int(shoe_hands.sum())})
+            continue
+        estimate, pair_variance = _ratio_variance(pair_net, pair_hands)
+        _, shoe_variance = _ratio_variance(shoe_net, shoe_hands)
+        standard_error = (pair_variance / len(pair_net)) ** 0.5
+        plain_standard_error = (shoe_variance / len(shoe_net)) ** 0.5
+        rows.append({"estimate": float(estimate), "standard_error": standard_error,
+                     "plain_standard_error": plain_standard_error,
+                     "speedup": (plain_standard_error / standard_error) ** 2, "samples": int(shoe_hands.sum())})
+    return rows
+
+def _control(results, played, controls):
+    import numpy as np
+    rows = []
+    for seat in range(results.shape[1]):
+        values = results[played[:, seat], seat]
+        covariates = controls[played[:, seat], seat]
+        n = len(values)
+        mean, variance = _mean_and_variance(values)
+        if n <= covariates.shape[1] + 1:
+            rows.append({"estimate": mean, "standard_error": float("inf"), "plain_standard_error": float("inf"),
+                         "speedup": 1.0, "samples": n})
+            continue
+        centered = covariates - covariates.mean(axis=0)
+        beta = np.linalg.lstsq(centered, values - mean, rcond=None)[0]
+        # The controls' true mean is zero, so subtracting them leaves the EV unbiased
+        adjusted = values - covariates @ beta
+        adjusted_mean, adjusted_variance = _mean_and_variance(adjusted)
+        rows.append({"estimate": adjusted_mean, "standard_error": (adjusted_variance / n) ** 0.5,
+                     "plain_standard_error": (variance / n) ** 0.5,
+                     "speedup": variance / adjusted_variance if adjusted_variance else float("inf"),
+                     "samples": n, "beta": beta.tolist()})
+    return rows
+
+def estimate(run, reference=0, level=0.95):
+    """
+    Per-bot estimates from play_rounds output, with their standard errors,
+    the plain Monte Carlo standard error for the same rounds and the speedup
+
+    For crn the estimate is the EV difference from bot `reference` (whose row
+    is None).
+    """
+    mode, results, played = run["mode"], run["results"], run["played"]
+    if mode == "plain":
+        rows = _plain(results, played)
+    elif mode == "crn":
+        rows = _crn(results, played, reference)
+    elif mode == "antithetic":
+        rows = _antithetic(results, played, run["shoes"])
+    else:
+        rows = _control(results, played, run["controls"])
+    margin = z_value(level)
+    for name, row in zip(run["names"], rows):
+        if row is not None:
+            row["name"] = name
+            row["interval"] = (row["estimate"] - margin * row["standard_error"],
+                               row["estimate"] + margin * row["standard_error"])
+    return rows
+
+def compare(rounds=20000, mode="plain", seed=1, reference=0, level=0.95, progress=None):
+    """play_rounds + estimate"""
+    return estimate(play_rounds(rounds, mode, seed, progress), reference, level)
+
+
+def print_estimates(mode, rows, names):
+    title = {"plain": "Plain Monte Carlo: EV per hand",
+             "crn": f"Common random numbers: EV per hand minus {names[0]}",
+             "antithetic": "Antithetic Hi-Lo mirrored shoes: EV per hand",
+             "control": "True-count control variates: EV per hand"}[mode]
+    print(f"\n{title}")
+    print(f"  {'Bot':<24} {'Estimate':>10} {'Std err':>9} {'Plain SE':>9} {'Speedup':>8}")
+    for row in rows:
+        if row is None:
+            continue
+        if mode == "crn" and row['standard_error'] == 0 and row['estimate'] == 0:
+            # Same cards, same play and same bets every round: there is no difference to estimate
+            print(f"  {row['name']:<24} indistinguishable from {names[0]} under CRN")
+            continue
+        print(f"  {row['name']:<24} {row['estimate']:>+10.4f} {row['standard_error']:>9.4f} "
+              f"{row['plain_standard_error']:>9.4f} {row['speedup']:>7.2f}x")
+
+
+if __name__ == "__main__":
+    import argparse
+    import time
+    parser = argparse.ArgumentParser(description="Bot comparison with variance reduction")
+    parser.add_argument("--rounds", type=int, default=20000)
+    parser.add_argument("--mode", choices=MODES + ("all",), default="all")
+    parser.add_argument("--seed", type=int, default=1)
+    args = parser.parse_args()
+
+    for mode in (MODES if args.mode == "all" else (args.mode,)):
+        start = time.perf_counter()
+        run = play_rounds(args.rounds, mode, args.seed)
+        rows = estimate(run)
+        print_estimates(mode, rows, run["names"])
+        print(f"  {args.rounds} rounds in {time.perf_counter() - start:.1f}s")
@@ -0,0 +1,603 @@
+# src/simulation/vectorized_engine.py
+"""
+Full-rules blackjack simulation over many tables in lockstep
+
+Every table has its own shoe (one row of a 2-D card array) and one player
+seat. A round is played on all tables at once: each step of the game (deal,
+insurance, one player action per table, dealer draw, settlement) is a handful
+of numpy operations over the tables still involved, so the per-hand cost is a
+few array element updates rather than Python calls.
+
+Rules covered: dealer peek for blackjack, insurance, late surrender, doubling on
+any two cards (after splits when the rules allow it), splits and resplits up to
+`max_hands` hands, split aces receiving one card each (no resplitting aces),
+H17/S17 and the blackjack payout from Rules.
+
+The player's strategy is flattened into a VectorPolicy: an action table
+indexed by (true-count bucket, hand state, upcard, allowed-action flags) using
+the state and flag layout of CompiledStrategy, plus per-bucket insurance and
+bet sizes. compile_policy builds one from a BasicStrategy or from a counting
+decision engine (CountingDecisionEngine / EnhancedCountingDecisionEngine) by
+asking it for every decision at each integer true count.
+
+Usage:
+    python src/simulation/vectorized_engine.py --rounds 1000 --tables 10000
+    python src/simulation/vectorized_engine.py --policy enhanced --h17 --payout 1.2
+    python src/simulation/vectorized_engine.py --rounds 100 --records runs/basic_hands
+    python src/simulation/vectorized_engine.py --rounds 100000 --target-se 0.001
+"""
+import os
+import sys
+import copy
+import inspect
+
+if not __package__:
+    sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..')))
+
+from src.ai_brain.rules import Rules
+from src.ai_brain.basic_strategy import BasicStrategy, CompiledStrategy
+from src.ai_brain.counting_systems import get_counting_system
+from src.simulation.shoe import DECK_VALUES
+from src.utils.precision import ResultStats, confidence_interval
+
+HIT, STAND, DOUBLE, SPLIT, SURRENDER = (CompiledStrategy.HIT, CompiledStrategy.STAND, CompiledStrategy.DOUBLE,
+                                        CompiledStrategy.SPLIT, CompiledStrategy.SURRENDER)
+# Flag bit each action needs (CompiledStrategy flags: double | split << 1 | surrender << 2)
+REQUIRED_FLAG = {DOUBLE: 1, SPLIT: 2, SURRENDER: 4}
+MAX_TRUE_COUNT = 10
+
+# Hand status
+ACTIVE, DONE, SURRENDERED = 0, 1, 2
+
+
+def max_round_cards(shoe, max_hands):
+    """
+    Most cards a single round can deal from a full shoe
+
+    A hand (each of max_hands player hands, and the dealer's) only takes
+    another card while its hard total is 20 or less, so all of its cards but
+    the last add up to at most 20. The round can therefore use no more than
+    the smallest cards of the shoe whose values (aces as 1) add up to 20 per
+    hand, plus one last card per hand.
+    """
+    import numpy as np
+    values = np.sort(np.where(np.asarray(shoe) == 11, 1, shoe))
+    hands = max_hands + 1
+    fitting = int(np.searchsorted(np.cumsum(values), 20 * hands, side="right"))
+    return min(fitting + hands, len(values))
+
+
+class VectorPolicy:
+    """
+    A strategy as lookup arrays
+
+    actions[bucket, state, upcard, flags] holds CompiledStrategy action codes,
+    insurance[bucket] whether to insure and units[bucket] the bet in units (0
+    sits the round out). bucket is floor(true count) clipped to +-max_tc and
+    shifted by max_tc; a count-blind policy has max_tc = 0 and one bucket.
+    """
+
+    def __init__(self, actions, insurance, units, max_tc=0, system=None):
+        self.actions = actions
+        self.insurance = insurance
+        self.units = units
+        self.max_tc = max_tc
+        self.system = get_counting_system(system) if system is not None else None
+
+
+def _ramp_units(ramp, true_count):
+    """Units for a true count from a {threshold: units} betting ramp, as CardCounter.get_betting_units reads it"""
+    units = 1
+    for threshold, ramp_units in sorted(ramp.items()):
+        if true_count >= threshold:
+            units = ramp_units
+        else:
+            break
+    return units
+
+def _decision_states():
+    """State ids a player can actually be asked about: hard 4-20, soft 12-20 and pairs"""
+    soft, pair = CompiledStrategy.SOFT_OFFSET, CompiledStrategy.PAIR_OFFSET
+    return list(range(4, 21)) + list(range(soft + 12, soft + 21)) + list(range(pair + 2, pair + 12))
+
+def compile_policy(policy=None, rules=None, max_tc=MAX_TRUE_COUNT, bet_ramp=None, system="hi-lo"):
+    """
+    Flatten a strategy into a VectorPolicy
+
+    policy may be a BasicStrategy (or anything with get_action), a counting
+    decision engine (anything with make_decision and card_counter) or an
+    existing VectorPolicy. Counting engines are queried once per integer true
+    count from -max_tc to max_tc with their counter pinned to that count; any
+    answer the flags don't allow falls back to the engine's basic strategy.
+    Their counter's betting_ramp and the engine's should_take_insurance are
+    used unless bet_ramp is given. A basic strategy only becomes count-aware
+    when bet_ramp is given (bets follow `system`, play stays the same).
+    """
+    import numpy as np
+    if isinstance(policy, VectorPolicy):
+        return policy
+    if policy is None:
+        policy = BasicStrategy(rules) if rules is not None else BasicStrategy()
+    shape = (CompiledStrategy.NUM_STATES, CompiledStrategy.NUM_UPCARDS, CompiledStrategy.NUM_FLAGS)
+
+    if not (hasattr(policy, "make_decision") and hasattr(policy, "card_counter")):
+        compiled = policy.compiled if hasattr(policy, "compiled") else CompiledStrategy(policy)
+        table = np.frombuffer(compiled.table, dtype=np.uint8).reshape(shape)
+        if bet_ramp is None:
+            return VectorPolicy(table[None].copy(), np.zeros(1, dtype=bool), np.ones(1))
+        buckets = 2 * max_tc + 1
+        units = np.array([_ramp_units(bet_ramp, tc) for tc in range(-max_tc, max_tc + 1)], dtype=float)
+        return VectorPolicy(np.repeat(table[None], buckets, axis=0), np.zeros(buckets, dtype=bool), units,
+                            max_tc, system)
+
+    basic = np.frombuffer(policy.basic_strategy.compiled.table, dtype=np.uint8).reshape(shape)
+    counter = policy.card_counter
+    ace = getattr(policy, "DEALER_ACE", 11)
+    takes_surrender = "can_surrender" in inspect.signature(policy.make_decision).parameters
+    ramp = bet_ramp if bet_ramp is not None else getattr(counter, "betting_ramp", None)
+    codes = {name: code for code, name in enumerate(CompiledStrategy.ACTIONS)}
+    pair_states = range(CompiledStrategy.PAIR_OFFSET, CompiledStrategy.NUM_STATES)
+    hands = CompiledStrategy.state_hands()
+
+    true_counts = range(-max_tc, max_tc + 1)
+    actions = np.repeat(basic[None], len(true_counts), axis=0)
+    insurance = np.zeros(len(true_counts), dtype=bool)
+    units = np.ones(len(true_counts))
+    for bucket, true_count in enumerate(true_counts):
+        pinned = copy.copy(counter)
+        pinned.get_true_count = lambda true_count=true_count: float(true_count)
+        engine = copy.copy(policy)
+        engine.card_counter = pinned
+        if hasattr(engine, "should_take_insurance"):
+            insurance[bucket] = engine.should_take_insurance(true_count)
+        if ramp:
+            units[bucket] = _ramp_units(ramp, true_count)
+        for state in _decision_states():
+            hand = hands[state]
+            # Without a pair the split flag changes nothing, so only pairs need flags 2, 3, 6 and 7
+            flag_set = range(8) if state in pair_states else (0, 1, 4, 5)
+            for upcard in range(2, 12):
+                for flags in flag_set:
+                    options = {"can_double": bool(flags & 1), "can_split": bool(flags & 2)}
+                    if takes_surrender:
+                        options["can_surrender"] = bool(flags & 4)
+                    action = engine.make_decision(hand, ace if upcard == 11 else upcard, **options)["action"]
+                    code = codes.get(action)
+                    if code is None or flags & REQUIRED_FLAG.get(code, 0) != REQUIRED_FLAG.get(code, 0):
+                        code = basic[state, upcard, flags]
+                    actions[bucket, state, upcard, flags] = code
+                    if state not in pair_states:
+                        actions[bucket, state, upcard, flags | 2] = code
+    return VectorPolicy(actions, insurance, units, max_tc, counter.system)
+
+
+class VectorizedBlackjackEngine:
+    """
+    Plays `num_tables` independent tables a round at a time
+
+    Shoes are cut at `penetration` and replaced with fresh shuffles from the
+    engine's seeded generator, or taken in order from a pregenerated `shoes`
+    block (src.simulation.shoe.generate_shoe_block / load_shoe_block) so that
+    different policies can be run against identical cards. Results are in bet
+    units; call run() repeatedly to accumulate and summary() to read them.
+
+    With `records` (a src.utils.data_loader.HandStoreWriter) every hand played
+    is also appended to a columnar store: seat is the table, bet and result are
+    in units, and the first hand of a round carries the natural and insurance
+    results so a round's records sum to its result.
+    """
+
+    def __init__(self, rules=None, policy=None, num_tables=10000, penetration=0.75, seed=None, shoes=None,
+                 max_hands=4, bet_ramp=None, max_tc=MAX_TRUE_COUNT, records=None):
+        import numpy as np
+        self.rules = rules or Rules()
+        self.policy = compile_policy(policy, rules, max_tc=max_tc, bet_ramp=bet_ramp)
+        self.num_tables = num_tables
+        self.max_hands = max_hands
+        self.rng = np.random.default_rng(seed)
+        self.block = shoes
+        self.next_block_row = 0
+        self.records = records
+        self.round_number = 0
+
+        num_decks = shoes.shape[1] // 52 if shoes is not None else self.rules.num_decks
+        self.num_decks = num_decks
+        self._base = np.array(DECK_VALUES * num_decks, dtype=np.int8)
+        self.shoe_size = len(self._base)
+        # A round never reshuffles midway, so the cut card leaves room for the longest possible round;
+        # deep cuts of 1- and 2-deck shoes are moved up, and self.penetration is the one played
+        self.cut_card = max(1, min(int(self.shoe_size * penetration),
+                                   self.shoe_size - max_round_cards(self._base, max_hands)))
+        self.penetration = self.cut_card / self.shoe_size
+
+        system = self.policy.system
+        self.counting = system is not None
+        self.tags = np.zeros(12)
+        if self.counting:
+            for value in range(2, 12):
+                self.tags[value] = system.tag(value)
+            self.initial_count = system.initial_running_count(num_decks)
+            self.imbalance = system.deck_imbalance
+
+        self.shoes = np.empty((num_tables, self.shoe_size), dtype=np.int8)
+        self.cursor = np.zeros(num_tables, dtype=np.int64)
+        self.cards_seen = np.zeros(num_tables, dtype=np.int64)
+        self.running_count = np.zeros(num_tables)
+        self._new_shoes(np.arange(num_tables))
+
+        self.stats = {name: 0 for name in ("rounds", "hands", "wagered", "net", "net_squared", "blackjacks",
+                                           "doubles", "splits", "surrenders", "busts", "insurance_taken",
+                                           "insurance_net", "sat_out")}
+        self.round_stats = ResultStats()  # (result, amount bet) per round played, for error bars
+        buckets = len(self.policy.units)
+        self.bucket_stats = {"rounds": np.zeros(buckets), "net": np.zeros(buckets),
+                             "net_squared": np.zeros(buckets)}
+
+    def _new_shoes(self, tables):
+        import numpy as np
+        if self.block is not None:
+            end = self.next_block_row + len(tables)
+            if end > len(self.block):
+                raise ValueError(f"Shoe block exhausted after {len(self.block)} shoes")
+            self.shoes[tables] = self.block[self.next_block_row:end]
+            self.next_block_row = end
+        else:
+            self.shoes[tables] = self.rng.permuted(np.broadcast_to(self._base, (len(tables), self.shoe_size)),
+                                                   axis=1)
+        self.cursor[tables] = 0
+        self.cards_seen[tables] = 0
+        if self.counting:
+            self.running_count[tables] = self.initial_count
+
+    def _draw(self, tables, seen=True):
+        """Next card for each table (an index array); seen cards go into the running count"""
+        position = self.cursor[tables]
+        cards = self.shoes[tables, position].astype(int)  # The cut card leaves room for a whole round
+        self.cursor[tables] = position + 1
+        if seen and self.counting:
+            self.running_count[tables] += self.tags[cards]
+            self.cards_seen[tables] += 1
+        return cards
+
+    def _true_count(self, tables):
+        """True count per table, rounded to 0.1 as CardCounter.get_true_count does"""
+        import numpy as np
+        if not self.counting:
+            return np.zeros(len(tables))
+        decks_seen = self.cards_seen[tables] / 52
+        decks_remaining = np.maximum(0.5, self.num_decks - decks_seen)
+        drift = self.initial_count + self.imbalance * decks_seen
+        return np.round((self.running_count[tables] - drift) / decks_remaining, 1)
+
+    def true_counts(self):
+        """Every table's current true count, the one the next round's bets are sized on"""
+        import numpy as np
+        return self._true_count(np.arange(self.num_tables))
+
+    def _buckets(self, tables, true_count=None):
+        """True-count bucket per table"""
+        import numpy as np
+        max_tc = self.policy.max_tc
+        if not max_tc:
+            return np.zeros(len(tables), dtype=np.intp)
+        if true_count is None:
+            true_count = self._true_count(tables)
+        return (np.clip(np.floor(true_count), -max_tc, max_tc) + max_tc).astype(np.intp)
+
+    @staticmethod
+    def _add_card(total, soft, cards):
+        """Add cards to (total, soft aces) arrays, turning soft aces hard to stay under 22"""
+        import numpy as np
+        total = total + cards
+        soft = soft + (cards == 11)
+        for _ in range(2):
+            reduce = (total > 21) & (soft > 0)
+            total = np.where(reduce, total - 10, total)
+            soft = soft - reduce
+        return total, soft
+
+    def play_round(self):
+        """One round on every table; returns each table's result in units"""
+        import numpy as np
+        rules, policy, stats = self.rules, self.policy, self.stats
+        num_tables, max_hands = self.num_tables, self.max_hands
+        tables = np.arange(num_tables)
+
+        cut = np.nonzero(self.cursor >= self.cut_card)[0]
+        if len(cut):
+            self._new_shoes(cut)
+
+        recording = self.records is not None
+        bet_true_count = self._true_count(tables) if recording else None
+        bet_bucket = self._buckets(tables, bet_true_count)
+        units = policy.units[bet_bucket]
+
+        first_card = self._draw(tables)
+        upcard = self._draw(tables)
+        second_card = self._draw(tables)
+        hole = self._draw(tables, seen=False)
+
+        total = np.zeros((num_tables, max_hands), dtype=int)
+        soft = np.zeros((num_tables, max_hands), dtype=int)
+        ncards = np.zeros((num_tables, max_hands), dtype=int)
+        cards_1 = np.zeros((num_tables, max_hands), dtype=int)
+        cards_2 = np.zeros((num_tables, max_hands), dtype=int)
+        status = np.full((num_tables, max_hands), ACTIVE)
+        bet = np.ones((num_tables, max_hands))
+        nhands = np.ones(num_tables, dtype=int)
+        current = np.zeros(num_tables, dtype=int)
+        split_aces = np.zeros(num_tables, dtype=bool)
+
+        total[:, 0], soft[:, 0] = self._add_card(first_card, (first_card == 11).astype(int), second_card)
+        ncards[:, 0] = 2
+        cards_1[:, 0] = first_card
+        cards_2[:, 0] = second_card
+        dealer_total, dealer_soft = self._add_card(upcard, (upcard == 11).astype(int), hole)
+        if recording:
+            from src.utils.data_loader import MAX_CARDS, NO_ACTION
+            hand_cards = np.zeros((num_tables, max_hands, MAX_CARDS), dtype=np.int8)
+            hand_cards[:, 0, 0] = first_card
+            hand_cards[:, 0, 1] = second_card
+            first_action = np.full((num_tables, max_hands), NO_ACTION, dtype=np.uint8)
+
+        # Insurance is decided on the count after the player's cards and the upcard
+        insured = (upcard == 11) & policy.insurance[self._buckets(tables)]
+        player_natural = total[:, 0] == 21
+        dealer_natural = dealer_total == 21
+        insurance_result = np.where(insured, np.where(dealer_natural, 1.0, -0.5), 0.0)
+        natural_result = np.where(player_natural & ~dealer_natural, rules.blackjack_payout,
+                                  np.where(dealer_natural & ~player_natural, -1.0, 0.0))
+        settled = player_natural | dealer_natural
+        status[settled, 0] = DONE
+        playing = ~settled
+        surrender_allowed = rules.late_surrender
+
+        while True:
+            t = np.nonzero(playing)[0]
+            if not len(t):
+                break
+            h = current[t]
+
+            # A hand created by a split gets its second card first; split aces get nothing more
+            fresh = ncards[t, h] == 1
+            if fresh.any():
+                tf, hf = t[fresh], h[fresh]
+                card = self._draw(tf)
+                cards_2[tf, hf] = card
+                ncards[tf, hf] = 2
+                if recording:
+                    hand_cards[tf, hf, 1] = card
+                total[tf, hf], soft[tf, hf] = self._add_card(total[tf, hf], soft[tf, hf], card)
+                status[tf[split_aces[tf]], hf[split_aces[tf]]] = DONE
+
+            hand_total = total[t, h]
+            status[t[hand_total >= 21], h[hand_total >= 21]] = DONE
+
+            deciding = status[t, h] == ACTIVE
+            td, hd = t[deciding], h[deciding]
+            if len(td):
+                two_cards = ncards[td, hd] == 2
+                first, second = cards_1[td, hd], cards_2[td, hd]
+                pair = two_cards & (first == second)
+                hand_total, hand_soft = total[td, hd], soft[td, hd]
+                state = np.where(pair, CompiledStrategy.PAIR_OFFSET + first,
+                                 np.where(hand_soft > 0, CompiledStrategy.SOFT_OFFSET + hand_total,
+                                          np.minimum(hand_total, CompiledStrategy.MAX_TOTAL)))
+                after_split = nhands[td] > 1
+                can_double = two_cards & (~after_split | rules.double_after_split)
+                can_split = pair & (nhands[td] < max_hands)
+                can_surrender = two_cards & ~after_split & surrender_allowed
+                flags = can_double + 2 * can_split + 4 * can_surrender
+                action = policy.actions[self._buckets(td), state, upcard[td], flags]
+                if recording:
+                    undecided = first_action[td, hd] == NO_ACTION
+                    first_action[td[undecided], hd[undecided]] = action[undecided]
+
+                status[td[action == STAND], hd[action == STAND]] = DONE
+
+                surrender = action == SURRENDER
+                status[td[surrender], hd[surrender]] = SURRENDERED
+
+                draws = (action == HIT) | (action == DOUBLE)
+                if draws.any():
+                    tw, hw = td[draws], hd[draws]
+                    card = self._draw(tw)
+                    total[tw, hw], soft[tw, hw] = self._add_card(total[tw, hw], soft[tw, hw], card)
+                    if recording:
+                        slot = ncards[tw, hw]
+                        kept = slot < MAX_CARDS
+                        hand_cards[tw[kept], hw[kept], slot[kept]] = card[kept]
+                    ncards[tw, hw] += 1
+                    doubled = action[draws] == DOUBLE
+                    bet[tw[doubled], hw[doubled]] = 2.0
+                    status[tw[doubled], hw[doubled]] = DONE
+
+                split = action == SPLIT
+                if split.any():
+                    ts, hs = td[split], hd[split]
+                    new = nhands[ts]
+                    for hand, card in ((hs, first[split]), (new, second[split])):
+                        total[ts, hand] = card
+                        soft[ts, hand] = card == 11
+                        ncards[ts, hand] = 1
+                        cards_1[ts, hand] = card
+                        status[ts, hand] = ACTIVE
+                        if recording:
+                            hand_cards[ts, hand] = 0
+                            hand_cards[ts, hand, 0] = card
+                            first_action[ts, hand] = SPLIT
+                    bet[ts, new] = 1.0
+                    nhands[ts] += 1
+                    split_aces[ts] |= first[split] == 11
+                    stats["splits"] += len(ts)
+                stats["doubles"] += int((action == DOUBLE).sum())
+                stats["surrenders"] += int(surrender.sum())
+
+            finished = status[t, current[t]] != ACTIVE
+            current[t[finished]] += 1
+            playing[t[finished]] = current[t[finished]] < nhands[t[finished]]
+
+        # The hole card is shown on every table; the dealer draws only where a hand is still live
+        if self.counting:
+            self.running_count += self.tags[hole]
+            self.cards_seen += 1
+        in_play = np.arange(max_hands)[None, :] < nhands[:, None]
+        live = in_play & (status != SURRENDERED) & (total <= 21)
+        drawing = ~settled & live.any(axis=1)
+        while True:
+            d = np.nonzero(drawing & ((dealer_total < 17) | (rules.dealer_hits_soft_17 & (dealer_total == 17)
+                                                               & (dealer_soft > 0))))[0]
+            if not len(d):
+                break
+            dealer_total[d], dealer_soft[d] = self._add_card(dealer_total[d], dealer_soft[d], self._draw(d))
+
+        dealer_bust = (dealer_total > 21)[:, None]
+        dealer_final = dealer_total[:, None]
+        outcome = np.where(status == SURRENDERED, -0.5,
+                           np.where(total > 21, -1.0,
+                                    np.where(dealer_bust, 1.0, np.sign(total - dealer_final)))) * bet
+        hand_result = np.where(in_play & ~settled[:, None], outcome, 0.0).sum(axis=1)
+        result = (hand_result + natural_result + insurance_result) * units
+
+        playing_units = units > 0
+        stats["rounds"] += int(playing_units.sum())
+        stats["sat_out"] += num_tables - int(playing_units.sum())
+        stats["hands"] += int(nhands[playing_units].sum())
+        wagered = np.where(in_play, bet, 0.0).sum(axis=1) * units
+        stats["wagered"] += float(wagered.sum())
+        self.round_stats.add_array(result[playing_units], wagered[playing_units])
+        stats["net"] += float(result.sum())
+        stats["net_squared"] += float((result ** 2).sum())
+        stats["blackjacks"] += int((player_natural & playing_units).sum())
+        stats["busts"] += int((in_play & (total > 21) & playing_units[:, None]).sum())
+        stats["insurance_taken"] += int((insured & playing_units).sum())
+        stats["insurance_net"] += float((insurance_result * units).sum())
+        buckets = len(policy.units)
+        self.bucket_stats["rounds"] += np.bincount(bet_bucket, weights=playing_units.astype(float), minlength=buckets)
+        self.bucket_stats["net"] += np.bincount(bet_bucket, weights=result, minlength=buckets)
+        self.bucket_stats["net_squared"] += np.bincount(bet_bucket, weights=result ** 2, minlength=buckets)
+
+        if recording:
+            hand_results = np.where(in_play & ~settled[:, None], outcome, 0.0)
+            hand_results[:, 0] += natural_result + insurance_result
+            rows, hands = np.nonzero(in_play & playing_units[:, None])
+            self.records.append_batch(
+                round=self.round_number, seat=rows, cards=hand_cards[rows, hands],
+                dealer_upcard=upcard[rows], true_count=bet_true_count[rows], action=first_action[rows, hands],
+                bet=(bet * units[:, None])[rows, hands], result=(hand_results * units[:, None])[rows, hands])
+        self.round_number += 1
+        return result
+
+    def run(self, rounds, progress=None, target=None):
+        """
+        Play `rounds` lockstep rounds (rounds * num_tables hands dealt) and return summary()
+
+        With a target (src.utils.precision.PrecisionTarget on the per-round
+        results) `rounds` is only the limit: the run stops after the first
+        lockstep round at which the target's standard errors are reached.
+        """
+        for round_number in range(1, rounds + 1):
+            self.play_round()
+            if progress is not None:
+                progress(round_number, rounds)
+            if target is not None and target.reached_by(self.round_stats):
+                break
+        summary = self.summary(target.level if target is not None else 0.95)
+        if target is not None:
+            summary["target_reached"] = target.reached_by(self.round_stats)
+        return summary
+
+    def summary(self, level=0.95):
+        """
+        Totals so far; ev and std are per round played, in units of the base bet,
+        and roi is per unit bet. The intervals are at the given confidence level.
+        """
+        stats = dict(self.stats)
+        rounds = max(stats["rounds"], 1)
+        ev = stats["net"] / rounds
+        stats["ev_per_round"] = ev
+        stats["std_per_round"] = max(stats["net_squared"] / rounds - ev * ev, 0.0) ** 0.5
+        stats["standard_error"] = stats["std_per_round"] / rounds ** 0.5
+        stats["ev_interval"] = confidence_interval(ev, stats["standard_error"], level)
+        stats["roi"] = self.round_stats.roi
+        stats["roi_standard_error"] = self.round_stats.roi_standard_error
+        stats["roi_interval"] = confidence_interval(stats["roi"], stats["roi_standard_error"], level)
+        if self.policy.max_tc:
+            max_tc = self.policy.max_tc
+            stats["by_true_count"] = {
+                bucket - max_tc: {"rounds": int(n), "ev_per_round": float(net / n)}
+                for bucket, (n, net) in enumerate(zip(self.bucket_stats["rounds"], self.bucket_stats["net"]))
+                if n
+            }
+        return stats
+
+
+def build_policy(name, rules=None, system="hi-lo"):
+    """Strategy by CLI name: basic, counting (CountingDecisionEngine) or enhanced"""
+    strategy = BasicStrategy(rules) if rules is not None else BasicStrategy()
+    num_decks = rules.num_decks if rules is not None else 6
+    if name == "basic":
+        return strategy
+    if name == "counting":
+        from src.ai_brain.card_counter import CardCounter, CountingDecisionEngine
+        return CountingDecisionEngine(strategy, CardCounter(num_decks=num_decks, system=system))
+    if name == "enhanced":
+        from src.ai_brain.EnhancedCardCounter import EnhancedCardCounter
+        from src.ai_brain.enhanced_counting_decision_engine import EnhancedCountingDecisionEngine
+        return EnhancedCountingDecisionEngine(strategy, EnhancedCardCounter(num_decks=num_decks, system=system))
+    raise ValueError(f"Unknown policy: {name}")
+
+
+if __name__ == "__main__":
+    import argparse
+    import time
+    from src.utils.precision import PrecisionTarget
+    parser = argparse.ArgumentParser(description="Vectorized full-rules blackjack simulation")
+    parser.add_argument("--rounds", type=int, default=1000, help="Lockstep rounds (hands per table)")
+    parser.add_argument("--tables", type=int, default=10000)
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--policy", choices=("basic", "counting", "enhanced"), default="basic")
+    parser.add_argument("--system", default="hi-lo", help="Counting system for counting policies")
+    parser.add_argument("--penetration", type=float, default=0.75)
+    parser.add_argument("--decks", type=int, default=6)
+    parser.add_argument("--h17", action="store_true", help="Dealer hits soft 17")
+    parser.add_argument("--no-das", action="store_true", help="No double after split")
+    parser.add_argument("--no-surrender", action="store_true", help="No late surrender")
+    parser.add_argument("--payout", type=float, default=1.5, help="Blackjack payout (1.5 = 3:2, 1.2 = 6:5)")
+    parser.add_argument("--rules", action="store_true",
+                        help="Play generated basic strategy for these rules instead of the built-in tables")
+    parser.add_argument("--target-se", type=float,
+                        help="Stop once the EV standard error per round is this small (--rounds becomes the limit)")
+    parser.add_argument("--records", help="Store every hand in this hand store directory (see src/utils/data_loader.py)")
+    args = parser.parse_args()
+
+    rules = Rules(num_decks=args.decks, dealer_hits_soft_17=args.h17, double_after_split=not args.no_das,
+                  late_surrender=not args.no_surrender, blackjack_payout=args.payout)
+    records = None
+    if args.records:
+        from src.utils.data_loader import HandStoreWriter
+        records = HandStoreWriter(args.records)
+    start = time.perf_counter()
+    engine = VectorizedBlackjackEngine(rules, build_policy(args.policy, rules if args.rules else None, args.system),
+                                       num_tables=args.tables, penetration=args.penetration, seed=args.seed,
+                                       records=records)
+    if engine.penetration < args.penetration:
+        print(f"Penetration {args.penetration:.0%} leaves too few cards for the longest round; "
+              f"cutting at {engine.penetration:.0%} instead")
+    target = PrecisionTarget(ev_se=args.target_se) if args.target_se else None
+    summary = engine.run(args.rounds, target=target)
+    if records is not None:
+        records.close()
+    elapsed = time.perf_counter() - start
+    print(f"{summary['rounds']:,} rounds in {elapsed:.1f}s ({summary['rounds'] / elapsed:,.0f} rounds/s)")
+    print(f"EV per round: {summary['ev_per_round'] * 100:+.3f}% +- {summary['standard_error'] * 100:.3f}%"
+          f"  (std {summary['std_per_round']:.3f} units)")
+    low, high = summary["ev_interval"]
+    print(f"95% interval: {low * 100:+.3f}% to {high * 100:+.3f}% | ROI per unit bet {summary['roi'] * 100:+.3f}%"
+          f" +- {summary['roi_standard_error'] * 100:.3f}%")
+    if target is not None and not summary["target_reached"]:
+        print(f"Target ({target.describe()}) not reached within {args.rounds} lockstep rounds")
+    print(f"Blackjacks {summary['blackjacks']:,} | doubles {summary['doubles']:,} | splits {summary['splits']:,} | "
+          f"surrenders {summary['surrenders']:,} | insurance {summary['insurance_taken']:,}")
+    for true_count, bucket in summary.get("by_true_count", {}).items():
+        print(f"  TC {true_count:+d}: {bucket['rounds']:>12,} rounds  EV {bucket['ev_per_round'] * 100:+.2f}%")
@@ -0,0 +1,136 @@
+"""
+Compact simulation snapshots with non-blocking writes
+
+A snapshot is the zlib-compressed pickle of a simulation object graph: shoes
+(including their numpy generator state), counters, bankroll managers with
+their deques and the accumulated statistics, so a resumed run continues
+bit-identically. Event sinks hold open files and streams, so they are written
+as a placeholder and replaced by the sink given to load_snapshot. A hand store
+writer (src.utils.data_loader) is written as the number of chunks it had
+flushed; load_snapshot rolls the store given to it back to that point, so a
+resumed run does not record the same hands twice.
+
+SnapshotWriter pickles in the caller's thread (the only point where the state
+must be consistent) and leaves compression and the atomic file write to a
+background thread, so the simulation loop only pays for the pickle.
+"""
+import io
+import os
+import pickle
+import threading
+import zlib
+
+from src.utils.events import NULL_SINK, NullSink, AggregateSink, SampledSink, ConsoleSink, BinaryLogSink
+from src.utils.data_loader import HandStoreWriter
+
+SNAPSHOT_VERSION = 1
+_EVENT_SINKS = (NullSink, AggregateSink, SampledSink, ConsoleSink, BinaryLogSink)
+
+
+class _SnapshotPickler(pickle.Pickler):
+    def persistent_id(self, obj):
+        if isinstance(obj, _EVENT_SINKS):
+            return "events"
+        if isinstance(obj, HandStoreWriter):
+            return ("records", len(obj.manifest["chunks"]))
+        return None
+
+class _SnapshotUnpickler(pickle.Unpickler):
+    def __init__(self, file, events, records):
+        super().__init__(file)
+        self.events = events
+        self.records = records
+
+    def persistent_load(self, pid):
+        if pid == "events":
+            return self.events
+        if isinstance(pid, tuple) and pid[0] == "records":
+            if self.records is not None:
+                self.records.rollback(pid[1])
+            return self.records
+        raise pickle.UnpicklingError(f"Unknown persistent id {pid!r}")
+
+
+def dump_snapshot(state):
+    """Serialize a snapshot payload to uncompressed bytes"""
+    buffer = io.BytesIO()
+    _SnapshotPickler(buffer, protocol=pickle.HIGHEST_PROTOCOL).dump({"version": SNAPSHOT_VERSION, "state": state})
+    return buffer.getvalue()
+
+def _write_atomic(path, data):
+    tmp_path = path + ".tmp"
+    with open(tmp_path, "wb") as f:
+        f.write(zlib.compress(data, 1))
+    os.replace(tmp_path, path)
+
+def save_snapshot(path, state):
+    """Write a snapshot synchronously (atomic: a crash leaves the previous one intact)"""
+    _write_atomic(path, dump_snapshot(state))
+
+def load_snapshot(path, events=None, records=None):
+    """
+    Read a snapshot; event sinks in it are replaced by `events` (default: none)
+    and hand store writers by `records` (default: no recording)
+    """
+    with open(path, "rb") as f:
+        data = zlib.decompress(f.read())
+    payload = _SnapshotUnpickler(io.BytesIO(data), events or NULL_SINK, records).load()
+    if payload.get("version") != SNAPSHOT_VERSION:
+        raise ValueError(f"{path} is a version {payload.get('version')} snapshot, expected {SNAPSHOT_VERSION}")
+    return payload["state"]
+
+
+class SnapshotWriter:
+    """
+    Writes snapshots of one path from a background thread
+
+    submit() returns once the state is pickled. If a write is still in flight
+    when the next snapshot arrives, only the newest pending one is kept.
+    close() (or leaving the with block) waits for the last write and re-raises
+    any error from the writer thread.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self._pending = None
+        self._closed = False
+        self._error = None
+        self._condition = threading.Condition()
+        self._thread = threading.Thread(target=self._run, name="snapshot-writer", daemon=True)
+        self._thread.start()
+
+    def submit(self, state):
+        data = dump_snapshot(state)
+        with self._condition:
+            if self._error is not None:
+                raise self._error
+            self._pending = data
+            self._condition.notify()
+
+    def _run(self):
+        while True:
+            with self._condition:
+                while self._pending is None and not self._closed:
+                    self._condition.wait()
+                data, self._pending = self._pending, None
+                if data is None:
+                    return
+            try:
+                _write_atomic(self.path, data)
+            except Exception as error:
+                with self._condition:
+                    self._error = error
+
+    def close(self):
+        with self._condition:
+            self._closed = True
+            self._condition.notify()
+        self._thread.join()
+        if self._error is not None:
+            raise self._error
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
@@ -0,0 +1,288 @@
+"""
+Columnar store for per-hand simulation records
+
+A store is a directory of fixed-width binary columns cut into chunks:
+
+    manifest.json                 column layout and the rows in every chunk
+    chunk_000000.round.bin        one raw little-endian array per column
+    chunk_000000.cards.bin        ...
+
+HandStoreWriter buffers records in preallocated arrays and writes a chunk
+every chunk_rows records; the manifest is replaced only after a chunk's files
+are complete, so a crashed run leaves a readable store of whole chunks.
+HandStore memory-maps chunks on first access, so analysis streams through
+billions of hands without loading them or parsing text.
+"""
+import json
+import os
+
+from src.ai_brain.basic_strategy import CompiledStrategy
+
+STORE_VERSION = 1
+MAX_CARDS = 12  # Player cards kept per hand; longer hands are truncated
+NO_ACTION = 255  # Hands that ended before a decision (naturals, dealer blackjack)
+ACTIONS = CompiledStrategy.ACTIONS
+
+# name: (numpy dtype, per-record shape)
+HAND_COLUMNS = {
+    "round": ("<i8", ()),
+    "seat": ("<i2", ()),
+    "cards": ("i1", (MAX_CARDS,)),    # player's cards in order, 0-padded (Ace = 11)
+    "dealer_upcard": ("i1", ()),
+    "true_count": ("<f4", ()),
+    "action": ("u1", ()),            # first decision, an index into ACTIONS, or NO_ACTION
+    "bet": ("<f4", ()),
+    "result": ("<f4", ()),           # net win or loss, same unit as bet
+}
+
+MANIFEST = "manifest.json"
+
+
+def action_code(action):
+    """ACTIONS index for an action name (None or unknown names -> NO_ACTION)"""
+    try:
+        return ACTIONS.index(action)
+    except ValueError:
+        return NO_ACTION
+
+def _column_path(directory, chunk, column):
+    return os.path.join(directory, f"{chunk}.{column}.bin")
+
+def _read_manifest(directory):
+    with open(os.path.join(directory, MANIFEST)) as f:
+        manifest = json.load(f)
+    if manifest.get("version") != STORE_VERSION:
+        raise ValueError(f"{directory} is a version {manifest.get('version')} hand store, expected {STORE_VERSION}")
+    return manifest
+
+
+class HandStoreWriter:
+    """
+    Streams hand records into a store directory
+
+    append() takes one record (scalar simulators), append_batch() equal-length
+    arrays per column (vectorized engines). An existing store is only extended
+    with append=True.
+    """
+
+    def __init__(self, directory, chunk_rows=1_000_000, append=False):
+        import numpy as np
+        self.directory = directory
+        self.chunk_rows = chunk_rows
+        os.makedirs(directory, exist_ok=True)
+        if os.path.exists(os.path.join(directory, MANIFEST)):
+            if not append:
+                raise ValueError(f"{directory} already holds a hand store; pass append=True to extend it")
+            self.manifest = _read_manifest(directory)
+        else:
+            self.manifest = {
+                "version": STORE_VERSION,
+                "columns": {name: {"dtype": dtype, "shape": list(shape)} for name, (dtype, shape) in HAND_COLUMNS.items()},
+                "chunks": [],
+            }
+        self._buffers = {name: np.zeros((chunk_rows,) + shape, dtype=dtype)
+                         for name, (dtype, shape) in HAND_COLUMNS.items()}
+        self._rows = 0
+        self.rows_written = sum(chunk["rows"] for chunk in self.manifest["chunks"])
+
+    def append(self, round, seat, cards, dealer_upcard, true_count, action, bet, result):
+        i = self._rows
+        buffers = self._buffers
+        buffers["round"][i] = round
+        buffers["seat"][i] = seat
+        row = buffers["cards"][i]
+        row[:] = 0
+        cards = cards[:MAX_CARDS]
+        row[:len(cards)] = cards
+        buffers["dealer_upcard"][i] = dealer_upcard
+        buffers["true_count"][i] = true_count
+        buffers["action"][i] = action if isinstance(action, int) else action_code(action)
+        buffers["bet"][i] = bet
+        buffers["result"][i] = result
+        self._rows = i + 1
+        if self._rows == self.chunk_rows:
+            self.flush()
+
+    def append_batch(self, **columns):
+        """Append arrays (or scalars, broadcast) for every column in HAND_COLUMNS"""
+        import numpy as np
+        missing = set(HAND_COLUMNS) - set(columns)
+        if missing:
+            raise ValueError(f"Missing columns: {', '.join(sorted(missing))}")
+        count = max(np.shape(columns[name])[0] for name in HAND_COLUMNS if np.ndim(columns[name]) > len(HAND_COLUMNS[name][1]))
+        start = 0
+        while start < count:
+            take = min(count - start, self.chunk_rows - self._rows)
+            for name, values in columns.items():
+                values = np.asarray(values)
+                target = self._buffers[name][self._rows:self._rows + take]
+                target[...] = values[start:start + take] if values.ndim > len(HAND_COLUMNS[name][1]) else values
+            self._rows += take
+            start += take
+            if self._rows == self.chunk_rows:
+                self.flush()
+
+    def flush(self):
+        """Write buffered records as a new chunk"""
+        if not self._rows:
+            return
+        chunk = f"chunk_{len(self.manifest['chunks']):06d}"
+        for name, buffer in self._buffers.items():
+            buffer[:self._rows].tofile(_column_path(self.directory, chunk, name))
+        self.manifest["chunks"].append({"name": chunk, "rows": self._rows})
+        self.rows_written += self._rows
+        self._rows = 0
+        self._write_manifest()
+
+    def _write_manifest(self):
+        tmp_path = os.path.join(self.directory, MANIFEST + ".tmp")
+        with open(tmp_path, "w") as f:
+            json.dump(self.manifest, f, indent=2)
+        os.replace(tmp_path, os.path.join(self.directory, MANIFEST))
+
+    def rollback(self, chunks):
+        """Drop buffered records and every chunk after the first `chunks` (used when resuming a snapshot)"""
+        self._rows = 0
+        dropped = self.manifest["chunks"][chunks:]
+        if not dropped:
+            return
+        self.manifest["chunks"] = self.manifest["chunks"][:chunks]
+        self.rows_written = sum(chunk["rows"] for chunk in self.manifest["chunks"])
+        self._write_manifest()
+        for chunk in dropped:
+            for name in self.manifest["columns"]:
+                path = _column_path(self.directory, chunk["name"], name)
+                if os.path.exists(path):
+                    os.remove(path)
+
+    def close(self):
+        self.flush()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+class ChunkedColumn:
+    """One column across all chunks; indexing copies only the rows asked for"""
+
+    def __init__(self, store, name):
+        self.store = store
+        self.name = name
+
+    def __len__(self):
+        return len(self.store)
+
+    def chunks(self):
+        for index in range(self.store.chunk_count):
+            yield self.store.chunk(index)[self.name]
+
+    def __getitem__(self, key):
+        import numpy as np
+        if isinstance(key, slice):
+            start, stop, step = key.indices(len(self))
+            if step != 1:
+                raise ValueError("Only contiguous slices are supported")
+            parts = []
+            for index, offset in enumerate(self.store.offsets[:-1]):
+                rows = self.store.offsets[index + 1] - offset
+                lo, hi = max(start - offset, 0), min(stop - offset, rows)
+                if lo < hi:
+                    parts.append(self.store.chunk(index)[self.name][lo:hi])
+            if not parts:
+                dtype, shape = self.store.column_layout(self.name)
+                return np.empty((0,) + shape, dtype=dtype)
+            return np.concatenate(parts)
+        if key < 0:
+            key += len(self)
+        if not 0 <= key < len(self):
+            raise IndexError(f"Row {key} out of range")
+        index = int(np.searchsorted(self.store.offsets, key, side="right")) - 1
+        return self.store.chunk(index)[self.name][key - self.store.offsets[index]]
+
+
+class HandStore:
+    """
+    Read-only view of a store written by HandStoreWriter
+
+    Only the manifest is read up front; each chunk's columns are memory-mapped
+    the first time the chunk is touched.
+    """
+
+    def __init__(self, directory):
+        self.directory = directory
+        self.manifest = _read_manifest(directory)
+        self.offsets = [0]
+        for chunk in self.manifest["chunks"]:
+            self.offsets.append(self.offsets[-1] + chunk["rows"])
+        self._chunks = {}
+
+    def __len__(self):
+        return self.offsets[-1]
+
+    @property
+    def chunk_count(self):
+        return len(self.manifest["chunks"])
+
+    @property
+    def columns(self):
+        return list(self.manifest["columns"])
+
+    def column_layout(self, name):
+        layout = self.manifest["columns"][name]
+        return layout["dtype"], tuple(layout["shape"])
+
+    def chunk(self, index):
+        """Column name -> read-only memmap for one chunk"""
+        import numpy as np
+        chunk = self._chunks.get(index)
+        if chunk is None:
+            entry = self.manifest["chunks"][index]
+            chunk = {}
+            for name in self.manifest["columns"]:
+                dtype, shape = self.column_layout(name)
+                chunk[name] = np.memmap(_column_path(self.directory, entry["name"], name), dtype=dtype, mode="r",
+                                        shape=(entry["rows"],) + shape)
+            self._chunks[index] = chunk
+        return chunk
+
+    def iter_chunks(self, columns=None):
+        """Yield {column: memmap} per chunk, limited to `columns` if given"""
+        for index in range(self.chunk_count):
+            chunk = self.chunk(index)
+            yield chunk if columns is None else {name: chunk[name] for name in columns}
+
+    def column(self, name):
+        if name not in self.manifest["columns"]:
+            raise KeyError(f"No column {name!r}; columns are {', '.join(self.columns)}")
+        return ChunkedColumn(self, name)
+
+    def summary(self):
+        """Hands, amounts, EV and action counts, computed one chunk at a time"""
+        import numpy as np
+        hands = 0
+        total_bet = net = net_squared = 0.0
+        action_counts = np.zeros(256, dtype=np.int64)
+        for chunk in self.iter_chunks(["bet", "result", "action"]):
+            result = chunk["result"].astype(np.float64)
+            hands += len(result)
+            total_bet += float(chunk["bet"].sum(dtype=np.float64))
+            net += float(result.sum())
+            net_squared += float((result * result).sum())
+            action_counts += np.bincount(chunk["action"], minlength=256)
+        mean = net / hands if hands else 0.0
+        std = max(net_squared / hands - mean * mean, 0.0) ** 0.5 if hands else 0.0
+        actions = {name: int(action_counts[code]) for code, name in enumerate(ACTIONS) if action_counts[code]}
+        if action_counts[NO_ACTION]:
+            actions["none"] = int(action_counts[NO_ACTION])
+        return {
+            "hands": hands,
+            "total_bet": total_bet,
+            "net": net,
+            "result_per_hand": mean,
+            "std_per_hand": std,
+            "return_on_bet": net / total_bet if total_bet else 0.0,
+            "actions": actions,
+        }
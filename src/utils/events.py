@@ -0,0 +1,239 @@
+"""
+Pluggable sinks for per-hand simulation events
+
+Hot loops emit events as `sink.emit(name, **fields)` behind an `if sink.enabled:`
+check, so with the default NullSink a hand costs one attribute lookup and no
+formatting. Sinks:
+
+    NullSink        drop everything (default)
+    AggregateSink   per-event counts and sums of numeric fields
+    SampledSink     forward every Nth event of each kind to another sink
+    ConsoleSink     the human-readable lines the simulators used to print
+    BinaryLogSink   compact structured records, read back with read_event_log
+"""
+import struct
+import sys
+
+
+class NullSink:
+    enabled = False
+
+    def emit(self, event, **fields):
+        pass
+
+    def close(self):
+        pass
+
+NULL_SINK = NullSink()
+
+
+class AggregateSink:
+    """Counts each event and sums its numeric fields; nothing is stored per hand"""
+    enabled = True
+
+    def __init__(self):
+        self.counts = {}
+        self.sums = {}
+
+    def emit(self, event, **fields):
+        self.counts[event] = self.counts.get(event, 0) + 1
+        sums = self.sums.get(event)
+        if sums is None:
+            sums = self.sums[event] = {}
+        for key, value in fields.items():
+            if type(value) in (int, float):
+                sums[key] = sums.get(key, 0) + value
+
+    def summary(self):
+        return {event: {"count": count, "sums": dict(self.sums.get(event, {}))}
+                for event, count in self.counts.items()}
+
+    def close(self):
+        pass
+
+
+class SampledSink:
+    """Forwards the first and then every `every`-th event of each kind"""
+    enabled = True
+
+    def __init__(self, sink, every=100):
+        self.sink = sink
+        self.every = every
+        self._seen = {}
+
+    def emit(self, event, **fields):
+        seen = self._seen.get(event, 0)
+        self._seen[event] = seen + 1
+        if seen % self.every == 0:
+            self.sink.emit(event, **fields)
+
+    def close(self):
+        self.sink.close()
+
+
+def _format_hand(f):
+    return (f"[{f['bot']}] {'⚠️' if f['risk_reduced'] else ''} Hand: {f['player_hand']} vs {f['dealer_upcard']} | "
+            f"Bet: ${f['bet']:.2f} | Result: {f['result']} | "
+            f"Bankroll: ${f['bankroll']:.2f} | "
+            f"DD: {f['drawdown']:.1f}% | TC: {f['true_count']:.1f}")
+
+def _format_round(f):
+    return "\n".join([
+        "===== NEW ROUND =====",
+        f"Player hand: {f['player_hand']}",
+        f"Dealer shows: {f['dealer_upcard']}",
+        f"AI Decision: {f['action'].upper()} | Reason: {f['reason']} | Bet: ${f['bet']}",
+        f"Dealer final hand: {f['dealer_hand']} => total: {f['dealer_total']}",
+        f"Count Status: {f['deck_status']} | {f['advantage_text']}",
+        f"Outcome: {f['result']}",
+        f"Bankroll: ${f['bankroll']:.2f}",
+        "",
+    ])
+
+CONSOLE_FORMATS = {
+    "hand": _format_hand,
+    "round": _format_round,
+    "round_start": lambda f: f"\n=== Round {f['round']}/{f['rounds']} ===",
+    "reshuffle": lambda f: "\n🔁 Reshuffling shoe due to penetration threshold.\n",
+}
+
+class ConsoleSink:
+    """Prints each event as the simulators' original console lines"""
+    enabled = True
+
+    def __init__(self, stream=None, formats=None):
+        self.stream = stream
+        self.formats = {**CONSOLE_FORMATS, **(formats or {})}
+
+    def emit(self, event, **fields):
+        formatter = self.formats.get(event)
+        if formatter is not None:
+            line = formatter(fields)
+        else:
+            line = event + " " + " ".join(f"{key}={value}" for key, value in fields.items())
+        print(line, file=self.stream or sys.stdout)
+
+    def close(self):
+        pass
+
+
+# Binary log: every record starts with a kind byte
+_STRING, _EVENT = 0, 1
+# Field value types
+_INT, _FLOAT, _STR, _BOOL, _INTS, _NONE = range(6)
+_HEADER = struct.Struct("<BIH")  # kind, event name id, field count
+_FIELD = struct.Struct("<IB")    # key id, value type
+_DEFINE = struct.Struct("<BII")  # kind, string id, byte length
+
+class BinaryLogSink:
+    """
+    Structured binary event log
+
+    Event names, field names and string values are written once and referenced
+    by id afterwards, so a hand record is a few dozen bytes. Values may be
+    int, float, bool, str, None or a list of ints (e.g. a hand of cards).
+    """
+    enabled = True
+
+    def __init__(self, path):
+        self.path = path
+        self._file = open(path, "wb")
+        self._strings = {}
+
+    def _string_id(self, text):
+        string_id = self._strings.get(text)
+        if string_id is None:
+            string_id = self._strings[text] = len(self._strings)
+            data = text.encode("utf-8")
+            self._file.write(_DEFINE.pack(_STRING, string_id, len(data)) + data)
+        return string_id
+
+    def emit(self, event, **fields):
+        parts = [_HEADER.pack(_EVENT, self._string_id(event), len(fields))]
+        for key, value in fields.items():
+            key_id = self._string_id(key)
+            if value is None:
+                parts.append(_FIELD.pack(key_id, _NONE))
+            elif type(value) is bool:
+                parts.append(_FIELD.pack(key_id, _BOOL) + struct.pack("<?", value))
+            elif isinstance(value, int):
+                parts.append(_FIELD.pack(key_id, _INT) + struct.pack("<q", value))
+            elif isinstance(value, float):
+                parts.append(_FIELD.pack(key_id, _FLOAT) + struct.pack("<d", value))
+            elif isinstance(value, str):
+                parts.append(_FIELD.pack(key_id, _STR) + struct.pack("<I", self._string_id(value)))
+            elif isinstance(value, (list, tuple)):
+                parts.append(_FIELD.pack(key_id, _INTS) + struct.pack(f"<H{len(value)}q", len(value), *value))
+            else:
+                raise TypeError(f"Cannot log {key}={value!r} in a binary event log")
+        self._file.write(b"".join(parts))
+
+    def close(self):
+        if not self._file.closed:
+            self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+def read_event_log(path):
+    """Yield (event, fields) from a BinaryLogSink file"""
+    strings = {}
+    with open(path, "rb") as f:
+        data = f.read()
+    offset = 0
+    while offset < len(data):
+        kind = data[offset]
+        if kind == _STRING:
+            _, string_id, length = _DEFINE.unpack_from(data, offset)
+            offset += _DEFINE.size
+            strings[string_id] = data[offset:offset + length].decode("utf-8")
+            offset += length
+            continue
+        _, name_id, field_count = _HEADER.unpack_from(data, offset)
+        offset += _HEADER.size
+        fields = {}
+        for _ in range(field_count):
+            key_id, value_type = _FIELD.unpack_from(data, offset)
+            offset += _FIELD.size
+            if value_type == _NONE:
+                value = None
+            elif value_type == _BOOL:
+                value = struct.unpack_from("<?", data, offset)[0]
+                offset += 1
+            elif value_type == _INT:
+                value = struct.unpack_from("<q", data, offset)[0]
+                offset += 8
+            elif value_type == _FLOAT:
+                value = struct.unpack_from("<d", data, offset)[0]
+                offset += 8
+            elif value_type == _STR:
+                value = strings[struct.unpack_from("<I", data, offset)[0]]
+                offset += 4
+            else:
+                length = struct.unpack_from("<H", data, offset)[0]
+                value = list(struct.unpack_from(f"<{length}q", data, offset + 2))
+                offset += 2 + 8 * length
+            fields[strings[key_id]] = value
+        yield strings[name_id], fields
+
+
+def make_event_sink(mode="none", path=None, sample_every=100):
+    """Build a sink by name: none, aggregate, sampled (console every N), console or binary"""
+    if mode == "none":
+        return NULL_SINK
+    if mode == "aggregate":
+        return AggregateSink()
+    if mode == "sampled":
+        return SampledSink(ConsoleSink(), every=sample_every)
+    if mode == "console":
+        return ConsoleSink()
+    if mode == "binary":
+        if not path:
+            raise ValueError("binary event logs need a path")
+        return BinaryLogSink(path)
+    raise ValueError(f"Unknown event sink: {mode}")
+
+EVENT_SINK_MODES = ("none", "aggregate", "sampled", "console", "binary")
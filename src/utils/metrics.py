@@ -0,0 +1,84 @@
+import bisect
+import threading
+
+# Upper bounds in seconds; tuned for sub-millisecond decision stages
+DEFAULT_LATENCY_BUCKETS = (0.000005, 0.00001, 0.000025, 0.00005, 0.0001, 0.00025, 0.0005,
+                           0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0)
+
+class LatencyHistogram:
+    """Cumulative-bucket latency histogram in the Prometheus style"""
+    def __init__(self, buckets=DEFAULT_LATENCY_BUCKETS):
+        self.buckets = tuple(buckets)
+        self.counts = [0] * (len(self.buckets) + 1)  # last slot is +Inf
+        self.total = 0.0
+        self.count = 0
+
+    def observe(self, seconds):
+        self.counts[bisect.bisect_left(self.buckets, seconds)] += 1
+        self.total += seconds
+        self.count += 1
+
+    def cumulative_counts(self):
+        running = 0
+        for bucket_count in self.counts:
+            running += bucket_count
+            yield running
+
+
+class MetricsRegistry:
+    """
+    Request counters and per-stage latency histograms
+
+    Disabled registries are never consulted on the hot path: callers check
+    `enabled` once when wiring up instrumentation.
+    """
+
+    def __init__(self, enabled=True, buckets=DEFAULT_LATENCY_BUCKETS, namespace="blackjack"):
+        self.enabled = enabled
+        self.buckets = buckets
+        self.namespace = namespace
+        self.request_latency = {}
+        self.stage_latency = {}
+        self._lock = threading.Lock()
+
+    def observe(self, stage, seconds):
+        """Record time spent in one stage of decision handling"""
+        with self._lock:
+            histogram = self.stage_latency.get(stage)
+            if histogram is None:
+                histogram = self.stage_latency[stage] = LatencyHistogram(self.buckets)
+            histogram.observe(seconds)
+
+    def observe_request(self, endpoint, seconds):
+        """Record end-to-end latency for one request to an endpoint"""
+        with self._lock:
+            histogram = self.request_latency.get(endpoint)
+            if histogram is None:
+                histogram = self.request_latency[endpoint] = LatencyHistogram(self.buckets)
+            histogram.observe(seconds)
+
+    def render(self, gauges=None):
+        """Render all metrics in the Prometheus text exposition format"""
+        lines = []
+        with self._lock:
+            requests_total = f"{self.namespace}_requests_total"
+            lines.append(f"# TYPE {requests_total} counter")
+            for endpoint, histogram in sorted(self.request_latency.items()):
+                lines.append(f'{requests_total}{{endpoint="{endpoint}"}} {histogram.count}')
+            self._render_histograms(lines, f"{self.namespace}_request_latency_seconds", "endpoint",
+                                    self.request_latency)
+            self._render_histograms(lines, f"{self.namespace}_stage_latency_seconds", "stage",
+                                    self.stage_latency)
+        for name, value in sorted((gauges or {}).items()):
+            lines.append(f"# TYPE {self.namespace}_{name} gauge")
+            lines.append(f"{self.namespace}_{name} {value}")
+        return "\n".join(lines) + "\n"
+
+    def _render_histograms(self, lines, name, label, histograms):
+        lines.append(f"# TYPE {name} histogram")
+        for label_value, histogram in sorted(histograms.items()):
+            bounds = [repr(bound) for bound in histogram.buckets] + ["+Inf"]
+            for bound, cumulative in zip(bounds, histogram.cumulative_counts()):
+                lines.append(f'{name}_bucket{{{label}="{label_value}",le="{bound}"}} {cumulative}')
+            lines.append(f'{name}_sum{{{label}="{label_value}"}} {histogram.total}')
+            lines.append(f'{name}_count{{{label}="{label_value}"}} {histogram.count}')
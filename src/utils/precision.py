@@ -0,0 +1,173 @@
+"""
+Running error bars and precision-targeted stopping for simulations
+
+ResultStats follows the per-hand (or per-round) result x and amount bet y with
+Welford-style co-moments, so EV (mean x) and return on the amount bet
+(sum x / sum y) come with standard errors at any point of a run at a cost of a
+few float operations per sample. Stats from separate shards merge exactly.
+
+PrecisionTarget says when a run has seen enough: a runner keeps playing until
+every standard error it is given is at or below its bound, instead of for a
+fixed number of rounds chosen in advance.
+"""
+from statistics import NormalDist
+
+
+def z_value(level=0.95):
+    """Two-sided normal quantile for a confidence level (1.96 for 0.95)"""
+    return NormalDist().inv_cdf(0.5 + level / 2)
+
+def confidence_interval(estimate, standard_error, level=0.95):
+    margin = z_value(level) * standard_error
+    return (estimate - margin, estimate + margin)
+
+
+class ResultStats:
+    """
+    Count, means and co-moments of (result, bet) pairs
+
+    ev is the mean result and roi the ratio of total result to total bet; its
+    standard error comes from the delta method, which treats the bet as random
+    too (bets follow the count).
+    """
+
+    def __init__(self):
+        self.count = 0
+        self.mean_result = 0.0
+        self.mean_bet = 0.0
+        self.m2_result = 0.0  # sum of squared deviations
+        self.m2_bet = 0.0
+        self.co_moment = 0.0  # sum of result deviation * bet deviation
+
+    def add(self, result, bet):
+        self.count += 1
+        n = self.count
+        delta_result = result - self.mean_result
+        delta_bet = bet - self.mean_bet
+        self.mean_result += delta_result / n
+        self.mean_bet += delta_bet / n
+        self.m2_result += delta_result * (result - self.mean_result)
+        self.m2_bet += delta_bet * (bet - self.mean_bet)
+        self.co_moment += delta_result * (bet - self.mean_bet)
+
+    def add_array(self, results, bets):
+        """Add a batch of samples (numpy arrays) in one step"""
+        import numpy as np
+        results = np.asarray(results, dtype=np.float64)
+        bets = np.asarray(bets, dtype=np.float64)
+        if not len(results):
+            return
+        batch = ResultStats()
+        batch.count = len(results)
+        batch.mean_result = float(results.mean())
+        batch.mean_bet = float(bets.mean())
+        result_dev = results - batch.mean_result
+        bet_dev = bets - batch.mean_bet
+        batch.m2_result = float(result_dev @ result_dev)
+        batch.m2_bet = float(bet_dev @ bet_dev)
+        batch.co_moment = float(result_dev @ bet_dev)
+        self.merge(batch)
+
+    def merge(self, other):
+        """Fold in another ResultStats (Chan et al. pairwise update); returns self"""
+        if not other.count:
+            return self
+        n_a, n_b = self.count, other.count
+        n = n_a + n_b
+        delta_result = other.mean_result - self.mean_result
+        delta_bet = other.mean_bet - self.mean_bet
+        weight = n_a * n_b / n
+        self.m2_result += other.m2_result + delta_result * delta_result * weight
+        self.m2_bet += other.m2_bet + delta_bet * delta_bet * weight
+        self.co_moment += other.co_moment + delta_result * delta_bet * weight
+        self.mean_result += delta_result * n_b / n
+        self.mean_bet += delta_bet * n_b / n
+        self.count = n
+        return self
+
+    @property
+    def ev(self):
+        return self.mean_result
+
+    @property
+    def std(self):
+        return (self.m2_result / (self.count - 1)) ** 0.5 if self.count > 1 else 0.0
+
+    @property
+    def ev_standard_error(self):
+        return self.std / self.count ** 0.5 if self.count > 1 else float("inf")
+
+    @property
+    def roi(self):
+        return self.mean_result / self.mean_bet if self.mean_bet else 0.0
+
+    @property
+    def roi_standard_error(self):
+        if self.count < 2 or not self.mean_bet:
+            return float("inf")
+        ratio = self.roi
+        variance = (self.m2_result - 2 * ratio * self.co_moment + ratio * ratio * self.m2_bet) / (self.count - 1)
+        return max(variance, 0.0) ** 0.5 / (self.count ** 0.5 * abs(self.mean_bet))
+
+    def summary(self, level=0.95):
+        return {
+            "count": self.count,
+            "ev": self.ev,
+            "ev_standard_error": self.ev_standard_error,
+            "ev_interval": confidence_interval(self.ev, self.ev_standard_error, level),
+            "roi": self.roi,
+            "roi_standard_error": self.roi_standard_error,
+            "roi_interval": confidence_interval(self.roi, self.roi_standard_error, level),
+            "level": level,
+        }
+
+    def to_dict(self):
+        return dict(vars(self))
+
+    @classmethod
+    def from_dict(cls, state):
+        stats = cls()
+        stats.__dict__.update(state)
+        return stats
+
+
+class PrecisionTarget:
+    """
+    Stopping rule for a simulation run
+
+    Args:
+        ev_se: Largest acceptable standard error of EV (same unit as results)
+        roi_se: Largest acceptable standard error of result / amount bet
+        min_samples: Never stop before this many samples, so the variance
+            estimate itself is trustworthy
+        level: Confidence level for the intervals reported with the result
+    """
+
+    def __init__(self, ev_se=None, roi_se=None, min_samples=1000, level=0.95):
+        if ev_se is None and roi_se is None:
+            raise ValueError("A precision target needs ev_se and/or roi_se")
+        self.ev_se = ev_se
+        self.roi_se = roi_se
+        self.min_samples = min_samples
+        self.level = level
+
+    def reached(self, count, ev_se=None, roi_se=None):
+        if count < self.min_samples:
+            return False
+        if self.ev_se is not None and not (ev_se is not None and ev_se <= self.ev_se):
+            return False
+        if self.roi_se is not None and not (roi_se is not None and roi_se <= self.roi_se):
+            return False
+        return True
+
+    def reached_by(self, stats):
+        """reached() for a ResultStats"""
+        return self.reached(stats.count, stats.ev_standard_error, stats.roi_standard_error)
+
+    def describe(self):
+        parts = []
+        if self.ev_se is not None:
+            parts.append(f"EV standard error <= {self.ev_se:g}")
+        if self.roi_se is not None:
+            parts.append(f"ROI standard error <= {self.roi_se:g}")
+        return " and ".join(parts)
@@ -0,0 +1,80 @@
+import time
+import uuid
+import threading
+from collections import OrderedDict
+from src.ai_brain.EnhancedCardCounter import EnhancedCardCounter
+
+class ShoeSession:
+    """Count state for one live shoe, owned by the API process"""
+    def __init__(self, session_id, num_decks=6):
+        self.session_id = session_id
+        self.counter = EnhancedCardCounter(num_decks=num_decks)
+        self.last_access = time.monotonic()
+
+    def get_state(self):
+        return {
+            "session_id": self.session_id,
+            "num_decks": self.counter.num_decks,
+            "running_count": self.counter.running_count,
+            "cards_seen": self.counter.cards_seen,
+            "true_count": self.counter.get_true_count(),
+            "penetration": self.counter.penetration()
+        }
+
+
+class SessionStore:
+    """
+    Bounded in-memory session registry with TTL expiry and LRU eviction
+
+    Memory is capped at max_sessions counters: creating a session beyond the cap
+    evicts the least recently used one, and idle sessions expire after ttl_seconds.
+    """
+
+    def __init__(self, max_sessions=10000, ttl_seconds=3600):
+        self.max_sessions = max_sessions
+        self.ttl_seconds = ttl_seconds
+        self._sessions = OrderedDict()
+        self._lock = threading.Lock()
+        self.evictions = 0
+        self.expirations = 0
+
+    def create(self, num_decks=6):
+        session = ShoeSession(uuid.uuid4().hex, num_decks=num_decks)
+        with self._lock:
+            self._purge_expired(session.last_access)
+            while len(self._sessions) >= self.max_sessions:
+                self._sessions.popitem(last=False)
+                self.evictions += 1
+            self._sessions[session.session_id] = session
+        return session
+
+    def get(self, session_id):
+        """Return the live session (refreshing its TTL) or None if unknown/expired"""
+        now = time.monotonic()
+        with self._lock:
+            session = self._sessions.get(session_id)
+            if session is None:
+                return None
+            if now - session.last_access > self.ttl_seconds:
+                del self._sessions[session_id]
+                self.expirations += 1
+                return None
+            session.last_access = now
+            self._sessions.move_to_end(session_id)
+            return session
+
+    def delete(self, session_id):
+        with self._lock:
+            return self._sessions.pop(session_id, None) is not None
+
+    def _purge_expired(self, now):
+        # Sessions are kept in access order, so expired ones sit at the front
+        while self._sessions:
+            session = next(iter(self._sessions.values()))
+            if now - session.last_access <= self.ttl_seconds:
+                break
+            self._sessions.popitem(last=False)
+            self.expirations += 1
+
+    def __len__(self):
+        return len(self._sessions)
@@ -0,0 +1,196 @@
+import sys
+import os
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import unittest
+from fastapi.testclient import TestClient
+from starlette.websockets import WebSocketDisconnect
+from api import app, decision_engine, metrics, sessions
+from src.utils.session_store import SessionStore
+from scripts.load_test import DEFAULT_MIX, TrafficGenerator
+
+class TestApi(unittest.TestCase):
+    def setUp(self):
+        self.client = TestClient(app)
+
+    def test_single_decision(self):
+        response = self.client.post("/eyobsai_decision", json={
+            "player_hand": [10, 6], "dealer_upcard": 10,
+            "running_count": 24, "cards_dealt": 0, "num_decks": 6
+        })
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()['true_count'], 4.0)
+
+    def test_batch_matches_single_decisions(self):
+        hands = [
+            {"player_hand": [10, 6], "dealer_upcard": 10},
+            {"player_hand": [10, 2], "dealer_upcard": 3},
+            {"player_hand": [6, 5], "dealer_upcard": 1},
+        ]
+        context = {"running_count": 12, "cards_dealt": 52, "num_decks": 6}
+        response = self.client.post("/eyobsai_decision/batch", json={"hands": hands, **context})
+        self.assertEqual(response.status_code, 200)
+        decisions = response.json()['decisions']
+        self.assertEqual(len(decisions), len(hands))
+        for hand, decision in zip(hands, decisions):
+            single = self.client.post("/eyobsai_decision", json={**hand, **context}).json()
+            self.assertEqual(decision, single)
+
+    def test_batch_respects_hand_flags(self):
+        response = self.client.post("/eyobsai_decision/batch", json={
+            "hands": [{"player_hand": [10, 6], "dealer_upcard": 10, "can_surrender": False}],
+            "running_count": 0, "cards_dealt": 0, "num_decks": 6
+        })
+        self.assertNotEqual(response.json()['decisions'][0]['action'], "surrender")
+
+        response = self.client.post("/eyobsai_decision/batch", json={
+            "hands": [{"player_hand": [6, 5], "dealer_upcard": 6, "can_double": False},
+                      {"player_hand": [8, 8], "dealer_upcard": 6, "can_split": True}],
+            "running_count": 0, "cards_dealt": 0, "num_decks": 6
+        })
+        self.assertEqual([decision['action'] for decision in response.json()['decisions']], ["hit", "split"])
+
+        session_id = self.client.post("/sessions", json={"num_decks": 6}).json()['session_id']
+        decision = self.client.post(f"/sessions/{session_id}/decision",
+                                    json={"player_hand": [6, 5], "dealer_upcard": 6, "can_double": False}).json()
+        self.assertEqual(decision['action'], "hit")
+
+    def test_ev_decision(self):
+        composition = [24, 24, 24, 24, 23, 24, 24, 24, 24, 94]  # 6 decks minus 10, 6 and a 10 upcard
+        response = self.client.post("/ev_decision", json={
+            "player_hand": [8, 8], "dealer_upcard": 10, "composition": composition, "can_split": True
+        })
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()['action'], "split")
+        bad = self.client.post("/ev_decision", json={
+            "player_hand": [8, 8], "dealer_upcard": 10, "composition": [1, 2, 3]
+        })
+        self.assertEqual(bad.status_code, 422)
+        for composition in ([0] * 10, [-5] + [4] * 8 + [16]):
+            bad = self.client.post("/ev_decision", json={
+                "player_hand": [8, 8], "dealer_upcard": 10, "composition": composition
+            })
+            self.assertEqual(bad.status_code, 422)
+
+    def test_ev_decision_rejects_bad_cards(self):
+        composition = [24, 24, 24, 24, 23, 24, 24, 24, 24, 94]
+        for player_hand, dealer_upcard in (([0, 5], 10), ([25, 5], 10), (["a", 5], 10), ([], 10), ([10, 6], 0)):
+            response = self.client.post("/ev_decision", json={
+                "player_hand": player_hand, "dealer_upcard": dealer_upcard, "composition": composition
+            })
+            self.assertEqual(response.status_code, 422, (player_hand, dealer_upcard))
+
+    def test_session_incremental_updates(self):
+        session_id = self.client.post("/sessions", json={"num_decks": 6}).json()['session_id']
+        self.client.post(f"/sessions/{session_id}/cards", json={"cards": [2, 3, 4]})
+        state = self.client.post(f"/sessions/{session_id}/cards", json={"cards": [5, 10]}).json()
+        self.assertEqual(state['running_count'], 3)
+        self.assertEqual(state['cards_seen'], 5)
+
+        decision = self.client.post(f"/sessions/{session_id}/decision",
+                                    json={"player_hand": [10, 6], "dealer_upcard": 10}).json()
+        self.assertEqual(decision['true_count'], state['true_count'])
+        self.assertEqual(self.client.post(f"/sessions/{session_id}/cards", json={"cards": [0]}).status_code, 422)
+
+        ev = self.client.post(f"/sessions/{session_id}/ev_decision",
+                              json={"player_hand": [10, 6], "dealer_upcard": 10}).json()
+        self.assertEqual(ev['cards_remaining'], 6 * 52 - 5)
+
+        self.assertEqual(self.client.delete(f"/sessions/{session_id}").status_code, 200)
+        self.assertEqual(self.client.get(f"/sessions/{session_id}").status_code, 404)
+
+    def test_advice_stream_pushes_changes(self):
+        with self.client.websocket_connect("/ws/advice?num_decks=6") as ws:
+            ws.send_json({"type": "cards", "cards": [2, 3, 4, 5, 6, 2]})
+            count = ws.receive_json()
+            self.assertEqual(count['type'], "count")
+            self.assertEqual(count['running_count'], 6)
+
+            ws.send_json({"type": "hand", "player_hand": [10, 6], "dealer_upcard": 10})
+            decision = ws.receive_json()
+            self.assertEqual(decision['type'], "decision")
+            self.assertEqual(decision['true_count'], count['true_count'])
+
+            ws.send_json({"type": "bogus"})
+            self.assertEqual(ws.receive_json()['type'], "error")
+
+    def test_advice_stream_rejects_malformed_frames(self):
+        with self.client.websocket_connect("/ws/advice?num_decks=6") as ws:
+            ws.send_json([1, 2, 3])
+            self.assertEqual(ws.receive_json()['type'], "error")
+            ws.send_text("not json")
+            self.assertEqual(ws.receive_json()['type'], "error")
+            ws.send_bytes(b'{"type": "shuffle"}')
+            self.assertEqual(ws.receive_json()['type'], "error")
+            ws.send_json({"type": "cards", "cards": [2]})
+            self.assertEqual(ws.receive_json()['running_count'], 1)
+
+    def test_advice_stream_refreshes_session_ttl(self):
+        session_id = self.client.post("/sessions", json={"num_decks": 6}).json()['session_id']
+        session = sessions.get(session_id)
+        with self.client.websocket_connect(f"/ws/advice?session_id={session_id}") as ws:
+            session.last_access -= 60
+            stale = session.last_access
+            ws.send_json({"type": "cards", "cards": [2]})
+            ws.receive_json()
+            self.assertGreater(session.last_access, stale)
+
+            sessions.delete(session_id)
+            ws.send_json({"type": "cards", "cards": [3]})
+            with self.assertRaises(WebSocketDisconnect) as closed:
+                ws.receive_json()
+            self.assertEqual(closed.exception.code, 4404)
+
+    @unittest.skipUnless(metrics.enabled, "metrics disabled via BLACKJACK_METRICS")
+    def test_metrics_exposes_stage_histograms(self):
+        decision_engine.invalidate_cache()
+        self.client.post("/eyobsai_decision", json={
+            "player_hand": [10, 6], "dealer_upcard": 10,
+            "running_count": 0, "cards_dealt": 0, "num_decks": 6
+        })
+        body = self.client.get("/metrics").text
+        self.assertIn('blackjack_requests_total{endpoint="ai_decision"}', body)
+        for stage in ["validation", "counter_setup", "basic_strategy", "deviation_scan", "scoring", "serialization"]:
+            self.assertIn(f'blackjack_stage_latency_seconds_count{{stage="{stage}"}}', body)
+
+
+class TestLoadTestTraffic(unittest.TestCase):
+    def test_mixed_traffic_keeps_session_in_step(self):
+        client = TestClient(app)
+        generator = TrafficGenerator(num_decks=1, seed=7)
+        generator.session_id = client.post("/sessions", json={"num_decks": 1}).json()['session_id']
+        names, weights = list(DEFAULT_MIX), list(DEFAULT_MIX.values())
+        shuffles = posted = 0
+        for _ in range(3000):
+            for method, path, body in generator.next_requests(generator.rng.choices(names, weights)[0]):
+                if path.endswith("/shuffle"):
+                    shuffles += 1
+                    posted = 0
+                elif path.endswith("/cards"):
+                    posted += len(body["cards"])
+                response = client.request(method, path, json=body)
+                self.assertLess(response.status_code, 400, response.text)
+        self.assertGreater(shuffles, 10)
+        self.assertEqual(client.get(f"/sessions/{generator.session_id}").json()['cards_seen'], posted)
+
+class TestSessionStore(unittest.TestCase):
+    def test_lru_eviction_bounds_sessions(self):
+        store = SessionStore(max_sessions=2, ttl_seconds=60)
+        first = store.create()
+        second = store.create()
+        store.get(first.session_id)  # first is now most recently used
+        store.create()
+        self.assertEqual(len(store), 2)
+        self.assertIsNotNone(store.get(first.session_id))
+        self.assertIsNone(store.get(second.session_id))
+        self.assertEqual(store.evictions, 1)
+
+    def test_ttl_expiry(self):
+        store = SessionStore(max_sessions=10, ttl_seconds=0)
+        session = store.create()
+        session.last_access -= 1
+        self.assertIsNone(store.get(session.session_id))
+        self.assertEqual(len(store), 0)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,100 @@
+import sys
+import os
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import tempfile
+import unittest
+from collections import Counter
+import numpy as np
+from src.simulation.shoe import (ArrayShoe, ArrayBlackjackShoe, DECK_VALUES, generate_shoe_block,
+                                 write_shoe_block, load_shoe_block)
+from src.simulation.real_time_simulation import BlackjackSimulator
+
+class TestArrayShoe(unittest.TestCase):
+    def test_same_seed_same_cards(self):
+        first, second = ArrayShoe(seed=42), ArrayShoe(seed=42)
+        self.assertEqual([first.deal_card() for _ in range(500)], [second.deal_card() for _ in range(500)])
+        self.assertEqual(first.deal(20).tolist(), second.deal(20).tolist())
+        self.assertNotEqual(ArrayShoe(seed=43).deal(20).tolist(), ArrayShoe(seed=42).deal(20).tolist())
+
+    def test_full_shoe_composition_and_batches(self):
+        shoe = ArrayShoe(num_decks=2, cut_card=104, seed=1)
+        cards = shoe.deal(50).tolist() + [shoe.deal_card() for _ in range(54)]
+        self.assertEqual(Counter(cards), Counter(DECK_VALUES * 2))
+        self.assertEqual(shoe.cards_remaining(), 0)
+        self.assertEqual(shoe.penetration(), 1.0)
+
+    def test_cut_card_reshuffles(self):
+        shoe = ArrayShoe(num_decks=1, cut_card=40, seed=3)
+        shoe.deal(38)
+        shoe.deal(5)  # runs past the cut card, finishing the round
+        self.assertTrue(shoe.needs_shuffle())
+        shoe.deal_card()
+        self.assertEqual(shoe.cards_seen(), 1)
+        with self.assertRaises(ValueError):
+            ArrayShoe(num_decks=1, cut_card=60)
+
+    def test_infinite_deck(self):
+        shoe = ArrayShoe(infinite=True, buffer_size=100, seed=5)
+        cards = shoe.deal(250).tolist() + [shoe.deal_card() for _ in range(1000)]
+        self.assertEqual(len(cards), 1250)
+        self.assertEqual(shoe.penetration(), 0.0)
+        self.assertAlmostEqual(cards.count(10) / len(cards), 4 / 13, delta=0.05)
+
+    def test_blackjack_shoe_interface(self):
+        shoe = ArrayBlackjackShoe(num_decks=1, seed=9)
+        for _ in range(39):
+            shoe.draw_card()
+        self.assertEqual(shoe.penetration(), 75.0)
+        shoe.shuffle()
+        self.assertEqual(shoe.penetration(), 0.0)
+        self.assertEqual(len([shoe.draw_card() for _ in range(60)]), 60)
+
+    def test_seeded_simulator_is_reproducible(self):
+        runs = []
+        for _ in range(2):
+            sim = BlackjackSimulator(seed=11)
+            for _ in range(30):
+                sim.play_round()
+            runs.append((sim.bankroll, dict(sim.stats)))
+        self.assertEqual(runs[0], runs[1])
+
+class TestShoeBlocks(unittest.TestCase):
+    def test_block_rows_are_full_shoes(self):
+        block = generate_shoe_block(200, num_decks=2, seed=8)
+        self.assertEqual(block.shape, (200, 104))
+        self.assertEqual(block.dtype, np.int8)
+        for row in block[:5]:
+            self.assertEqual(Counter(row.tolist()), Counter(DECK_VALUES * 2))
+        self.assertEqual(len({row.tobytes() for row in block}), 200)
+
+    def test_streams_are_reproducible_and_distinct(self):
+        np.testing.assert_array_equal(generate_shoe_block(10, seed=8, stream=2),
+                                      generate_shoe_block(10, seed=8, stream=2))
+        self.assertFalse(np.array_equal(generate_shoe_block(10, seed=8, stream=0),
+                                        generate_shoe_block(10, seed=8, stream=1)))
+
+    def test_memory_mapped_replay(self):
+        with tempfile.TemporaryDirectory() as directory:
+            path = write_shoe_block(os.path.join(directory, "shoes.npy"), 25, num_decks=1, seed=4,
+                                    rows_per_stream=10)
+            block = load_shoe_block(path)
+            self.assertIsInstance(block, np.memmap)
+            np.testing.assert_array_equal(block[10:20], generate_shoe_block(10, num_decks=1, seed=4, stream=1))
+            dealt = []
+            for _ in range(2):
+                shoe = ArrayBlackjackShoe(shoes=block)
+                dealt.append([shoe.draw_card() for _ in range(60)])
+            self.assertEqual(dealt[0], dealt[1])
+            self.assertEqual(dealt[0][:52], block[0].tolist())
+            self.assertEqual(dealt[0][52:], block[1][:8].tolist())
+            del block
+
+    def test_exhausted_block(self):
+        shoe = ArrayShoe(shoes=generate_shoe_block(1, num_decks=1, seed=0), cut_card=52)
+        shoe.deal(52)
+        with self.assertRaises(ValueError):
+            shoe.deal_card()
+
+if __name__ == '__main__':
+    unittest.main()
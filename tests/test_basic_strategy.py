@@ -0,0 +1,55 @@
+import sys
+import os
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import random
+import unittest
+from src.ai_brain.basic_strategy import BasicStrategy, CompiledStrategy
+
+class TestCompiledStrategy(unittest.TestCase):
+    def setUp(self):
+        self.strategy = BasicStrategy()
+        self.compiled = self.strategy.compiled
+
+    def test_matches_dict_tables(self):
+        rng = random.Random(42)
+        for _ in range(20000):
+            hand = [rng.choice([1, 2, 3, 4, 5, 6, 7, 8, 9, 10, 11]) for _ in range(rng.choice([2, 2, 3, 4]))]
+            upcard = rng.randint(1, 11)
+            can_double, can_split = rng.random() < 0.5, rng.random() < 0.5
+            self.assertEqual(self.compiled.get_action(hand, upcard, can_double, can_split),
+                             self.strategy.get_action(hand, upcard, can_double, can_split),
+                             f"{hand} vs {upcard}")
+
+    def test_every_state_matches_dict_tables(self):
+        one_card_hands = [[card] for card in range(1, 12)]
+        for hand in list(CompiledStrategy.state_hands().values()) + one_card_hands:
+            for upcard in range(1, 12):
+                for flags in range(CompiledStrategy.NUM_FLAGS):
+                    can_double, can_split, can_surrender = bool(flags & 1), bool(flags & 2), bool(flags & 4)
+                    self.assertEqual(self.compiled.get_action(hand, upcard, can_double, can_split, can_surrender),
+                                     self.strategy.get_action(hand, upcard, can_double, can_split, can_surrender),
+                                     f"{hand} vs {upcard}, flags {flags}")
+
+    def test_state_lookup(self):
+        state = self.compiled.hand_state([8, 8])
+        self.assertEqual(CompiledStrategy.ACTIONS[self.compiled.action_code(state, 10)], "split")
+        self.assertEqual(CompiledStrategy.ACTIONS[self.compiled.action_code(state, 10, can_split=False)], "hit")
+        soft_18 = CompiledStrategy.SOFT_OFFSET + 18
+        self.assertEqual(self.compiled.action_code(soft_18, 6), CompiledStrategy.DOUBLE)
+        self.assertEqual(self.compiled.action_code(soft_18, 6, can_double=False), CompiledStrategy.HIT)
+
+    def test_out_of_range_upcard_raises(self):
+        state = self.compiled.hand_state([10, 6])
+        for upcard in (-1, 12, 13):
+            with self.assertRaises(ValueError):
+                self.compiled.action_code(state, upcard)
+            with self.assertRaises(ValueError):
+                self.compiled.get_action([10, 6], upcard)
+
+    def test_recompile_after_table_edit(self):
+        self.strategy.hard_strategy[16][8] = 'S'  # 16 vs 10: stand
+        self.assertEqual(self.strategy.compile().get_action([10, 6], 10), "stand")
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,66 @@
+import sys
+import os
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import io
+import tempfile
+import unittest
+from contextlib import redirect_stdout
+from src.utils.checkpoint import SnapshotWriter, load_snapshot, save_snapshot
+from src.utils.events import AggregateSink, NULL_SINK
+from src.simulation.ai_vs_ai_training import run_optimized_simulation, run_parallel_simulation, simulate_shard
+from src.simulation.real_time_simulation import BlackjackSimulator
+
+class TestCheckpoint(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.directory.name, "run.snapshot")
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def test_writer_keeps_latest_and_swaps_sinks(self):
+        with SnapshotWriter(self.path) as writer:
+            for i in range(20):
+                writer.submit({"i": i, "sink": AggregateSink()})
+        state = load_snapshot(self.path)
+        self.assertEqual(state["i"], 19)
+        self.assertIs(state["sink"], NULL_SINK)
+        sink = AggregateSink()
+        self.assertIs(load_snapshot(self.path, sink)["sink"], sink)
+        self.assertFalse(os.path.exists(self.path + ".tmp"))
+
+    def test_optimized_simulation_resumes_bit_identically(self):
+        with redirect_stdout(io.StringIO()):
+            expected = run_optimized_simulation(rounds=400, log_interval=1000, seed=5)
+            run_optimized_simulation(rounds=250, log_interval=1000, seed=5, checkpoint_path=self.path,
+                                     checkpoint_every=100)
+            # The snapshot is from round 200, so rounds 201-250 are replayed after resuming
+            resumed = run_optimized_simulation(rounds=400, log_interval=1000, checkpoint_path=self.path,
+                                               checkpoint_every=100, resume=True)
+        self.assertEqual(resumed, expected)
+
+    def test_real_time_simulator_resumes_bit_identically(self):
+        with redirect_stdout(io.StringIO()):
+            uninterrupted = BlackjackSimulator(seed=3)
+            uninterrupted.simulate(rounds=300)
+            BlackjackSimulator(seed=3).simulate(rounds=200, checkpoint_path=self.path, checkpoint_every=50)
+            resumed = BlackjackSimulator.resume(self.path)
+            resumed.simulate(rounds=300)
+        self.assertEqual((resumed.bankroll, resumed.stats, resumed.rounds_played),
+                         (uninterrupted.bankroll, uninterrupted.stats, 300))
+
+    def test_parallel_shards_are_checkpointed(self):
+        expected = run_parallel_simulation(rounds=200, rounds_per_shard=100, workers=1, seed=2)
+        shard_0 = simulate_shard(0, 100, seed=2)[1]
+        # A marked shard 0 in the checkpoint must be reused, not recomputed
+        save_snapshot(self.path, {"config": {"rounds": 200, "rounds_per_shard": 100, "seed": 2},
+                                  "results": {0: [dict(stats, wins=stats["wins"] + 1000) for stats in shard_0]}})
+        merged = run_parallel_simulation(rounds=200, rounds_per_shard=100, workers=1, seed=2,
+                                         checkpoint_path=self.path)
+        self.assertEqual([stats["wins"] for stats in merged], [stats["wins"] + 1000 for stats in expected])
+        with self.assertRaises(ValueError):
+            run_parallel_simulation(rounds=300, rounds_per_shard=100, workers=1, seed=2, checkpoint_path=self.path)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,65 @@
+import sys
+import os
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import unittest
+from src.ai_brain.composition_decision_engine import CompositionDecisionEngine
+from src.ai_brain.strategy_tables import Rules, shoe_composition, remove_card
+
+def composition_after(num_decks, *ranks):
+    composition = shoe_composition(num_decks)
+    for rank in ranks:
+        composition = remove_card(composition, rank)
+    return composition
+
+class TestCompositionDecisionEngine(unittest.TestCase):
+    def setUp(self):
+        self.engine = CompositionDecisionEngine(Rules(num_decks=6))
+
+    def test_full_shoe_matches_basic_strategy(self):
+        cases = [
+            ([10, 6], 10, "surrender"),
+            ([10, 2], 3, "hit"),
+            ([10, 2], 4, "stand"),
+            ([8, 8], 10, "split"),
+            ([6, 5], 6, "double"),
+            ([10, 7], 1, "stand"),
+        ]
+        for hand, upcard, expected in cases:
+            composition = composition_after(6, *(min(card, 10) for card in hand + [upcard]))
+            result = self.engine.make_decision(hand, upcard, composition, can_split=True)
+            self.assertEqual(result['action'], expected, f"{hand} vs {upcard}: {result['evs']}")
+
+    def test_ten_rich_shoe_stands_16_vs_10(self):
+        # Remove 60 small cards: the remaining shoe is loaded with tens
+        composition = list(composition_after(6, 10, 6, 10))
+        for rank in (2, 3, 4, 5, 6):
+            composition[rank - 1] -= 12
+        result = self.engine.make_decision([10, 6], 10, composition, can_surrender=False)
+        self.assertEqual(result['action'], "stand")
+
+    def test_results_are_memoized(self):
+        composition = composition_after(6, 10, 2, 3)
+        first = self.engine.make_decision([10, 2], 3, composition)
+        second = self.engine.make_decision([9, 3], 3, composition)
+        self.assertEqual(first['evs'], second['evs'])
+        self.assertEqual(self.engine.get_cache_stats()['hits'], 1)
+
+    def test_rejects_bad_composition(self):
+        with self.assertRaises(ValueError):
+            self.engine.make_decision([10, 6], 10, (1, 2, 3))
+
+    def test_rejects_negative_counts(self):
+        with self.assertRaises(ValueError):
+            self.engine.make_decision([10, 6], 10, (-5,) + composition_after(6, 10, 6, 10)[1:])
+
+    def test_rejects_exhausted_composition(self):
+        with self.assertRaises(ValueError):
+            self.engine.make_decision([10, 6], 10, (0,) * 10)
+        with self.assertRaises(ValueError):
+            self.engine.make_decision([10, 6], 10, (0,) * 9 + (1,))
+        with self.assertRaises(ValueError):  # Only an ace could go under a ten: nothing but blackjack is left
+            self.engine.make_decision([10, 6], 10, (4,) + (0,) * 9)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,37 @@
+import sys
+import os
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import unittest
+import numpy as np
+from src.ai_brain.composition_tracker import CompositionTracker
+from src.ai_brain.EnhancedCardCounter import EnhancedCardCounter
+
+class TestCompositionTracker(unittest.TestCase):
+    def test_remove_and_snapshot(self):
+        tracker = CompositionTracker(num_decks=1)
+        first = tracker.snapshot()
+        self.assertIs(tracker.snapshot(), first)
+        tracker.remove([11, 1, 10, 13, 5])
+        tracker.remove(np.array([5, 2], dtype=np.int16))
+        self.assertEqual(tracker.snapshot(), (2, 3, 4, 4, 2, 4, 4, 4, 4, 14))
+        self.assertEqual(tracker.cards_remaining, 45)
+        self.assertEqual(tracker.decks_remaining, 45 / 52)
+        self.assertAlmostEqual(tracker.ace_surplus(), 2 - 45 * 4 / 52)
+
+    def test_over_depletion_leaves_shoe_unchanged(self):
+        tracker = CompositionTracker(num_decks=1)
+        with self.assertRaises(ValueError):
+            tracker.remove([2, 11, 11, 11, 11, 1])
+        self.assertEqual(tracker.cards_remaining, 52)
+
+    def test_counter_betting_uses_ace_side_count(self):
+        ace_poor = [11, 11, 11, 11, 8, 8, 9, 9]  # Hi-Opt II ignores aces, so its running count stays 0
+        counter = EnhancedCardCounter(num_decks=1, system="hi-opt-ii")
+        counter.update_count(ace_poor)
+        self.assertEqual(counter.running_count, 0)
+        self.assertEqual(counter.aces_seen, 4)
+        self.assertLess(counter.get_ace_adjusted_true_count(), 0)
+
+if __name__ == '__main__':
+    unittest.main()
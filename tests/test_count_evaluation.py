@@ -0,0 +1,55 @@
+import sys
+import os
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import json
+import tempfile
+import unittest
+from src.ai_brain.rules import Rules
+from src.simulation.count_evaluation import (betting_correlation, insurance_correlation, decision_models,
+                                             evaluate_counting_system, playing_efficiency)
+
+# Single-deck effects of removal in percent (Griffin), Ace first
+PUBLISHED_EOR = [-0.61, 0.38, 0.44, 0.55, 0.69, 0.46, 0.28, 0.00, -0.18, -0.51]
+
+class TestCountEvaluation(unittest.TestCase):
+    def test_analytic_correlations(self):
+        self.assertAlmostEqual(betting_correlation("hi-lo", PUBLISHED_EOR), 0.97, places=2)
+        self.assertAlmostEqual(insurance_correlation("hi-lo"), 0.76, places=2)
+        self.assertAlmostEqual(insurance_correlation("hi-opt-ii"), 0.91, places=2)
+        self.assertGreater(betting_correlation("wong-halves", PUBLISHED_EOR),
+                           betting_correlation("hi-opt-ii", PUBLISHED_EOR))
+
+    def test_playing_efficiency_of_sixteen_vs_ten(self):
+        models = decision_models(Rules(), situations=[((10, 6), 10, ("hit", "stand"))])
+        self.assertEqual(len(models), 1)
+        self.assertLess(models[0]["gain"], 0)  # hitting is right off the top
+        self.assertLess(models[0]["eor"][9], 0)  # fewer tens make standing worse
+        efficiency, per_situation = playing_efficiency("hi-lo", models, num_decks=6, samples=4000,
+                                                       chunks=2, workers=1)
+        self.assertAlmostEqual(per_situation[0], efficiency)
+        self.assertGreater(efficiency, 0.3)
+        self.assertLessEqual(efficiency, 1.0)
+
+    def test_results_do_not_depend_on_workers(self):
+        models = decision_models(Rules(), situations=[((10, 6), 10, ("hit", "stand"))])
+        serial = playing_efficiency("hi-lo", models, num_decks=6, samples=3200, workers=1)
+        parallel = playing_efficiency("hi-lo", models, num_decks=6, samples=3200, workers=2)
+        self.assertEqual(serial, parallel)
+
+    def test_cache_is_keyed_on_penetration(self):
+        rules = Rules()
+        models = decision_models(rules, situations=[((10, 6), 10, ("hit", "stand"))])
+        with tempfile.TemporaryDirectory() as directory:
+            # Pre-seed the rule set's EoR cache so only the PE simulation runs
+            with open(os.path.join(directory, f"eor_{rules.key()}.json"), "w") as f:
+                json.dump({"eor": {"base_ev": 0.0, "eor": PUBLISHED_EOR}, "models": models}, f)
+            kwargs = dict(rules=rules, samples=3200, workers=1, directory=directory)
+            deep = evaluate_counting_system("hi-lo", penetration=0.75, **kwargs)
+            shallow = evaluate_counting_system("hi-lo", penetration=0.5, **kwargs)
+            self.assertEqual(shallow["penetration"], 0.5)
+            self.assertNotEqual(deep["playing_efficiency"], shallow["playing_efficiency"])
+            self.assertEqual(evaluate_counting_system("hi-lo", penetration=0.75, **kwargs), deep)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,57 @@
+import sys
+import os
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import random
+import unittest
+import numpy as np
+from src.ai_brain.counting_systems import COUNTING_SYSTEMS, CountingSystem, get_counting_system
+from src.ai_brain.card_counter import CardCounter
+from src.ai_brain.EnhancedCardCounter import EnhancedCardCounter
+
+ONE_DECK = [2, 3, 4, 5, 6, 7, 8, 9, 10, 10, 10, 10, 11] * 4
+
+class TestCountingSystems(unittest.TestCase):
+    def test_full_deck_totals(self):
+        for name, system in COUNTING_SYSTEMS.items():
+            delta, counted = system.count(ONE_DECK)
+            self.assertEqual(counted, 52)
+            self.assertEqual(delta, system.deck_imbalance, name)
+            self.assertEqual(system.balanced, name != "ko", name)
+        self.assertEqual(get_counting_system("ko").initial_running_count(6), -20)
+
+    def test_vectorized_matches_list_update(self):
+        rng = random.Random(7)
+        cards = [rng.choice([1, 2, 3, 4, 5, 6, 7, 8, 9, 10, 11, 12, 13]) for _ in range(5000)]
+        for system in COUNTING_SYSTEMS.values():
+            expected = sum(system.tag(card) for card in cards)
+            self.assertEqual(system.count(np.array(cards, dtype=np.int8)), (expected, 5000))
+            self.assertEqual(system.count(cards), (expected, 5000))
+            # The cached tag array is not part of the system's value
+            self.assertEqual(system, CountingSystem(system.name, system.tags, system.ace_neutral))
+
+    def test_ace_encodings_agree(self):
+        counters = [CardCounter(num_decks=6), EnhancedCardCounter(num_decks=6)]
+        for counter in counters:
+            counter.update_count([1, 11, 12, 13, 5])
+        self.assertEqual([counter.running_count for counter in counters], [-3, -3])
+        self.assertEqual(counters[1].aces_seen, 2)
+        self.assertEqual(counters[1].tens_seen, 2)
+
+    def test_unbalanced_true_count_removes_drift(self):
+        counter = CardCounter(num_decks=2, system="ko")
+        counter.update_count(ONE_DECK)  # a neutral deck leaves KO at its pivot drift
+        self.assertEqual(counter.running_count, 0)
+        self.assertEqual(counter.get_true_count(), 0)
+
+    def test_rejects_unknown_cards_and_systems(self):
+        counter = EnhancedCardCounter(num_decks=6)
+        for bad in ([0], [14], ["A"], np.array([3, 99])):
+            with self.assertRaises(ValueError):
+                counter.update_count(bad)
+        self.assertEqual(counter.cards_seen, 0)
+        with self.assertRaises(ValueError):
+            CardCounter(system="red-seven")
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,98 @@
+import sys
+import os
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import shutil
+import tempfile
+import unittest
+import numpy as np
+from src.utils.data_loader import HandStore, HandStoreWriter, NO_ACTION, action_code
+from src.utils.checkpoint import load_snapshot, save_snapshot
+from src.simulation.vectorized_engine import VectorizedBlackjackEngine
+from src.simulation.ai_vs_ai_training import OptimizedSimulation
+
+class TestHandStore(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.path = os.path.join(self.directory, "hands")
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    def write(self, count, chunk_rows=4):
+        with HandStoreWriter(self.path, chunk_rows=chunk_rows) as writer:
+            for i in range(count):
+                writer.append(i, i % 3, [10, i % 10 + 2], 6, i / 10, "hit" if i % 2 else None, 1.0, i - 5)
+
+    def test_records_read_back_across_chunks(self):
+        self.write(10)
+        store = HandStore(self.path)
+        self.assertEqual(len(store), 10)
+        self.assertEqual(store.chunk_count, 3)
+        rounds = store.column("round")
+        self.assertIsInstance(store.chunk(0)["round"], np.memmap)
+        self.assertEqual(rounds[9], 9)
+        self.assertEqual(rounds[-1], 9)
+        self.assertEqual(list(rounds[3:9]), [3, 4, 5, 6, 7, 8])
+        self.assertEqual(list(store.column("cards")[7][:3]), [10, 9, 0])
+        self.assertEqual(store.column("action")[0], NO_ACTION)
+        self.assertEqual(store.column("action")[1], action_code("hit"))
+        with self.assertRaises(IndexError):
+            rounds[10]
+
+    def test_summary_streams_over_chunks(self):
+        self.write(10)
+        summary = HandStore(self.path).summary()
+        self.assertEqual(summary["hands"], 10)
+        self.assertEqual(summary["net"], sum(i - 5 for i in range(10)))
+        self.assertEqual(summary["actions"], {"hit": 5, "none": 5})
+
+    def test_existing_store_needs_append(self):
+        self.write(2)
+        with self.assertRaises(ValueError):
+            HandStoreWriter(self.path)
+        with HandStoreWriter(self.path, append=True) as writer:
+            writer.append(2, 0, [11, 10], 10, 0.0, "stand", 1.0, 1.5)
+        self.assertEqual(list(HandStore(self.path).column("round")[:]), [0, 1, 2])
+
+    def test_snapshot_rolls_back_records(self):
+        writer = HandStoreWriter(self.path, chunk_rows=4)
+        writer.append(0, 0, [10, 7], 6, 0.0, "stand", 1.0, 1.0)
+        writer.flush()
+        snapshot = os.path.join(self.directory, "snapshot")
+        save_snapshot(snapshot, {"records": writer})
+        for i in range(5):
+            writer.append(i + 1, 0, [10, 7], 6, 0.0, "stand", 1.0, 1.0)
+        writer.flush()
+
+        resumed = HandStoreWriter(self.path, append=True)
+        self.assertIs(load_snapshot(snapshot, records=resumed)["records"], resumed)
+        self.assertEqual(len(HandStore(self.path)), 1)
+        self.assertEqual(len(os.listdir(self.path)), 1 + 8)  # manifest and one chunk's columns
+
+    def test_engine_records_sum_to_net(self):
+        with HandStoreWriter(self.path, chunk_rows=1000) as writer:
+            engine = VectorizedBlackjackEngine(num_tables=500, seed=3, records=writer, bet_ramp={2: 4})
+            engine.run(5)
+        store = HandStore(self.path)
+        summary = store.summary()
+        self.assertEqual(summary["hands"], engine.stats["hands"])
+        self.assertAlmostEqual(summary["net"], engine.stats["net"], places=3)
+        self.assertAlmostEqual(summary["total_bet"], engine.stats["wagered"], places=3)
+        self.assertEqual(list(np.unique(store.column("round")[:])), [0, 1, 2, 3, 4])
+        self.assertTrue((store.column("cards")[:][:, :2] > 0).all())
+
+    def test_bot_simulation_records_hands(self):
+        with HandStoreWriter(self.path) as writer:
+            simulation = OptimizedSimulation(seed=2, records=writer)
+            for _ in range(20):
+                simulation.play_round()
+        store = HandStore(self.path)
+        hands = sum(ai.hands_played for ai in simulation.all_ais)
+        self.assertEqual(len(store), hands)
+        self.assertEqual(set(store.column("seat")[:]), {0, 1, 2, 3})
+        final = sum(ai.bankroll_manager.current_bankroll for ai in simulation.all_ais)
+        self.assertAlmostEqual(4000 + HandStore(self.path).summary()["net"], final, places=1)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,34 @@
+import sys
+import os
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import unittest
+from src.ai_brain.dealer_probabilities import (BLACKJACK, BUST, dealer_distribution, dealer_distribution_table,
+                                               remove_card, shoe_composition)
+
+class TestDealerProbabilities(unittest.TestCase):
+    def test_infinite_deck_bust_rates(self):
+        # Published infinite-deck S17 figures
+        self.assertAlmostEqual(dealer_distribution(6)[BUST], 0.4232, places=4)
+        self.assertAlmostEqual(dealer_distribution(2)[BUST], 0.3536, places=4)
+        self.assertAlmostEqual(dealer_distribution(1)[BLACKJACK], 4 / 13, places=6)
+
+    def test_h17_busts_more_with_six_up(self):
+        self.assertGreater(dealer_distribution(6, hits_soft_17=True)[BUST], dealer_distribution(6)[BUST])
+
+    def test_composition_and_conditioning(self):
+        composition = remove_card(shoe_composition(1), 10)
+        outcome = dealer_distribution(10, composition, no_blackjack=True)
+        self.assertAlmostEqual(sum(outcome), 1.0)
+        self.assertEqual(outcome[BLACKJACK], 0.0)
+        self.assertAlmostEqual(dealer_distribution(10, composition)[BLACKJACK], 4 / 51)
+
+    def test_batch_table(self):
+        table = dealer_distribution_table(shoe_composition(6))
+        self.assertEqual(table.shape, (10, 7))
+        for row in table.sum(axis=1):
+            self.assertAlmostEqual(row, 1.0)
+        self.assertEqual(tuple(table[4]), dealer_distribution(6, remove_card(shoe_composition(6), 6)))
+
+if __name__ == '__main__':
+    unittest.main()
@@ -93,5 +93,31 @@ class TestDecisionEngine(unittest.TestCase):
         self.assertTrue(result.get('deviation', False), "Should deviate from basic strategy")
         self.assertEqual(result['action'], "hit", "Should hit 11 vs Ace with positive count")
 
+    def test_decision_cache_hits(self):
+        self.counter.running_count = 12
+        first = self.engine.make_decision([10, 2], 3)
+        second = self.engine.make_decision([9, 3], 3)  # Same canonical state: hard 12 vs 3
+        self.assertEqual(first, second)
+        stats = self.engine.get_cache_stats()
+        self.assertEqual(stats['hits'], 1)
+        self.assertEqual(stats['misses'], 1)
+
+    def test_decision_cache_matches_uncached_engine(self):
+        uncached = EnhancedCountingDecisionEngine(self.strategy, self.counter, cache_size=0)
+        for running_count in [-30, -7, 0, 5, 6, 12, 13, 24, 40]:
+            self.counter.running_count = running_count
+            for hand in [[10, 6], [10, 5], [10, 2], [6, 5], [11, 7], [8, 8], [5, 4]]:
+                for upcard in [1, 2, 3, 6, 9, 10]:
+                    self.assertEqual(self.engine.make_decision(hand, upcard),
+                                     uncached.make_decision(hand, upcard))
+
+    def test_decision_cache_invalidation(self):
+        self.counter.running_count = 0
+        self.assertEqual(self.engine.make_decision([10, 3], 2)['action'], "stand")
+        self.engine.deviations[(13, 2)] = {-1: "hit"}
+        self.engine.invalidate_cache()
+        self.assertEqual(self.engine.make_decision([10, 3], 2)['action'], "hit")
+        self.assertEqual(self.engine.get_cache_stats()['size'], 1)
+
 if __name__ == '__main__':
     unittest.main()
\ No newline at end of file
@@ -0,0 +1,105 @@
+import sys
+import os
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import json
+import tempfile
+import unittest
+from src.simulation.deviation_indices import derive_index, generate_deviation_indices, save_index_table
+from src.ai_brain.EnhancedCardCounter import EnhancedCardCounter
+from src.ai_brain.enhanced_counting_decision_engine import EnhancedCountingDecisionEngine
+from src.ai_brain.basic_strategy import BasicStrategy
+from src.ai_brain.card_counter import CardCounter
+
+SIXTEEN_VS_TEN = [((10, 6), 10, ("hit", "stand"))]
+
+def entry(hand, total, upcard, basic, deviation, index, direction, is_soft=False):
+    return {"hand": hand, "player_total": total, "is_soft": is_soft, "dealer_upcard": upcard,
+            "basic_action": basic, "deviation_action": deviation, "index": index, "direction": direction}
+
+class TestDeviationIndices(unittest.TestCase):
+    def test_derive_index(self):
+        rising = {-2: [1000, -80.0, 0], -1: [1000, -30.0, 0], 0: [1000, 10.0, 0], 1: [1000, 50.0, 0],
+                  2: [10, -5.0, 0]}  # too few samples to count
+        self.assertEqual(derive_index(rising), (0, "above"))
+        falling = {-2: [1000, 40.0, 0], -1: [1000, 5.0, 0], 0: [1000, -20.0, 0]}
+        self.assertEqual(derive_index(falling), (-1, "below"))
+        self.assertEqual(derive_index({0: [1000, -1.0, 0]}), (None, None))
+
+    def test_resume_matches_uninterrupted_run(self):
+        options = dict(situations=SIXTEEN_VS_TEN, shoes=6, shoes_per_chunk=2, workers=1, min_samples=1)
+        expected = generate_deviation_indices(**options)
+
+        def interrupt(done, total):
+            if done == 2:
+                raise KeyboardInterrupt
+
+        with tempfile.TemporaryDirectory() as directory:
+            checkpoint = os.path.join(directory, "indices.checkpoint")
+            with self.assertRaises(KeyboardInterrupt):
+                generate_deviation_indices(checkpoint_path=checkpoint, progress=interrupt, **options)
+            with open(checkpoint) as f:
+                self.assertEqual(len(json.load(f)["completed_chunks"]), 2)
+            resumed = generate_deviation_indices(checkpoint_path=checkpoint, **options)
+        self.assertEqual(resumed, expected)
+        self.assertEqual(resumed["indices"][0]["basic_action"], "hit")
+        self.assertGreater(resumed["indices"][0]["samples"], 0)
+
+    def test_engines_load_table(self):
+        table = {"indices": [
+            entry([10, 6], 16, 10, "hit", "surrender", 0, "above"),
+            entry([10, 6], 16, 10, "hit", "stand", 4, "above"),
+            entry([10, 3], 13, 2, "stand", "hit", -2, "below"),
+            entry([5, 4], 9, 7, "hit", "double", None, None),
+        ]}
+        with tempfile.TemporaryDirectory() as directory:
+            path = save_index_table(table, os.path.join(directory, "indices.json"))
+            counter = EnhancedCardCounter(num_decks=6)
+            engine = EnhancedCountingDecisionEngine(BasicStrategy(), counter)
+            engine.load_deviations(path)
+            simple_counter = CardCounter(num_decks=6)
+            simple_counter.load_strategy_deviations(path)
+
+        for running_count, action in [(-18, "hit"), (-12, "hit"), (-6, "stand"), (0, "stand")]:
+            counter.running_count = running_count
+            self.assertEqual(engine.make_decision([10, 3], 2)['action'], action)
+        counter.running_count = 6
+        self.assertEqual(engine.make_decision([10, 6], 10)['action'], "surrender")
+        counter.running_count = 24
+        self.assertEqual(engine.make_decision([10, 6], 10)['action'], "stand")
+        self.assertNotIn((9, 7), engine.deviations)
+        self.assertEqual(simple_counter.strategy_deviations, {(16, 10, False): (4, "stand")})
+
+    def load(self, indices):
+        with tempfile.TemporaryDirectory() as directory:
+            path = save_index_table({"indices": indices}, os.path.join(directory, "indices.json"))
+            counter = EnhancedCardCounter(num_decks=6)
+            engine = EnhancedCountingDecisionEngine(BasicStrategy(), counter)
+            engine.load_deviations(path)
+        return engine, counter
+
+    def test_loaded_deviations_keep_hand_type(self):
+        engine, counter = self.load([
+            entry([10, 8], 18, 9, "stand", "hit", -3, "below"),
+            entry([11, 7], 18, 9, "hit", "stand", 1, "above", is_soft=True),
+            entry([10, 10], 20, 6, "stand", "split", 4, "above"),
+        ])
+        self.assertEqual(engine.deviations[(18, 9, "hard")], {-6: "hit", -2: "stand"})
+        self.assertEqual(engine.deviations[(18, 9, "soft")], {1: "stand"})
+        counter.running_count = 12  # TC 2
+        self.assertEqual(engine.make_decision([11, 7], 9)['action'], "stand")
+        self.assertEqual(engine.make_decision([10, 8], 9)['action'], "stand")
+        counter.running_count = 30  # TC 5
+        self.assertEqual(engine.make_decision([10, 10], 6, can_split=True)['action'], "split")
+        self.assertEqual(engine.make_decision([10, 10], 6, can_split=False)['action'], "stand")
+
+    def test_conflicting_entries_are_rejected(self):
+        with self.assertRaises(ValueError):
+            self.load([entry([10, 3], 13, 2, "stand", "hit", -2, "below"),
+                       entry([10, 3], 13, 2, "stand", "double", 5, "above")])
+        with self.assertRaises(ValueError):
+            self.load([entry([10, 6], 16, 10, "hit", "stand", 4, "above"),
+                       entry([9, 7], 16, 10, "hit", "surrender", 4, "above")])
+
+if __name__ == '__main__':
+    unittest.main()
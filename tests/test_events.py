@@ -0,0 +1,72 @@
+import sys
+import os
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import io
+import tempfile
+import unittest
+from contextlib import redirect_stdout
+from src.utils.events import (AggregateSink, BinaryLogSink, ConsoleSink, SampledSink,
+                              make_event_sink, read_event_log)
+from src.simulation.shoe import Shoe
+from src.simulation.real_time_simulation import BlackjackSimulator
+
+class TestEventSinks(unittest.TestCase):
+    def test_aggregate_counts_and_sums(self):
+        sink = AggregateSink()
+        for bet in (10, 20, 30):
+            sink.emit("hand", bet=bet, result="win")
+        sink.emit("reshuffle", cards_dealt=234)
+        summary = sink.summary()
+        self.assertEqual(summary["hand"], {"count": 3, "sums": {"bet": 60}})
+        self.assertEqual(summary["reshuffle"]["count"], 1)
+
+    def test_sampled_forwards_every_nth_per_event(self):
+        inner = AggregateSink()
+        sink = SampledSink(inner, every=10)
+        for i in range(25):
+            sink.emit("hand", i=i)
+        sink.emit("reshuffle")
+        self.assertEqual(inner.counts, {"hand": 3, "reshuffle": 1})
+        self.assertEqual(inner.sums["hand"]["i"], 0 + 10 + 20)
+
+    def test_binary_log_round_trip(self):
+        events = [("hand", {"bot": "OptimalAI", "player_hand": [10, 11], "bet": 12.5, "result": "win",
+                            "risk_reduced": False, "hole": None}),
+                  ("hand", {"bot": "OptimalAI", "player_hand": [], "bet": -3, "result": "loss",
+                            "risk_reduced": True, "hole": None}),
+                  ("reshuffle", {})]
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "events.bin")
+            with BinaryLogSink(path) as sink:
+                for name, fields in events:
+                    sink.emit(name, **fields)
+            self.assertEqual(list(read_event_log(path)), events)
+
+    def test_default_sinks_are_silent(self):
+        shoe = Shoe(num_decks=1, penetration_threshold=0.5)
+        sim = BlackjackSimulator()
+        with redirect_stdout(io.StringIO()) as out:
+            for _ in range(60):
+                shoe.deal_card()
+            sim.play_round()
+        self.assertEqual(out.getvalue(), "")
+
+    def test_console_sink_keeps_round_output(self):
+        out = io.StringIO()
+        shoe = Shoe(num_decks=1, penetration_threshold=0.5, events=ConsoleSink(stream=out))
+        for _ in range(30):
+            shoe.deal_card()
+        self.assertIn("Reshuffling shoe", out.getvalue())
+        sim = BlackjackSimulator(events=ConsoleSink(stream=out))
+        sim.play_round()
+        self.assertIn("===== NEW ROUND =====", out.getvalue())
+
+    def test_unknown_mode(self):
+        with self.assertRaises(ValueError):
+            make_event_sink("syslog")
+        with self.assertRaises(ValueError):
+            make_event_sink("binary")
+
+if __name__ == '__main__':
+    unittest.main()
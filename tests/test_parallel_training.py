@@ -0,0 +1,37 @@
+import sys
+import os
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import unittest
+from src.simulation.ai_vs_ai_training import (OptimizedSimulation, merge_bot_stats, run_parallel_simulation,
+                                              simulate_shard)
+
+class TestParallelTraining(unittest.TestCase):
+    def test_same_seed_any_worker_count(self):
+        serial = run_parallel_simulation(rounds=250, rounds_per_shard=100, workers=1, seed=7)
+        pooled = run_parallel_simulation(rounds=250, rounds_per_shard=100, workers=2, seed=7)
+        self.assertEqual(serial, pooled)
+        self.assertEqual([stats["hands_played"] for stats in serial], [250] * 4)
+        self.assertEqual(serial[0]["shards"], 3)
+        self.assertNotEqual(serial, run_parallel_simulation(rounds=250, rounds_per_shard=100, workers=1, seed=8))
+
+    def test_merge_matches_shards(self):
+        shards = [simulate_shard(shard, 100, seed=3)[1] for shard in range(2)]
+        merged = merge_bot_stats([shards[0][1], shards[1][1]])
+        self.assertEqual(merged["name"], "OptimalAI")
+        self.assertEqual(merged["wins"], shards[0][1]["wins"] + shards[1][1]["wins"])
+        self.assertEqual(merged["initial_bankroll"], 2000)
+        self.assertAlmostEqual(merged["roi_percentage"], merged["profit_loss"] / 20)
+        self.assertEqual(set(merged) - {"shards"}, set(shards[0][1]))
+
+    def test_seeded_session_repeats(self):
+        runs = []
+        for _ in range(2):
+            simulation = OptimizedSimulation(seed=11)
+            for _ in range(200):
+                simulation.play_round()
+            runs.append(simulation.get_comprehensive_stats())
+        self.assertEqual(runs[0], runs[1])
+
+if __name__ == '__main__':
+    unittest.main()
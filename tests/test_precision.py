@@ -0,0 +1,87 @@
+import sys
+import os
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import unittest
+import numpy as np
+from src.utils.precision import PrecisionTarget, ResultStats, confidence_interval
+from src.simulation.vectorized_engine import VectorizedBlackjackEngine
+from src.simulation.ai_vs_ai_training import run_optimized_simulation, run_parallel_simulation
+from src.simulation.performance_analysis import AIPerformanceMetrics, PerformanceAnalyzer
+
+class TestResultStats(unittest.TestCase):
+    def setUp(self):
+        rng = np.random.default_rng(5)
+        self.bets = rng.choice([1.0, 2.0, 8.0], size=2000)
+        self.results = self.bets * rng.choice([-1.0, 0.0, 1.0, 1.5], size=2000)
+
+    def test_matches_direct_estimates(self):
+        stats = ResultStats()
+        for result, bet in zip(self.results, self.bets):
+            stats.add(result, bet)
+        n = len(self.results)
+        self.assertAlmostEqual(stats.ev, self.results.mean())
+        self.assertAlmostEqual(stats.ev_standard_error, self.results.std(ddof=1) / n ** 0.5)
+        ratio = self.results.sum() / self.bets.sum()
+        self.assertAlmostEqual(stats.roi, ratio)
+        residual = self.results - ratio * self.bets
+        self.assertAlmostEqual(stats.roi_standard_error, residual.std(ddof=1) / n ** 0.5 / self.bets.mean())
+
+    def test_batches_and_merges_agree(self):
+        single = ResultStats()
+        for result, bet in zip(self.results, self.bets):
+            single.add(result, bet)
+        halves = [ResultStats(), ResultStats()]
+        halves[0].add_array(self.results[:700], self.bets[:700])
+        halves[1].add_array(self.results[700:], self.bets[700:])
+        merged = ResultStats.from_dict(halves[0].to_dict()).merge(halves[1])
+        for key, value in single.to_dict().items():
+            self.assertAlmostEqual(getattr(merged, key), value, places=6)
+
+    def test_target(self):
+        with self.assertRaises(ValueError):
+            PrecisionTarget()
+        target = PrecisionTarget(ev_se=0.1, roi_se=0.05, min_samples=10)
+        self.assertFalse(target.reached(5, 0.01, 0.01))
+        self.assertFalse(target.reached(50, 0.01, 0.06))
+        self.assertTrue(target.reached(50, 0.1, 0.05))
+        self.assertFalse(target.reached_by(ResultStats()))
+        low, high = confidence_interval(1.0, 0.5)
+        self.assertAlmostEqual(high - low, 2 * 1.959964 * 0.5, places=5)
+
+class TestPrecisionTargetedRuns(unittest.TestCase):
+    def test_engine_stops_at_target(self):
+        engine = VectorizedBlackjackEngine(num_tables=1000, seed=2)
+        summary = engine.run(1000, target=PrecisionTarget(ev_se=0.02))
+        self.assertTrue(summary["target_reached"])
+        self.assertLessEqual(summary["standard_error"], 0.0201)
+        self.assertLess(summary["rounds"], 10000)
+        low, high = summary["ev_interval"]
+        self.assertLess(low, summary["ev_per_round"])
+        self.assertGreater(high, summary["ev_per_round"])
+        self.assertAlmostEqual(summary["roi"], summary["net"] / summary["wagered"])
+
+    def test_bot_comparison_stops_at_target(self):
+        stats = run_optimized_simulation(rounds=50000, log_interval=100000, seed=3,
+                                         target=PrecisionTarget(roi_se=0.05, min_samples=100))
+        hands = stats[0]["hands_played"]
+        self.assertLess(hands, 50000)
+        for bot in stats:
+            if bot["current_bankroll"] > 0:
+                self.assertLessEqual(bot["bet_roi_standard_error"], 0.05)
+        metrics = AIPerformanceMetrics.from_bot_stats(stats[0])
+        self.assertIsNotNone(metrics.roi_interval())
+        analyzer = PerformanceAnalyzer()
+        for bot in stats:
+            analyzer.add_result(AIPerformanceMetrics.from_bot_stats(bot))
+        self.assertEqual(len(analyzer.analyze_results()["significance"]), 3)
+
+    def test_parallel_stop_is_independent_of_workers(self):
+        target = PrecisionTarget(roi_se=0.04, min_samples=100)
+        serial = run_parallel_simulation(rounds=20000, rounds_per_shard=200, workers=1, seed=4, target=target)
+        pooled = run_parallel_simulation(rounds=20000, rounds_per_shard=200, workers=2, seed=4, target=target)
+        self.assertEqual(serial, pooled)
+        self.assertLess(serial[0]["shards"], 100)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,65 @@
+import sys
+import os
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import unittest
+from statistics import NormalDist
+import numpy as np
+from src.ai_brain.optimized_bankroll_manager import OptimizedBankrollManager
+from src.simulation.risk_of_ruin import (bet_multipliers, bet_sizes, diffusion_ror, profile_report, risk_of_ruin,
+                                         sample_hands, simulate_ruin)
+
+class TestRiskOfRuin(unittest.TestCase):
+    def test_vectorized_bets_match_the_managers(self):
+        rng = np.random.default_rng(1)
+        bankrolls = rng.uniform(10, 200000, size=300)
+        true_counts = np.round(rng.uniform(-6, 8, size=300), 1)
+        manager = OptimizedBankrollManager(base_unit_percentage=2.0, risk_level="aggressive")
+        for method, scalar in (("kelly", manager.calculate_kelly_bet_size),
+                               ("true_count_kelly", manager.calculate_true_count_kelly_bet)):
+            bets = bet_sizes(manager, bankrolls, bet_multipliers(manager, true_counts, method), method)
+            for bankroll, true_count, bet in zip(bankrolls, true_counts, bets):
+                manager.current_bankroll = bankroll
+                self.assertAlmostEqual(bet, scalar(true_count), delta=0.0101)
+
+    def test_paths_follow_the_scalar_bankroll(self):
+        manager = OptimizedBankrollManager(initial_bankroll=100)
+        always_lose = {"true_count": np.zeros(10, dtype=np.float32), "result": -np.ones(10)}
+        run = simulate_ruin(manager, always_lose, hands=100, paths=3)
+        bankroll, hands = 100.0, 0
+        while bankroll >= 10:
+            manager.current_bankroll = bankroll
+            bankroll -= manager.calculate_kelly_bet_size(0.0)
+            hands += 1
+        self.assertEqual(list(run["ruined_on"]), [hands] * 3)
+        np.testing.assert_allclose(run["final_bankroll"], bankroll)
+
+    def test_diffusion_formulas(self):
+        self.assertAlmostEqual(diffusion_ror(0.01, 1.0, 100), np.exp(-2))
+        self.assertEqual(diffusion_ror(-0.01, 1.0, 100), 1.0)
+        # No drift: reflection principle, twice the chance of ending below ruin
+        self.assertAlmostEqual(diffusion_ror(0.0, 1.0, 10, hands=100), 2 * NormalDist().cdf(-1.0))
+        self.assertLess(diffusion_ror(0.01, 1.0, 100, hands=1000), diffusion_ror(0.01, 1.0, 100))
+        self.assertEqual(diffusion_ror(-1.0, 10.0, 100000, hands=100), 0.0)
+
+    def test_monte_carlo_agrees_with_diffusion_for_flat_bets(self):
+        sample = sample_hands(40000, policy="basic", num_tables=2000, seed=2)
+        manager = OptimizedBankrollManager(initial_bankroll=150)  # Every bet is the $5 table minimum
+        row = risk_of_ruin(manager, sample, hands=1000, paths=4000, seed=3)
+        self.assertGreater(row["ror_monte_carlo"], 0.2)
+        self.assertLess(abs(row["ror_monte_carlo"] - row["ror_trip"]), 0.05)
+        if row["ev_per_hand"] > 0:
+            self.assertAlmostEqual(row["n0"], (row["std_per_hand"] / row["ev_per_hand"]) ** 2)
+        else:
+            self.assertEqual(row["n0"], float("inf"))
+        self.assertLessEqual(row["trip_loss"][50], row["trip_loss"][99])
+
+    def test_report_covers_every_profile(self):
+        sample = sample_hands(10000, policy="basic", num_tables=1000)
+        report = profile_report(bankroll=500, hands=50, paths=200, sample=sample)
+        profiles = OptimizedBankrollManager().risk_profiles
+        self.assertEqual([(row["risk_level"], row["method"]) for row in report],
+                         [(profile, method) for profile in profiles for method in ("kelly", "true_count_kelly")])
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,62 @@
+import sys
+import os
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import tempfile
+import unittest
+from src.ai_brain.strategy_tables import (Rules, generate_strategy_tables, load_strategy_tables,
+                                          table_path, UPCARD_COLUMNS)
+
+def cell(tables, table, key, upcard):
+    return tables[table][key][UPCARD_COLUMNS.index(upcard)]
+
+class TestStrategyTables(unittest.TestCase):
+    def test_six_deck_s17_chart(self):
+        tables = generate_strategy_tables(Rules(num_decks=6))
+        self.assertEqual(cell(tables, "hard", 12, 2), 'H')
+        self.assertEqual(cell(tables, "hard", 12, 4), 'S')
+        self.assertEqual(cell(tables, "hard", 11, 1), 'H')
+        self.assertEqual(cell(tables, "hard", 16, 10), 'Rh')
+        self.assertEqual(cell(tables, "soft", 18, 3), 'Ds')
+        self.assertEqual(cell(tables, "pairs", "9,9", 7), 'S')
+        self.assertEqual(cell(tables, "pairs", "8,8", 10), 'P')
+
+    def test_single_deck_h17_chart(self):
+        # Published single-deck H17 DAS chart (no surrender); these cells need the player's cards removed
+        tables = generate_strategy_tables(Rules(num_decks=1, dealer_hits_soft_17=True, late_surrender=False))
+        self.assertEqual(cell(tables, "hard", 9, 2), 'D')
+        self.assertEqual(cell(tables, "hard", 8, 5), 'D')
+        self.assertEqual(cell(tables, "hard", 8, 6), 'D')
+        self.assertEqual(cell(tables, "hard", 8, 4), 'H')
+        self.assertEqual(cell(tables, "soft", 17, 2), 'D')
+        self.assertEqual(cell(tables, "soft", 13, 4), 'D')
+        self.assertEqual(cell(tables, "pairs", "3,3", 8), 'P')
+        self.assertEqual(cell(tables, "pairs", "4,4", 4), 'P')
+        self.assertEqual(cell(tables, "pairs", "6,6", 7), 'P')
+        self.assertEqual(cell(tables, "pairs", "7,7", 8), 'P')
+        self.assertEqual(cell(tables, "pairs", "7,7", 10), 'S')
+
+    def test_rules_change_strategy(self):
+        s17 = generate_strategy_tables(Rules(num_decks=2))
+        h17 = generate_strategy_tables(Rules(num_decks=2, dealer_hits_soft_17=True))
+        self.assertEqual(cell(h17, "hard", 11, 1), 'D')
+        self.assertEqual(cell(h17, "hard", 17, 1), 'Rs')
+        self.assertEqual(cell(s17, "hard", 17, 1), 'S')
+
+        no_das = generate_strategy_tables(Rules(double_after_split=False))
+        das = generate_strategy_tables(Rules(double_after_split=True))
+        self.assertEqual(cell(das, "pairs", "4,4", 5), 'P')
+        self.assertNotEqual(cell(no_das, "pairs", "4,4", 5), 'P')
+
+        no_surrender = generate_strategy_tables(Rules(late_surrender=False))
+        self.assertEqual(cell(no_surrender, "hard", 16, 10), 'H')
+
+    def test_tables_persist_and_reload(self):
+        rules = Rules(num_decks=8, blackjack_payout=1.2)
+        with tempfile.TemporaryDirectory() as directory:
+            generated = load_strategy_tables(rules, directory=directory)
+            self.assertTrue(os.path.exists(table_path(rules, directory)))
+            self.assertEqual(load_strategy_tables(rules, directory=directory, generate=False), generated)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,72 @@
+import sys
+import os
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import io
+import unittest
+from contextlib import redirect_stdout
+from unittest.mock import patch
+import numpy as np
+from src.simulation.ai_vs_ai_training import OptimizedSimulation
+from src.simulation.shoe import generate_shoe_block
+from src.simulation.variance_reduction import TAGS, antithetic_shoe_block, compare, estimate, play_rounds, print_estimates
+
+class RampedBetSimulation(OptimizedSimulation):
+    """The stock bots all bet the table minimum; a lower floor lets OptimalAI's bet ramp show"""
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.all_ais[1].bankroll_manager.min_bet = 1
+
+class TestVarianceReduction(unittest.TestCase):
+    def test_antithetic_shoes_mirror_the_count(self):
+        block = generate_shoe_block(3, num_decks=2, seed=1)
+        pairs = antithetic_shoe_block(block)
+        self.assertEqual(pairs.shape, (6, 104))
+        np.testing.assert_array_equal(pairs[0::2], block)
+        tags = np.vectorize(TAGS.get)
+        for original, mirror in zip(pairs[0::2], pairs[1::2]):
+            self.assertEqual(sorted(original), sorted(mirror))
+            np.testing.assert_array_equal(np.cumsum(tags(mirror)), -np.cumsum(tags(original)))
+        with self.assertRaises(ValueError):
+            antithetic_shoe_block(block[:, :50])
+
+    def test_common_cards_deal_every_bot_the_same_hand(self):
+        with patch("src.simulation.variance_reduction.OptimizedSimulation", RampedBetSimulation):
+            run = play_rounds(300, "crn", seed=2)
+        self.assertTrue(run["played"].all())
+        rows = estimate(run)
+        self.assertIsNone(rows[0])
+        ramped = rows[1]
+        self.assertNotEqual(ramped["estimate"], 0.0)
+        self.assertGreater(ramped["standard_error"], 0.0)
+        self.assertTrue(1.0 < ramped["speedup"] < float("inf"))
+        self.assertAlmostEqual(ramped["speedup"], (ramped["plain_standard_error"] / ramped["standard_error"]) ** 2)
+
+        output = io.StringIO()
+        with redirect_stdout(output):
+            print_estimates("crn", rows, run["names"])
+        printed = output.getvalue()
+        self.assertIn(f"{ramped['speedup']:.2f}x", printed)
+        # The other bots bet the same minimum on the same cards, so their difference is exactly zero
+        for name in run["names"][2:]:
+            self.assertIn(f"{name:<24} indistinguishable from ConservativeAI under CRN", printed)
+
+    def test_reduced_modes_beat_plain_error_bars(self):
+        for mode in ("antithetic", "control"):
+            rows = compare(1500, mode, seed=3)
+            for row in rows:
+                self.assertGreater(row["speedup"], 1.0, (mode, row))
+                self.assertAlmostEqual(row["speedup"], (row["plain_standard_error"] / row["standard_error"]) ** 2)
+        plain = compare(300, "plain", seed=3)
+        self.assertEqual([row["speedup"] for row in plain], [1.0] * 4)
+
+    def test_controls_are_centered(self):
+        run = play_rounds(1500, "control", seed=4)
+        controls = run["controls"][run["played"]]
+        scale = controls.std(axis=0) / len(controls) ** 0.5
+        self.assertTrue((np.abs(controls.mean(axis=0)) < 4 * scale).all())
+        with self.assertRaises(ValueError):
+            play_rounds(10, "importance")
+
+if __name__ == '__main__':
+    unittest.main()
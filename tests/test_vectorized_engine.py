@@ -0,0 +1,92 @@
+import sys
+import os
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import unittest
+import numpy as np
+from src.ai_brain.rules import Rules
+from src.ai_brain.basic_strategy import BasicStrategy, CompiledStrategy
+from src.simulation.shoe import DECK_VALUES
+from src.simulation.vectorized_engine import (VectorizedBlackjackEngine, VectorPolicy, compile_policy, build_policy,
+                                              max_round_cards)
+
+def rigged_shoes(*prefixes):
+    """One single-deck shoe row per table, dealt in order: player, upcard, player, hole, then draws"""
+    return np.array([list(prefix) + [2] * (52 - len(prefix)) for prefix in prefixes], dtype=np.int8)
+
+class SurrenderWhenAllowed:
+    def get_action(self, player_hand, dealer_upcard, can_double=True, can_split=True, can_surrender=False):
+        return "surrender" if can_surrender else "stand"
+
+class TestVectorizedEngine(unittest.TestCase):
+    def play(self, prefixes, rules=None, policy=None):
+        engine = VectorizedBlackjackEngine(rules or Rules(num_decks=1), policy, num_tables=len(prefixes),
+                                           shoes=rigged_shoes(*prefixes))
+        return engine.play_round().tolist(), engine.summary()
+
+    def test_round_mechanics(self):
+        results, summary = self.play([
+            (11, 9, 10, 7),                     # blackjack pays 3:2
+            (8, 6, 8, 10, 3, 10, 10, 10),       # split 8s, double the 11, dealer busts: +2 +1
+            (10, 11, 9, 6, 3),                  # 19 vs dealer soft 17 (S17: dealer stands)
+            (10, 10, 7, 11),                    # dealer blackjack after peek
+        ])
+        self.assertEqual(results, [1.5, 3.0, 1.0, -1.0])
+        self.assertEqual((summary["splits"], summary["doubles"], summary["blackjacks"]), (1, 1, 1))
+        self.assertEqual(summary["hands"], 5)
+
+    def test_rule_variants(self):
+        results, _ = self.play([(11, 9, 10, 7), (10, 11, 9, 6, 3)],
+                               rules=Rules(num_decks=1, dealer_hits_soft_17=True, blackjack_payout=1.2))
+        self.assertEqual(results, [1.2, -1.0])  # 6:5 natural; H17 dealer draws soft 17 to 20
+
+    def test_surrender_and_insurance(self):
+        results, summary = self.play([(10, 10, 6, 7), (10, 10, 6, 7, 5)], policy=SurrenderWhenAllowed())
+        self.assertEqual(results, [-0.5, -0.5])
+        self.assertEqual(summary["surrenders"], 2)
+        compiled = compile_policy(BasicStrategy())
+        insure = VectorPolicy(compiled.actions, np.ones(1, dtype=bool), np.ones(1))
+        results, summary = self.play([(10, 11, 9, 10), (10, 11, 9, 5)], policy=insure)
+        self.assertEqual(results, [0.0, 0.5])  # insured dealer blackjack; lost insurance, 19 beats 18
+        self.assertEqual(summary["insurance_taken"], 2)
+
+    def test_basic_policy_matches_compiled_strategy(self):
+        strategy = BasicStrategy()
+        policy = compile_policy(strategy)
+        self.assertEqual(policy.actions.shape, (1, CompiledStrategy.NUM_STATES, 12, 8))
+        self.assertEqual(policy.actions.tobytes(), strategy.compiled.table)
+        self.assertEqual(strategy.get_action([11, 11], 6), "split")
+
+    def test_counting_policy_tables(self):
+        policy = compile_policy(build_policy("counting"))
+        bucket = lambda true_count: true_count + policy.max_tc
+        self.assertEqual(policy.actions[bucket(0), 16, 10, 1], CompiledStrategy.STAND)
+        self.assertEqual(policy.actions[bucket(-1), 16, 10, 1], CompiledStrategy.HIT)
+        self.assertEqual(policy.actions[bucket(4), 10, 10, 1], CompiledStrategy.DOUBLE)
+        self.assertEqual(policy.actions[bucket(4), 10, 10, 0], CompiledStrategy.HIT)
+        self.assertEqual((policy.units[bucket(3)], policy.units[bucket(-5)]), (8, 0))
+        live = build_policy("enhanced")
+        live.make_decision([10, 6], 10)
+        stats = live.get_cache_stats()
+        enhanced = compile_policy(live)
+        self.assertTrue(enhanced.insurance[bucket(3)] and not enhanced.insurance[bucket(2)])
+        self.assertEqual(live.get_cache_stats(), stats)  # Compiling queries copies with their own caches
+
+    def test_seeded_runs_repeat(self):
+        runs = [VectorizedBlackjackEngine(num_tables=500, seed=5).run(20) for _ in range(2)]
+        self.assertEqual(runs[0], runs[1])
+        self.assertEqual(runs[0]["rounds"], 10000)
+        self.assertLess(abs(runs[0]["ev_per_round"]), 5 * runs[0]["standard_error"])
+
+    def test_deep_cut_leaves_room_for_a_round(self):
+        # 4 aces, 4 twos, 4 threes, 4 fours, 4 fives, 4 sixes and 2 sevens add up to 98: 26 cards + 5 last cards
+        self.assertEqual(max_round_cards(DECK_VALUES, max_hands=4), 31)
+        engine = VectorizedBlackjackEngine(Rules(num_decks=1), num_tables=2000, penetration=1.0, seed=5)
+        self.assertEqual(engine.cut_card, 52 - 31)
+        self.assertAlmostEqual(engine.penetration, 21 / 52)
+        engine.run(50)  # Indexing past the end of a shoe would raise
+        self.assertLessEqual(engine.cursor.max(), 52)
+        self.assertEqual(VectorizedBlackjackEngine(num_tables=1, penetration=0.75).cut_card, 234)
+
+if __name__ == '__main__':
+    unittest.main()